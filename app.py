@@ -1,18 +1,43 @@
 # app.py — DB 연결 Flask 학습캘린더
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
-from datetime import date, datetime, timedelta
-from calendar import monthrange
+from flask import (
+    Blueprint, Flask, render_template, jsonify, request, session, redirect, url_for, g, Response,
+    current_app, stream_with_context,
+)
+from datetime import date, datetime
 from db_config import db, init_db
-from sqlalchemy import text
+from config import Config
+from task_status import apply_status_updates, refresh_task_status
+from data_version import (
+    committed_user_version, conditional_get, get_plan_owner_version, get_template_catalog_version,
+    get_template_version, get_user_version, init_version_tracking, mark_template_changed, mark_user_changed,
+)
+from bulk_sql import bulk_insert, bulk_insert_returning_ids, insert_returning_id
+from schedule import parse_weekdays, weekday_dates
+from calendar_cache import CalendarCache
+from month_fragments import MonthFragmentCache
+from pool_metrics import pool_stats
+from read_routing import init_read_routing, reads_from_replica
+from request_metrics import init_request_metrics, request_metrics
+from calendar_grid import build_year_calendar
+from template_import import (
+    ImportLimitError, import_template_rows, iter_csv_rows, iter_import_progress,
+    iter_paste_rows, iter_xlsx_rows,
+)
+from data_export import EXPORT_DATASETS, EXPORT_FORMATS, iter_export
+from plan_stats import get_plan_progress, get_user_stats, get_year_summary, summarize_progress
+from read_queries import (
+    TASKS_FOR_DATE_SQL, daily_page_payload, daily_page_query, day_tasks_payload, parse_day_id,
+    tasks_for_date_params, today_context,
+)
+from sqlalchemy import text, bindparam
 from functools import wraps
-from io import TextIOWrapper
-import csv
-import re
+import hmac
+import json
+import os
 import pytz
 
-app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this-in-production'  # 세션용 비밀키
-init_db(app)
+# 라우트는 블루프린트에 등록하고 create_app() 에서 앱에 붙임
+bp = Blueprint("main", __name__)
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
@@ -32,29 +57,157 @@ PLAN_COLORS = [
     '#FFF0EB',  # soft pastel peach
 ]
 
+# 캘린더 화면 데이터 캐시 (사용자별, 쓰기 API 호출 시 무효화) - create_app() 에서 생성
+def get_calendar_cache():
+    return current_app.extensions["calendar_cache"]
+
+# 달력 월 단위 HTML 조각 캐시 (그 달의 칸이 바뀐 경우에만 다시 렌더링) - create_app() 에서 생성
+def get_month_fragments():
+    return current_app.extensions["month_fragments"]
+
 # 로그인 체크 데코레이터
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if 'user_id' not in session:
-            return redirect(url_for('login'))
+            return redirect(url_for('main.login'))
         return f(*args, **kwargs)
     return decorated_function
 
-def month_days(year, month):
-    """앞쪽 공백 포함 달력 데이터 생성"""
-    first_weekday, last_day = monthrange(year, month)
-    start_padding = (first_weekday + 1) % 7
-    days = [None] * start_padding
-    days += [date(year, month, d) for d in range(1, last_day + 1)]
-    return days
+# 지표 엔드포인트 보호: METRICS_TOKEN 이 없으면 비활성(404), 있으면 Authorization: Bearer <token> 필요
+def metrics_token_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        token = current_app.config.get("METRICS_TOKEN")
+        if not token:
+            return jsonify({"ok": False, "error": "지표 엔드포인트가 비활성화되어 있습니다"}), 404
+        auth = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth.encode(), f"Bearer {token}".encode()):
+            return jsonify({"ok": False, "error": "지표 토큰이 필요합니다"}), 401, {"WWW-Authenticate": "Bearer"}
+        return f(*args, **kwargs)
+    return decorated_function
+
+# 쓰기 API 데코레이터: 커밋 시 사용자 데이터 버전 +1, 요청 처리 후 캘린더 캐시 무효화
+# (중간 커밋 후 실패하는 경우도 있으므로 응답 코드와 관계없이 비움)
+def invalidates_calendar(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user_id = session.get('user_id', 1)
+        mark_user_changed(user_id)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            get_calendar_cache().invalidate_user(user_id)
+    return decorated_function
+
+# 계획별 템플릿 쓰기 API 데코레이터: 커밋 시 사용자 데이터 버전 +1
+def bumps_user_version(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        mark_user_changed(session.get('user_id', 1))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# 템플릿 쓰기 API 데코레이터: 커밋 시 템플릿 버전(template_id 가 없으면 템플릿 목록 버전) +1
+def changes_template(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if "template_id" in kwargs:
+            mark_template_changed(kwargs["template_id"])
+        else:
+            mark_template_changed()
+        return f(*args, **kwargs)
+    return decorated_function
 
 # DB에서 학습계획 가져오기
-def get_plans_from_db():
-    """데이터베이스에서 학습계획 조회 (로그인한 유저의 계획만)"""
-    user_id = session.get('user_id', 1)
-    # 한 번의 쿼리로 모든 데이터 조회 (JOIN 사용)
+def get_plans_from_db(user_id=None, date_from=None, date_to=None, plan_id=None, subject=None):
+    """데이터베이스에서 학습계획 조회 (로그인한 유저의 계획만)
+
+    - date_from / date_to: 해당 기간의 일일 작업만 조회 (계획 자체는 모두 포함)
+    - plan_id / subject: 해당 계획(과목)만 조회
+    필터는 SQL WHERE 절로 전달되어 필요한 행만 가져옵니다.
+    같은 요청 안에서는 flask.g 에 저장된 결과를 재사용하므로
+    한 요청이 같은 조건으로 계획을 두 번 조회하지 않습니다.
+    """
+    if user_id is None:
+        user_id = session.get('user_id', 1)
+    key = (user_id, date_from, date_to, plan_id, subject)
+    plans_cache = g.setdefault('_plans_by_user', {})
+    if key not in plans_cache:
+        plans_cache[key] = _load_plans(user_id, date_from, date_to, plan_id, subject)
+    return plans_cache[key]
+
+def count_plans(user_id=None):
+    """학습계획 개수만 조회 (작업 JOIN 없이 COUNT)"""
+    if user_id is None:
+        user_id = session.get('user_id', 1)
+    plans_cache = g.get('_plans_by_user', {})
+    key = (user_id, None, None, None, None)
+    if key in plans_cache:
+        return len(plans_cache[key])
+    query = text("SELECT COUNT(*) AS cnt FROM dbo.study_plan WHERE user_id = :user_id")
+    return db.session.execute(query, {"user_id": user_id}).fetchone().cnt
+
+def get_plan_summaries(user_id=None):
+    """계획 목록 + 계획별 작업 수/완료 수 (일일 작업 행은 가져오지 않음, 집계는 plan_stats)"""
+    if user_id is None:
+        user_id = session.get('user_id', 1)
+    summaries_cache = g.setdefault('_plan_summaries_by_user', {})
+    if user_id in summaries_cache:
+        return summaries_cache[user_id]
+    
     query = text("""
+        SELECT plan_id, title, subject, image_url, color, created_at
+        FROM dbo.study_plan
+        WHERE user_id = :user_id
+        ORDER BY created_at DESC
+    """)
+    result = db.session.execute(query, {"user_id": user_id}).fetchall()
+    progress = get_plan_progress(user_id)
+    
+    summaries = []
+    for row in result:
+        counters = progress.get(row.plan_id, {"task_count": 0, "done_count": 0})
+        summaries.append({
+            "plan_id": row.plan_id,
+            "title": row.title,
+            "subject": row.subject,
+            "image_url": row.image_url,
+            "created_at": row.created_at.strftime("%Y-%m-%d") if row.created_at else "",
+            "color": _plan_color(row.plan_id, row.color),
+            "task_count": counters["task_count"],
+            "done_count": counters["done_count"]
+        })
+    summaries_cache[user_id] = summaries
+    return summaries
+
+def _plan_color(plan_id, saved_color):
+    """DB에 저장된 색상, 없으면 plan_id 기반 기본 색상"""
+    if saved_color:
+        return saved_color
+    return PLAN_COLORS[(plan_id - 1) % len(PLAN_COLORS)]
+
+def _load_plans(user_id, date_from=None, date_to=None, plan_id=None, subject=None):
+    """계획 + 일일 작업 조회 후 계획별로 그룹화"""
+    # 기간 조건은 JOIN 조건에 두어 기간 내 작업이 없는 계획도 목록에 남도록 함
+    task_filters = ""
+    plan_filters = ""
+    params = {"user_id": user_id}
+    if date_from is not None:
+        task_filters += " AND t.plan_date >= :date_from"
+        params["date_from"] = date_from
+    if date_to is not None:
+        task_filters += " AND t.plan_date <= :date_to"
+        params["date_to"] = date_to
+    if plan_id is not None:
+        plan_filters += " AND p.plan_id = :plan_id"
+        params["plan_id"] = plan_id
+    if subject is not None:
+        plan_filters += " AND p.subject = :subject"
+        params["subject"] = subject
+    
+    # 한 번의 쿼리로 모든 데이터 조회 (JOIN 사용)
+    query = text(f"""
         SELECT 
             p.plan_id,
             p.user_id,
@@ -67,20 +220,14 @@ def get_plans_from_db():
             t.plan_date,
             t.task_title,
             t.order_no,
-            ISNULL(
-                (SELECT TOP 1 status 
-                 FROM dbo.study_plan_log 
-                 WHERE task_id = t.task_id 
-                 ORDER BY updated_at DESC), 
-                'planned'
-            ) as status
+            ISNULL(t.status, 'planned') as status
         FROM dbo.study_plan p
-        LEFT JOIN dbo.study_plan_task t ON p.plan_id = t.plan_id
-        WHERE p.user_id = :user_id
+        LEFT JOIN dbo.study_plan_task t ON p.plan_id = t.plan_id{task_filters}
+        WHERE p.user_id = :user_id{plan_filters}
         ORDER BY p.created_at DESC, t.plan_date, t.order_no
     """)
     
-    result = db.session.execute(query, {"user_id": user_id}).fetchall()
+    result = db.session.execute(query, params).fetchall()
     
     # 결과를 계획별로 그룹화
     plans_dict = {}
@@ -91,10 +238,7 @@ def get_plans_from_db():
         # 새로운 계획인 경우
         if plan_id not in plans_dict:
             # DB에서 색상 가져오기, 없으면 plan_id 기반으로 기본 색상 할당
-            saved_color = row.color if hasattr(row, 'color') and row.color else None
-            if not saved_color:
-                color_idx = (plan_id - 1) % len(PLAN_COLORS)
-                saved_color = PLAN_COLORS[color_idx]
+            saved_color = _plan_color(plan_id, row.color)
             
             plans_dict[plan_id] = {
                 "plan_id": plan_id,
@@ -118,92 +262,31 @@ def get_plans_from_db():
     
     return list(plans_dict.values())
 
+def get_tasks_for_date(user_id, date_str, plan_id=None):
+    """특정 날짜의 작업 조회 (/day/<day_id>, /today 공용)
+
+    상태/실제 학습시간/메모는 study_plan_task 의 현재 상태 컬럼에서 한 번에 읽으므로
+    작업 수와 관계없이 쿼리 1회로 끝납니다. (SQL 은 asgi.py 의 비동기 경로와 공용)
+    """
+    params = tasks_for_date_params(user_id, date_str, plan_id)
+    return db.session.execute(TASKS_FOR_DATE_SQL, params).fetchall()
+
 def generate_fake_calendar(year, plan_id=None):
-    data = {}
-    today = get_today_kst()
-    
+    """월별 달력 데이터 생성 (calendar_grid 엔진 사용)"""
     # 세션에서 user_id 가져오기
     user_id = session.get('user_id', 1)
     
-    # DB에서 학습계획 가져오기
-    plans = get_plans_from_db()
-    
-    # 모든 일일 계획을 날짜별로 매핑 (색상 포함)
-    daily_plan_map = {}
-    for plan in plans:
-        # 특정 계획 필터링: plan_id가 지정된 경우 해당 계획만 반영
-        if plan_id and plan.get("plan_id") != plan_id:
-            continue
-        plan_color = plan.get("color", "#E5E7EB")  # 기본 회색
-        plan_id_num = plan.get("plan_id")
-        for dp in plan.get("daily_plans", []):
-            date_str = dp.get("date")
-            status = dp.get("status", "planned")  # planned, done, partial, missed
-            if date_str:
-                # 여러 계획이 있는 경우 처리
-                if date_str in daily_plan_map:
-                    daily_plan_map[date_str]["multiple"] = True
-                    daily_plan_map[date_str]["total_count"] += 1
-                    if status == "done":
-                        daily_plan_map[date_str]["done_count"] += 1
-                    # done 상태가 하나라도 있으면 done 유지
-                    if status == "done" or daily_plan_map[date_str]["status"] == "done":
-                        daily_plan_map[date_str]["status"] = "done"
-                else:
-                    daily_plan_map[date_str] = {
-                        "status": status,
-                        "color": plan_color,
-                        "plan_id": plan_id_num,
-                        "multiple": False,
-                        "total_count": 1,
-                        "done_count": 1 if status == "done" else 0
-                    }
+    # 해당 연도 / 선택된 계획의 작업만 DB에서 가져오기
+    plans = get_plans_from_db(
+        user_id,
+        date_from=date(year, 1, 1),
+        date_to=date(year, 12, 31),
+        plan_id=plan_id,
+    )
     
-    for m in range(1, 13):
-        month_list = []
-        for d in month_days(year, m):
-            if d is None:
-                month_list.append(None)
-            else:
-                date_str = d.strftime("%Y-%m-%d")
-                
-                # 일일 계획에서 상태와 색상 확인
-                color = None
-                plan_id_val = None
-                is_multiple = False
-                all_done = False
-                if date_str in daily_plan_map:
-                    status = daily_plan_map[date_str]["status"]
-                    color = daily_plan_map[date_str]["color"]
-                    plan_id_val = daily_plan_map[date_str]["plan_id"]
-                    is_multiple = daily_plan_map[date_str].get("multiple", False)
-                    # 여러 계획이 있는 경우, 모두 완료되었는지 확인
-                    if is_multiple:
-                        total = daily_plan_map[date_str].get("total_count", 0)
-                        done = daily_plan_map[date_str].get("done_count", 0)
-                        all_done = (total > 0 and total == done)
-                elif d < today:
-                    status = "none"  # 계획 없음 (과거)
-                else:
-                    status = "none"
-                
-                # 오늘 표시
-                is_today = (d == today)
-                
-                month_list.append({
-                    "date": d,
-                    "status": status,
-                    "is_today": is_today,
-                    "day_id": f"{m:02d}{d.day:02d}",
-                    "color": color,
-                    "plan_id": plan_id_val,
-                    "multiple": is_multiple,
-                    "all_done": all_done
-                })
-        data[m] = month_list
-    return data
-
-@app.route("/login", methods=["GET", "POST"])
+    return build_year_calendar(year, plans, get_today_kst(), plan_id=plan_id)
+
+@bp.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
         data = request.get_json(force=True) if request.is_json else request.form
@@ -221,7 +304,7 @@ def login():
                 
                 if request.is_json:
                     return jsonify({"ok": True, "message": "로그인 성공!"})
-                return redirect(url_for('index'))
+                return redirect(url_for('main.index'))
             else:
                 # 사용자가 없으면 자동 생성
                 insert_query = text("""
@@ -238,7 +321,7 @@ def login():
                 
                 if request.is_json:
                     return jsonify({"ok": True, "message": "계정이 생성되었습니다!"})
-                return redirect(url_for('index'))
+                return redirect(url_for('main.index'))
                 
         except Exception as e:
             db.session.rollback()
@@ -249,82 +332,82 @@ def login():
     # GET 요청 - 로그인 페이지 표시
     return render_template("login.html")
 
-@app.route("/logout")
+@bp.route("/logout")
 def logout():
     session.clear()
-    return redirect(url_for('login'))
+    return redirect(url_for('main.login'))
 
-@app.route("/")
-@app.route("/<int:year>")
+@bp.route("/")
+@bp.route("/<int:year>")
+@reads_from_replica
 @login_required
 def index(year=2026):
-    # DB에서 학습계획 가져오기
-    plans = get_plans_from_db()
+    user_id = session.get('user_id', 1)
     # 선택된 계획 필터 (쿼리 파라미터)
     active_plan_id = request.args.get('plan_id', type=int)
-    active_plan = None
-    if active_plan_id:
-        active_plan = next((p for p in plans if p.get('plan_id') == active_plan_id), None)
-    
-    # 년도별 달력 데이터 생성 (선택된 계획 기준으로 색상 상태 반영)
-    calendar_data = generate_fake_calendar(year, plan_id=active_plan_id)
     
-    # 년도별 요약 데이터 (예시)
-    days_in_year = 366 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 365
-    summary = {
-        "total": days_in_year,
-        "passed": days_in_year // 2 if year < 2025 else 294,
-        "remain": days_in_year - (days_in_year // 2 if year < 2025 else 294),
-        "planned": 48
-    }
-    
-    # 통계 계산 (선택된 계획이 있으면 해당 계획 기준)
-    base_list = [active_plan] if active_plan else plans
-    total_plans = len(base_list)
-    total_assigned = sum(len(p["daily_plans"]) for p in base_list)
-    completed = sum(1 for p in base_list for dp in p["daily_plans"] if dp.get("status") == "done")
-    completion_rate = int((completed / total_assigned * 100)) if total_assigned > 0 else 0
+    # 캐시 키에 오늘 날짜를 포함해 날짜가 바뀌면 '오늘' 표시가 새로 계산되도록 함
+    # 사용자 data_version 도 포함: 다른 워커 프로세스가 처리한 쓰기도 버전이 올라가 새 키가 됨
+    cache_key = (user_id, year, active_plan_id, get_today_kst(), get_user_version(user_id))
+    view = get_calendar_cache().get_or_build(
+        cache_key, lambda: _build_index_view(user_id, year, active_plan_id)
+    )
+    plans = view["plans"]
+    active_plan = view["active_plan"]
     
-    stats = {
-        "total_plans": total_plans,
-        "total_assigned": total_assigned,
-        "completed": completed,
-        "completion_rate": completion_rate
-    }
+    # 12개월 달력은 월 단위로 캐시된 조각을 사용
+    month_fragments = get_month_fragments()
+    month_html = month_fragments.render_months(
+        user_id, year, view["calendar_data"],
+        lambda m, cells: render_template("calendar_month.html", m=m, cells=cells)
+    )
     
-    return render_template(
+    return month_fragments.page_render.time(
+        render_template,
         "index.html",
         year=year,
         available_years=[2025, 2026, 2027],
         plans=plans,
         active_plan=active_plan or (plans[0] if plans else None),
-        calendar_data=calendar_data,
-        summary=summary,
-        stats=stats,
+        month_html=month_html,
+        summary=view["summary"],
+        stats=view["stats"],
         today_date=get_today_kst()
     )
 
-@app.route("/manage_plan")
+def _build_index_view(user_id, year, active_plan_id):
+    """메인 화면용 계획 목록/달력/통계 계산 (calendar_cache 미스 시 호출)"""
+    # 계획 목록은 작업 수만 필요하므로 요약 조회 사용
+    plans = get_plan_summaries(user_id)
+    active_plan = None
+    if active_plan_id:
+        active_plan = next((p for p in plans if p.get('plan_id') == active_plan_id), None)
+    
+    # 년도별 달력 데이터 생성 (선택된 계획 기준으로 색상 상태 반영)
+    calendar_data = generate_fake_calendar(year, plan_id=active_plan_id)
+    
+    # 통계 계산 (선택된 계획이 있으면 해당 계획 기준, 계획별 카운터는 SQL 집계 결과)
+    base_list = [active_plan] if active_plan else plans
+    stats = summarize_progress(base_list)
+    summary = get_year_summary(user_id, year, get_today_kst(), plan_id=active_plan_id)
+    
+    return {
+        "plans": plans,
+        "active_plan": active_plan,
+        "calendar_data": calendar_data,
+        "stats": stats,
+        "summary": summary
+    }
+
+@bp.route("/manage_plan")
+@reads_from_replica
 @login_required
 def manage_plan():
     # DB에서 학습계획 가져오기
     plans = get_plans_from_db()
     
-    # 통계 계산
-    total_plans = len(plans)
-    total_assigned = sum(len(p["daily_plans"]) for p in plans)
-    completed = sum(1 for p in plans for dp in p["daily_plans"] if dp.get("status") == "done")
-    completion_rate = int((completed / total_assigned * 100)) if total_assigned > 0 else 0
-    
-    stats = {
-        "total_plans": total_plans,
-        "total_assigned": total_assigned,
-        "completed": completed,
-        "completion_rate": completion_rate
-    }
-    
-    # JSON으로 변환하기 위해 import 추가
-    import json
+    # 통계 계산 (작업 목록 순회 대신 SQL 집계)
+    stats = get_user_stats(session.get('user_id', 1))
     
     return render_template(
         "manage_plan.html",
@@ -333,84 +416,26 @@ def manage_plan():
         stats=stats
     )
 
-@app.route("/day/<day_id>")
+def _session_user_version():
+    """현재 로그인 사용자 기준 ETag 버전 (사용자 ID, data_version)"""
+    user_id = session.get('user_id', 1)
+    version = get_user_version(user_id)
+    return None if version is None else (user_id, version)
+
+@bp.route("/day/<day_id>")
+@reads_from_replica
+@conditional_get(lambda day_id: _session_user_version())
 def day_detail(day_id):
     # day_id 형식: "MMDD" (예: "1022" = 10월 22일)
     year = request.args.get('year', 2025, type=int)
     try:
-        month = int(day_id[:2])
-        day = int(day_id[2:])
-        
-        # 날짜 유효성 검사
-        date_obj = date(year, month, day)
-        date_str = date_obj.strftime("%Y-%m-%d")
+        date_str = parse_day_id(day_id, year)
         
         # DB에서 해당 날짜의 학습 작업 조회 (선택된 계획만 필터 가능)
         plan_id_param = request.args.get('plan_id', type=int)
-        query = text("""
-            SELECT 
-                p.title as plan_title,
-                p.subject,
-                t.task_id,
-                t.task_title,
-                t.link_url,
-                ISNULL(
-                    (SELECT TOP 1 status 
-                     FROM dbo.study_plan_log 
-                     WHERE task_id = t.task_id 
-                     ORDER BY updated_at DESC), 
-                    'planned'
-                ) as status,
-                ISNULL(
-                    (SELECT TOP 1 actual_minutes 
-                     FROM dbo.study_plan_log 
-                     WHERE task_id = t.task_id 
-                     ORDER BY updated_at DESC), 
-                    0
-                ) as minutes,
-                ISNULL(
-                    (SELECT TOP 1 memo 
-                     FROM dbo.study_plan_log 
-                     WHERE task_id = t.task_id 
-                     ORDER BY updated_at DESC), 
-                    ''
-                ) as memo
-            FROM dbo.study_plan_task t
-            JOIN dbo.study_plan p ON t.plan_id = p.plan_id
-            WHERE t.plan_date = :date
-              AND p.user_id = :user_id
-              AND (:plan_id IS NULL OR p.plan_id = :plan_id)
-            ORDER BY t.order_no
-        """)
-        
         user_id = session.get('user_id', 1)
-        result = db.session.execute(query, {"date": date_str, "user_id": user_id, "plan_id": plan_id_param}).fetchall()
-        
-        # 해당 날짜에 작업이 있는 경우
-        if result:
-            tasks = []
-            for row in result:
-                tasks.append({
-                    "task_id": row.task_id,
-                    "plan_title": row.plan_title,
-                    "subject": row.subject,
-                    "task_title": row.task_title,
-                    "link_url": row.link_url,
-                    "status": row.status
-                })
-            return jsonify({
-                "ok": True,
-                "date": date_str,
-                "tasks": tasks
-            })
-        else:
-            # 작업이 없는 경우
-            return jsonify({
-                "ok": True,
-                "date": date_str,
-                "tasks": []
-            })
-            
+        result = get_tasks_for_date(user_id, date_str, plan_id_param)
+        return jsonify(day_tasks_payload(date_str, result))
     except (ValueError, IndexError) as e:
         return jsonify({
             "ok": False,
@@ -422,8 +447,10 @@ def day_detail(day_id):
             "error": str(e)
         }), 500
 
-@app.route("/day/update", methods=["POST"])
+@bp.route("/day/update", methods=["POST"])
+@invalidates_calendar
 def day_update():
+    """체크박스 한 개 상태 저장 (여러 건은 /day/update_batch 사용)"""
     data = request.get_json(force=True)
     
     try:
@@ -438,61 +465,66 @@ def day_update():
         
         # 완료 체크박스가 체크되면 done, 아니면 planned
         status = "done" if is_completed else "planned"
+        user_id = session.get('user_id', 1)
         
-        # user_id = 1 확인 및 생성
-        user_check = text("SELECT user_id FROM dbo.study_plan_user WHERE user_id = 1")
-        user_exists = db.session.execute(user_check).fetchone()
+        result = apply_status_updates(user_id, [{"task_id": task_id, "status": status}])[0]
+        if not result["ok"]:
+            db.session.rollback()
+            return jsonify({
+                "ok": False,
+                "error": result["error"]
+            }), 404
         
-        if not user_exists:
-            # 기본 사용자 생성 (user_name 포함)
-            create_user = text("""
-                SET IDENTITY_INSERT dbo.study_plan_user ON;
-                INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) 
-                VALUES (1, 'default_user', SYSDATETIMEOFFSET());
-                SET IDENTITY_INSERT dbo.study_plan_user OFF;
-            """)
-            db.session.execute(create_user)
-            db.session.commit()
+        db.session.commit()
         
-        # 기존 로그가 있는지 확인
-        check_query = text("""
-            SELECT log_id 
-            FROM dbo.study_plan_log 
-            WHERE task_id = :task_id
-        """)
-        existing_log = db.session.execute(check_query, {"task_id": task_id}).fetchone()
+        return jsonify({
+            "ok": True,
+            "message": "학습 실적이 저장되었습니다!",
+            "version": committed_user_version(user_id)
+        })
         
-        if existing_log:
-            # 기존 로그 업데이트
-            update_query = text("""
-                UPDATE dbo.study_plan_log
-                SET status = :status,
-                    updated_at = SYSDATETIMEOFFSET()
-                WHERE task_id = :task_id
-            """)
-            db.session.execute(update_query, {
-                "task_id": task_id,
-                "status": status
-            })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "ok": False,
+            "error": str(e)
+        }), 500
+
+@bp.route("/day/update_batch", methods=["POST"])
+def day_update_batch():
+    """여러 작업의 상태/실제 학습시간/메모를 한 트랜잭션으로 저장
+
+    요청: { updates: [{task_id, status, minutes?, memo?}, ...] }
+    응답: { ok, results: [{task_id, ok, status | error}, ...], version }
+    잘못된 항목은 결과에 오류로 표시하고 나머지는 저장합니다.
+    저장할 항목이 하나도 없으면 커밋하지 않으므로 데이터 버전(ETag)과 캘린더 캐시가 그대로 유지됩니다.
+    """
+    data = request.get_json(force=True)
+    updates = data.get("updates") if isinstance(data, dict) else None
+    if not isinstance(updates, list) or not updates:
+        return jsonify({"ok": False, "error": "updates 목록이 필요합니다."}), 400
+    if len(updates) > current_app.config["STATUS_BATCH_MAX"]:
+        return jsonify({
+            "ok": False,
+            "error": f"한 번에 최대 {current_app.config['STATUS_BATCH_MAX']}개까지 저장할 수 있습니다."
+        }), 413
+    
+    try:
+        user_id = session.get('user_id', 1)
+        results = apply_status_updates(user_id, updates)
+        if any(r["ok"] for r in results):
+            # 한 번의 커밋이므로 버전도 한 번만 올라감 (invalidates_calendar 와 같은 처리를 저장한 경우에만)
+            mark_user_changed(user_id)
+            db.session.commit()
+            get_calendar_cache().invalidate_user(user_id)
         else:
-            # 새 로그 삽입
-            insert_query = text("""
-                INSERT INTO dbo.study_plan_log 
-                (task_id, user_id, status, updated_at)
-                VALUES (:task_id, 1, :status, SYSDATETIMEOFFSET())
-            """)
-            db.session.execute(insert_query, {
-                "task_id": task_id,
-                "status": status
-            })
-        
-        db.session.commit()
+            db.session.rollback()
         
         return jsonify({
             "ok": True,
-            "message": "학습 실적이 저장되었습니다!"
+            "results": results,
+            "version": committed_user_version(user_id)
         })
-        
     except Exception as e:
         db.session.rollback()
         return jsonify({
@@ -500,7 +532,12 @@ def day_update():
             "error": str(e)
         }), 500
 
-@app.route("/plan/create", methods=["POST"])
+def _parse_skip_dates(data):
+    """요청의 skip_dates(제외할 날짜, 'YYYY-MM-DD' 목록) 파싱"""
+    return {datetime.strptime(d, "%Y-%m-%d").date() for d in data.get("skip_dates") or []}
+
+@bp.route("/plan/create", methods=["POST"])
+@invalidates_calendar
 def create_plan():
     data = request.get_json(force=True)
     user_id = session.get('user_id', 1)
@@ -517,60 +554,43 @@ def create_plan():
         color = data.get("color")
         if not color:
             # 색상이 지정되지 않으면 기본값 사용
-            plans = get_plans_from_db()
-            color_idx = len(plans) % len(PLAN_COLORS)
+            color_idx = count_plans(user_id) % len(PLAN_COLORS)
             color = PLAN_COLORS[color_idx]
         
-        insert_query = text("""
-            INSERT INTO dbo.study_plan (user_id, title, subject, image_url, color, created_at)
-            VALUES (:user_id, :title, :subject, :image_url, :color, SYSDATETIMEOFFSET())
-        """)
-        
-        db.session.execute(insert_query, {
+        # 새로 생성된 plan_id 는 INSERT 문에서 바로 반환
+        new_plan_id = insert_returning_id("dbo.study_plan", {
             "user_id": user_id,
             "title": title,
             "subject": subject,
             "image_url": image_url,
             "color": color
-        })
-        db.session.commit()
-        
-        # 새로 생성된 plan_id 조회
-        id_query = text("SELECT MAX(plan_id) as new_id FROM dbo.study_plan")
-        result = db.session.execute(id_query).fetchone()
-        new_plan_id = result.new_id
+        }, id_column="plan_id")
         
         # 2. 날짜 범위와 요일이 제공된 경우 빈 task 생성
         if start_date_str and end_date_str and selected_weekdays:
             start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
             end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
             
-            weekday_map = {
-                "mon": 0, "tue": 1, "wed": 2, "thu": 3,
-                "fri": 4, "sat": 5, "sun": 6
-            }
-            allowed_weekdays = {weekday_map[w] for w in selected_weekdays if w in weekday_map}
+            allowed_weekdays = parse_weekdays(selected_weekdays)
             
             if allowed_weekdays:
-                task_insert = text("""
-                    INSERT INTO dbo.study_plan_task (plan_id, plan_date, task_title, order_no, created_at)
-                    VALUES (:plan_id, :plan_date, :task_title, :order_no, SYSDATETIMEOFFSET())
-                """)
-                
-                current_date = start_date
-                order = 1
-                while current_date <= end_date:
-                    if current_date.weekday() in allowed_weekdays:
-                        db.session.execute(task_insert, {
-                            "plan_id": new_plan_id,
-                            "plan_date": current_date,
-                            "task_title": f"{title} - Day {order}",
-                            "order_no": order
-                        })
-                        order += 1
-                    current_date = current_date + timedelta(days=1)
+                plan_dates = weekday_dates(start_date, end_date, allowed_weekdays,
+                                           skip_dates=_parse_skip_dates(data))
+                task_rows = [
+                    {
+                        "plan_id": new_plan_id,
+                        "plan_date": plan_date,
+                        "task_title": f"{title} - Day {order}",
+                        "order_no": order
+                    }
+                    for order, plan_date in enumerate(plan_dates, start=1)
+                ]
                 
-                db.session.commit()
+                bulk_insert("dbo.study_plan_task",
+                            ["plan_id", "plan_date", "task_title", "order_no"], task_rows)
+        
+        # 계획 + 일일 작업을 한 트랜잭션으로 커밋
+        db.session.commit()
         
         return jsonify({
             "ok": True,
@@ -584,7 +604,8 @@ def create_plan():
             "error": str(e)
         }), 500
 
-@app.route("/plan/create_from_template", methods=["POST"])
+@bp.route("/plan/create_from_template", methods=["POST"])
+@invalidates_calendar
 def create_plan_from_template():
     """템플릿에서 새 계획 생성: 템플릿 항목들을 날짜 범위에 맞춰 일일 계획으로 변환"""
     data = request.get_json(force=True)
@@ -609,45 +630,12 @@ def create_plan_from_template():
         if start_date > end_date:
             return jsonify({"ok": False, "error": "시작일이 종료일보다 늦습니다."}), 400
 
-        weekday_map = {
-            "mon": 0,
-            "tue": 1,
-            "wed": 2,
-            "thu": 3,
-            "fri": 4,
-            "sat": 5,
-            "sun": 6,
-        }
-        allowed_weekdays = {weekday_map[w] for w in selected_weekdays if w in weekday_map}
+        allowed_weekdays = parse_weekdays(selected_weekdays)
         if not allowed_weekdays:
             return jsonify({"ok": False, "error": "유효한 요일이 없습니다."}), 400
         
-        # 1. 새 계획 생성 (색상 포함)
-        color = data.get("color")
-        if not color:
-            # 색상이 지정되지 않으면 기본값 사용
-            plans = get_plans_from_db()
-            color_idx = len(plans) % len(PLAN_COLORS)
-            color = PLAN_COLORS[color_idx]
-        
-        insert_plan = text("""
-            INSERT INTO dbo.study_plan (user_id, title, subject, image_url, color, created_at)
-            VALUES (:user_id, :title, :subject, :image_url, :color, SYSDATETIMEOFFSET())
-        """)
-        db.session.execute(insert_plan, {
-            "user_id": user_id, 
-            "title": title, 
-            "subject": subject,
-            "image_url": data.get("image_url"),
-            "color": color
-        })
-        db.session.commit()
-        
-        # 새 plan_id 가져오기
-        id_query = text("SELECT MAX(plan_id) as new_id FROM dbo.study_plan")
-        new_plan_id = db.session.execute(id_query).fetchone().new_id
-        
-        # 2. 선택한 템플릿의 항목들 가져오기 (독립 템플릿 스키마)
+        # 1. 선택한 템플릿의 항목들 가져오기 (독립 템플릿 스키마)
+        #    항목이 없으면 계획을 만들지 않고 종료
         template_query = text("""
             SELECT order_no, title, link_url
             FROM dbo.study_task_template
@@ -659,30 +647,41 @@ def create_plan_from_template():
         if not templates:
             return jsonify({"ok": False, "error": "선택한 템플릿에 항목이 없습니다."}), 400
         
-        task_insert = text("""
-            INSERT INTO dbo.study_plan_task (plan_id, plan_date, task_title, order_no, link_url, created_at)
-            VALUES (:plan_id, :plan_date, :task_title, :order_no, :link_url, SYSDATETIMEOFFSET())
-        """)
-
-        current_date = start_date
-        idx = 0
-        created_count = 0
+        # 2. 새 계획 생성 (색상 포함)
+        color = data.get("color")
+        if not color:
+            # 색상이 지정되지 않으면 기본값 사용
+            color_idx = count_plans(user_id) % len(PLAN_COLORS)
+            color = PLAN_COLORS[color_idx]
+        
+        new_plan_id = insert_returning_id("dbo.study_plan", {
+            "user_id": user_id, 
+            "title": title, 
+            "subject": subject,
+            "image_url": data.get("image_url"),
+            "color": color
+        }, id_column="plan_id")
+        
+        # 3. 템플릿 항목을 요일에 맞춰 배치 후 한 번에 INSERT
+        #    (필요한 날짜는 템플릿 항목 수만큼만 계산)
         total_templates = len(templates)
-
-        while current_date <= end_date and idx < total_templates:
-            if current_date.weekday() in allowed_weekdays:
-                template = templates[idx]
-                db.session.execute(task_insert, {
-                    "plan_id": new_plan_id,
-                    "plan_date": current_date,
-                    "task_title": template.title,
-                    "order_no": idx + 1,
-                    "link_url": template.link_url
-                })
-                created_count += 1
-                idx += 1
-            current_date = current_date + timedelta(days=1)
+        plan_dates = weekday_dates(start_date, end_date, allowed_weekdays,
+                                   skip_dates=_parse_skip_dates(data), limit=total_templates)
+        task_rows = [
+            {
+                "plan_id": new_plan_id,
+                "plan_date": plan_date,
+                "task_title": template.title,
+                "order_no": idx + 1,
+                "link_url": template.link_url
+            }
+            for idx, (plan_date, template) in enumerate(zip(plan_dates, templates))
+        ]
         
+        created_count = bulk_insert("dbo.study_plan_task",
+                                    ["plan_id", "plan_date", "task_title", "order_no", "link_url"], task_rows)
+        
+        # 계획 + 일일 작업을 한 트랜잭션으로 커밋
         db.session.commit()
 
         message = f"'{title}' 계획이 생성되었습니다!"
@@ -703,56 +702,71 @@ def create_plan_from_template():
             "error": str(e)
         }), 500
 
-@app.route("/plan/<int:plan_id>/daily", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/daily", methods=["POST"])
+@invalidates_calendar
 def save_daily_plans(plan_id):
+    """일일 계획 저장: 기존 작업과 비교해 바뀐 행만 반영
+
+    - task_id 가 있으면 task_id 로, 없으면 (날짜, 순서) 로 기존 작업과 매칭
+    - 매칭된 작업은 값이 바뀐 경우에만 UPDATE (로그/실적은 유지)
+    - 요청에 없는 기존 작업은 로그와 함께 삭제, 새 행은 INSERT
+    - status 가 바뀐 작업만 새 로그 행 추가 (status 키가 없으면 상태 유지)
+    """
     data = request.get_json(force=True)
     daily_plans = data.get("daily_plans", [])
     
     try:
-        # 기존 로그 삭제 (외래키 관계)
-        log_delete_query = text("""
-            DELETE FROM dbo.study_plan_log
-            WHERE task_id IN (
-                SELECT task_id FROM dbo.study_plan_task WHERE plan_id = :plan_id
-            )
+        existing_query = text("""
+            SELECT task_id, plan_date, task_title, link_url, order_no,
+                   ISNULL(status, 'planned') as status,
+                   ISNULL(actual_minutes, 0) as actual_minutes,
+                   ISNULL(memo, '') as memo
+            FROM dbo.study_plan_task
+            WHERE plan_id = :plan_id
         """)
-        db.session.execute(log_delete_query, {"plan_id": plan_id})
-        
-        # 기존 일일 작업 삭제
-        delete_query = text("DELETE FROM dbo.study_plan_task WHERE plan_id = :plan_id")
-        db.session.execute(delete_query, {"plan_id": plan_id})
-        
-        # 새 일일 작업 추가 및 task_id 수집
-        for idx, plan in enumerate(daily_plans):
-            insert_query = text("""
-                INSERT INTO dbo.study_plan_task 
-                (plan_id, plan_date, task_title, link_url, order_no, created_at)
-                OUTPUT INSERTED.task_id
-                VALUES (:plan_id, :plan_date, :task_title, :link_url, :order_no, SYSDATETIMEOFFSET())
-            """)
-            
-            result = db.session.execute(insert_query, {
-                "plan_id": plan_id,
-                "plan_date": plan.get("date"),
-                "task_title": plan.get("description", ""),
-                "link_url": plan.get("link_url"),
-                "order_no": plan.get("order", idx + 1)
-            })
-            
-            # SCOPE_IDENTITY()를 통해 방금 삽입한 task_id 가져오기
-            task_id = result.fetchone()[0]
-            
-            # 로그 저장 (상태가 있는 경우)
-            if plan.get("status") and plan.get("status") != "planned":
-                log_insert_query = text("""
-                    INSERT INTO dbo.study_plan_log 
-                    (task_id, user_id, status, actual_minutes, memo, updated_at)
-                    VALUES (:task_id, 1, :status, 0, '', SYSDATETIMEOFFSET())
-                """)
-                db.session.execute(log_insert_query, {
-                    "task_id": task_id,
-                    "status": plan.get("status")
-                })
+        existing = db.session.execute(existing_query, {"plan_id": plan_id}).fetchall()
+        
+        diff = _diff_daily_plans(plan_id, existing, daily_plans)
+        
+        # 1. 빠진 작업 삭제 (로그 먼저, 외래키 관계)
+        for chunk in _chunks(diff["deletes"]):
+            db.session.execute(text("""
+                DELETE FROM dbo.study_plan_log WHERE task_id IN :task_ids
+            """).bindparams(bindparam("task_ids", expanding=True)), {"task_ids": chunk})
+            db.session.execute(text("""
+                DELETE FROM dbo.study_plan_task WHERE task_id IN :task_ids
+            """).bindparams(bindparam("task_ids", expanding=True)), {"task_ids": chunk})
+        
+        # 2. 바뀐 작업만 UPDATE (executemany)
+        if diff["updates"]:
+            db.session.execute(text("""
+                UPDATE dbo.study_plan_task
+                SET plan_date = :plan_date,
+                    task_title = :task_title,
+                    link_url = :link_url,
+                    order_no = :order_no
+                WHERE task_id = :task_id AND plan_id = :plan_id
+            """), diff["updates"])
+        
+        # 3. 새 작업 INSERT (한 문장, 상태가 있는 행의 로그에 쓸 task_id 를 행 순서대로 받음)
+        task_columns = ["plan_id", "plan_date", "task_title", "link_url", "order_no"]
+        new_ids = bulk_insert_returning_ids("dbo.study_plan_task", task_columns, diff["inserts"],
+                                            id_column="task_id")
+        status_logs = list(diff["status_logs"])
+        for task_id, r in zip(new_ids, diff["inserts"]):
+            if r["status"] != "planned":
+                status_logs.append({"task_id": task_id, "status": r["status"],
+                                    "actual_minutes": 0, "memo": ""})
+        
+        # 4. 상태가 바뀐 작업만 로그 추가 후 현재 상태 컬럼 동기화
+        if status_logs:
+            user_id = session.get('user_id', 1)
+            db.session.execute(text("""
+                INSERT INTO dbo.study_plan_log 
+                (task_id, user_id, status, actual_minutes, memo, updated_at)
+                VALUES (:task_id, :user_id, :status, :actual_minutes, :memo, SYSDATETIMEOFFSET())
+            """), [dict(r, user_id=user_id) for r in status_logs])
+            refresh_task_status(task_ids=[r["task_id"] for r in status_logs])
         
         db.session.commit()
         
@@ -760,7 +774,11 @@ def save_daily_plans(plan_id):
             "ok": True,
             "message": "일일 계획이 저장되었습니다!",
             "plan_id": plan_id,
-            "count": len(daily_plans)
+            "count": len(daily_plans),
+            "inserted": len(diff["inserts"]),
+            "updated": len(diff["updates"]),
+            "deleted": len(diff["deletes"]),
+            "status_changed": len(status_logs)
         })
     except Exception as e:
         db.session.rollback()
@@ -769,52 +787,107 @@ def save_daily_plans(plan_id):
             "error": str(e)
         }), 500
 
-@app.route("/plan/<int:plan_id>/daily", methods=["GET"])
-def get_daily_plans(plan_id):
-    try:
-        # DB에서 일일 작업 조회
-        query = text("""
-            SELECT 
-                t.task_id,
-                t.plan_date,
-                t.task_title,
-                t.link_url,
-                t.order_no,
-                ISNULL(l.status, 'planned') as status
-            FROM dbo.study_plan_task t
-            LEFT JOIN (
-                SELECT task_id, status,
-                       ROW_NUMBER() OVER (PARTITION BY task_id ORDER BY updated_at DESC) as rn
-                FROM dbo.study_plan_log
-            ) l ON t.task_id = l.task_id AND l.rn = 1
-            WHERE t.plan_id = :plan_id
-            ORDER BY t.plan_date, t.order_no
-        """)
+def _chunks(items, size=1000):
+    """IN 목록 파라미터 수 제한(MSSQL 2100개)을 넘지 않도록 나누기"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _diff_daily_plans(plan_id, existing, daily_plans):
+    """기존 작업 행과 요청 목록 비교 -> inserts / updates / deletes / status_logs"""
+    by_id = {row.task_id: row for row in existing}
+    by_slot = {}
+    for row in existing:
+        by_slot.setdefault((row.plan_date, row.order_no), []).append(row)
+    
+    inserts, updates, status_logs = [], [], []
+    matched = set()
+    for idx, plan in enumerate(daily_plans):
+        plan_date = datetime.strptime(plan.get("date"), "%Y-%m-%d").date()
+        order_no = plan.get("order", idx + 1)
+        
+        # task_id 우선, 없으면 (날짜, 순서) 로 기존 작업 찾기
+        row = None
+        task_id = plan.get("task_id")
+        if task_id in by_id and task_id not in matched:
+            row = by_id[task_id]
+        else:
+            for candidate in by_slot.get((plan_date, order_no), []):
+                if candidate.task_id not in matched:
+                    row = candidate
+                    break
+        
+        if row is None:
+            inserts.append({
+                "plan_id": plan_id,
+                "plan_date": plan_date,
+                "task_title": plan.get("description", ""),
+                "link_url": plan.get("link_url"),
+                "order_no": order_no,
+                "status": plan.get("status") or "planned"
+            })
+            continue
         
-        result = db.session.execute(query, {"plan_id": plan_id})
-        daily_plans = []
+        matched.add(row.task_id)
+        new_values = {
+            "plan_date": plan_date,
+            "task_title": plan.get("description", row.task_title),
+            "link_url": plan.get("link_url", row.link_url),
+            "order_no": order_no
+        }
+        if any(new_values[k] != getattr(row, k) for k in new_values):
+            updates.append(dict(new_values, task_id=row.task_id, plan_id=plan_id))
         
-        for row in result:
-            daily_plans.append({
+        new_status = plan.get("status")
+        if new_status and new_status != row.status:
+            # 실제 학습시간/메모는 이전 값을 이어받아 기록 유지
+            status_logs.append({
                 "task_id": row.task_id,
-                "date": row.plan_date.strftime("%Y-%m-%d"),
-                "description": row.task_title,
-                "link_url": row.link_url,
-                "order": row.order_no,
-                "status": row.status
+                "status": new_status,
+                "actual_minutes": row.actual_minutes,
+                "memo": row.memo
             })
-        
-        return jsonify({
-            "ok": True,
-            "daily_plans": daily_plans
-        })
+    
+    deletes = [row.task_id for row in existing if row.task_id not in matched]
+    return {"inserts": inserts, "updates": updates, "deletes": deletes, "status_logs": status_logs}
+
+@bp.route("/plan/<int:plan_id>/daily", methods=["GET"])
+@reads_from_replica
+@conditional_get(lambda plan_id: get_plan_owner_version(plan_id))
+def get_daily_plans(plan_id):
+    """일일 작업 페이지 조회 (plan_date, order_no, task_id 기준 keyset 페이지네이션)
+
+    - limit: 페이지 크기 (기본 DAILY_PAGE_SIZE, 최대 DAILY_PAGE_SIZE_MAX)
+    - cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+    - date_from / date_to: 날짜 범위 (YYYY-MM-DD)
+    OFFSET 없이 마지막 행 다음부터 인덱스를 따라 읽으므로 뒤 페이지도 비용이 같습니다.
+    첫 페이지에는 계획 전체의 작업 수/완료 수(progress, plan_stats 집계)를 함께 담아
+    화면이 모든 페이지를 받기 전에 진행률을 표시할 수 있게 합니다.
+    """
+    try:
+        is_sqlite = db.session.get_bind().dialect.name == "sqlite"
+        query, params, limit = daily_page_query(
+            plan_id, request.args,
+            current_app.config["DAILY_PAGE_SIZE"], current_app.config["DAILY_PAGE_SIZE_MAX"],
+            is_sqlite=is_sqlite,
+        )
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    
+    try:
+        rows = db.session.execute(query, params).fetchall()
+        payload = daily_page_payload(rows, limit)
+        if not request.args.get("cursor"):
+            progress = get_plan_progress(session.get('user_id', 1))
+            payload["progress"] = progress.get(plan_id, {"task_count": 0, "done_count": 0})
+        return jsonify(payload)
     except Exception as e:
         return jsonify({
             "ok": False,
             "error": str(e)
         }), 500
 
-@app.route("/plan/<int:plan_id>/update", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/update", methods=["POST"])
+@invalidates_calendar
 def update_plan(plan_id):
     data = request.get_json(force=True)
     
@@ -849,7 +922,8 @@ def update_plan(plan_id):
             "error": str(e)
         }), 500
 
-@app.route("/plan/<int:plan_id>/delete", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/delete", methods=["POST"])
+@invalidates_calendar
 def delete_plan(plan_id):
     try:
         # 계획 제목 조회 (메시지용)
@@ -893,7 +967,8 @@ def delete_plan(plan_id):
 
 # ======================= 템플릿 관리 API =======================
 
-@app.route("/templates/create", methods=["POST"])
+@bp.route("/templates/create", methods=["POST"])
+@changes_template
 def create_template():
     """새 템플릿 생성: 템플릿 + 템플릿 항목들"""
     try:
@@ -909,36 +984,26 @@ def create_template():
         if not items or not isinstance(items, list):
             return jsonify({"ok": False, "error": "템플릿 항목이 필요합니다."}), 400
         
-        # 1. 템플릿 생성
-        template_insert = text("""
-            INSERT INTO dbo.study_template (template_title, subject, description, created_at)
-            VALUES (:title, :subject, :description, SYSDATETIMEOFFSET())
-        """)
-        db.session.execute(template_insert, {
-            "title": template_title,
+        # 1. 템플릿 생성 (template_id 는 INSERT 문에서 바로 반환)
+        new_template_id = insert_returning_id("dbo.study_template", {
+            "template_title": template_title,
             "subject": subject,
             "description": description
-        })
-        db.session.commit()
-        
-        # 2. 생성된 template_id 가져오기
-        id_query = text("SELECT MAX(template_id) as new_id FROM dbo.study_template")
-        new_template_id = db.session.execute(id_query).fetchone().new_id
+        }, id_column="template_id")
         
-        # 3. 템플릿 항목들 추가
-        item_insert = text("""
-            INSERT INTO dbo.study_task_template (template_id, order_no, title, link_url, created_at)
-            VALUES (:template_id, :order_no, :title, :link_url, SYSDATETIMEOFFSET())
-        """)
-        
-        for item in items:
-            db.session.execute(item_insert, {
+        # 2. 템플릿 항목들 한 번에 추가
+        item_rows = [
+            {
                 "template_id": new_template_id,
                 "order_no": item.get("order_no", 1),
                 "title": item.get("title", "").strip(),
                 "link_url": item.get("link_url")
-            })
+            }
+            for item in items
+        ]
+        bulk_insert("dbo.study_task_template", ["template_id", "order_no", "title", "link_url"], item_rows)
         
+        # 템플릿 + 항목을 한 트랜잭션으로 커밋
         db.session.commit()
         
         return jsonify({
@@ -951,7 +1016,9 @@ def create_template():
         db.session.rollback()
         return jsonify({"ok": False, "error": str(e)}), 500
 
-@app.route("/templates", methods=["GET"])
+@bp.route("/templates", methods=["GET"])
+@reads_from_replica
+@conditional_get(lambda: get_template_catalog_version())
 def get_all_templates():
     """모든 템플릿 목록 조회 (독립 템플릿)"""
     try:
@@ -977,7 +1044,9 @@ def get_all_templates():
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
-@app.route("/templates/<int:template_id>/items", methods=["GET"])
+@bp.route("/templates/<int:template_id>/items", methods=["GET"])
+@reads_from_replica
+@conditional_get(lambda template_id: get_template_version(template_id))
 def get_template_items(template_id: int):
     """특정 템플릿의 항목들 조회"""
     try:
@@ -1002,7 +1071,8 @@ def get_template_items(template_id: int):
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
-@app.route("/templates/<int:template_id>/items/add", methods=["POST"])
+@bp.route("/templates/<int:template_id>/items/add", methods=["POST"])
+@changes_template
 def add_template_items(template_id: int):
     """템플릿에 항목들 추가"""
     try:
@@ -1012,34 +1082,28 @@ def add_template_items(template_id: int):
         if not items:
             return jsonify({"ok": False, "error": "추가할 항목이 없습니다."}), 400
         
-        insert_q = text(
-            """
-            INSERT INTO dbo.study_task_template (template_id, order_no, title, link_url, created_at)
-            VALUES (:template_id, :order_no, :title, :link_url, SYSDATETIMEOFFSET())
-            """
-        )
-        
-        count = 0
+        item_rows = []
         for item in items:
             title = (item.get("title") or "").strip()
             if not title:
                 continue
             
-            db.session.execute(insert_q, {
+            item_rows.append({
                 "template_id": template_id,
-                "order_no": item.get("order_no", count + 1),
+                "order_no": item.get("order_no", len(item_rows) + 1),
                 "title": title,
                 "link_url": item.get("link_url")
             })
-            count += 1
         
+        count = bulk_insert("dbo.study_task_template", ["template_id", "order_no", "title", "link_url"], item_rows)
         db.session.commit()
         return jsonify({"ok": True, "count": count})
     except Exception as e:
         db.session.rollback()
         return jsonify({"ok": False, "error": str(e)}), 500
 
-@app.route("/templates/<int:template_id>/items/bulk_update", methods=["POST"])
+@bp.route("/templates/<int:template_id>/items/bulk_update", methods=["POST"])
+@changes_template
 def bulk_update_template_items(template_id: int):
     """템플릿 항목들 일괄 수정"""
     try:
@@ -1055,14 +1119,7 @@ def bulk_update_template_items(template_id: int):
         db.session.execute(del_q, {"template_id": template_id})
         
         # 새 항목 추가
-        ins_q = text(
-            """
-            INSERT INTO dbo.study_task_template (template_id, order_no, title, link_url, created_at)
-            VALUES (:template_id, :order_no, :title, :link_url, SYSDATETIMEOFFSET())
-            """
-        )
-        
-        count = 0
+        item_rows = []
         for item in items:
             title = (item.get("title") or "").strip()
             link = item.get("link_url")
@@ -1072,25 +1129,26 @@ def bulk_update_template_items(template_id: int):
                 continue
             
             try:
-                order = int(order) if order is not None else count + 1
+                order = int(order) if order is not None else len(item_rows) + 1
             except:
-                order = count + 1
+                order = len(item_rows) + 1
             
-            db.session.execute(ins_q, {
+            item_rows.append({
                 "template_id": template_id,
                 "title": title,
                 "link_url": link,
                 "order_no": order
             })
-            count += 1
         
+        count = bulk_insert("dbo.study_task_template", ["template_id", "order_no", "title", "link_url"], item_rows)
         db.session.commit()
         return jsonify({"ok": True, "count": count})
     except Exception as e:
         db.session.rollback()
         return jsonify({"ok": False, "error": str(e)}), 500
 
-@app.route("/templates/<int:template_id>/items/<int:item_id>/delete", methods=["POST"])
+@bp.route("/templates/<int:template_id>/items/<int:item_id>/delete", methods=["POST"])
+@changes_template
 def delete_template_item(template_id: int, item_id: int):
     """템플릿 항목 삭제"""
     try:
@@ -1108,52 +1166,49 @@ def delete_template_item(template_id: int, item_id: int):
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-def _parse_paste_text(paste_text: str):
-    """붙여넣기 텍스트를 행(row) 리스트로 파싱
-    지원 포맷: title, link_url (콤마 또는 탭 구분, memo 제외)
+def _upload_size(file):
+    """업로드 파일 크기 (bytes) - 스트림 끝으로 이동해 확인 후 처음으로 되돌림"""
+    stream = file.stream
+    stream.seek(0, 2)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _json_template_rows(data):
+    """JSON 요청 -> (행 번호, order_no, title, link_url) 생성 (rows 목록 또는 paste_text)
+
+    행 번호는 rows 목록에서의 위치(1부터)로, 오류 표시에 씁니다.
+    order_no 가 없는 행은 None (가져오기에서 저장하는 행에만 차례로 부여)
     """
-    rows = []
-    if not paste_text:
-        return rows
-    lines = [ln.strip() for ln in paste_text.splitlines() if ln.strip()]
-    for idx, ln in enumerate(lines, start=1):
-        # 탭 또는 콤마로 분리: 업로드/붙여넣기에서는 memo를 사용하지 않음
-        parts = re.split(r"\t|,", ln)
-        title = parts[0].strip() if len(parts) > 0 else ""
-        link = parts[1].strip() if len(parts) > 1 else None
-        if title:
-            rows.append({"order_no": idx, "title": title, "link_url": link})
-    return rows
-
-
-def _parse_csv_file(file_stream):
-    """CSV 파일 스트림을 읽어 rows 반환. 헤더(optional): title,link_url"""
-    reader = csv.DictReader(TextIOWrapper(file_stream, encoding="utf-8"))
-    rows = []
-    for i, row in enumerate(reader, start=1):
-        title = (row.get("title") or row.get("Title") or "").strip()
-        link = (row.get("link_url") or row.get("link") or row.get("Link"))
-        if title:
-            rows.append({"order_no": i, "title": title, "link_url": link})
-    return rows
-
-
-@app.route("/plan/<int:plan_id>/templates/upload", methods=["POST"])
+    if not isinstance(data.get("rows"), list):
+        yield from iter_paste_rows(data.get("paste_text", ""))
+        return
+    for row_no, r in enumerate(data["rows"], start=1):
+        yield row_no, r.get("order_no") or None, (r.get("title") or "").strip(), r.get("link_url")
+
+
+@bp.route("/plan/<int:plan_id>/templates/upload", methods=["POST"])
+@bumps_user_version
 def upload_templates(plan_id: int):
     """템플릿 업로드: CSV/Excel 파일 또는 붙여넣기 텍스트 지원
 
     요청 형태:
     - multipart/form-data: file(필수), csv 또는 xlsx 확장자
     - application/json: { paste_text: "제목\t링크\n..." } 또는 { rows: [{title, link_url, order_no}, ...] }
+    - ?progress=1: 배치마다 진행 상황을 NDJSON 한 줄씩 스트리밍 (마지막 줄이 최종 결과)
+
+    행은 template_import 제너레이터로 읽어 IMPORT_BATCH_SIZE 행씩 저장합니다.
+    요청이 IMPORT_MAX_BYTES 를 넘으면 아무것도 저장하지 않고 413 을 반환하고,
+    읽는 중에 IMPORT_MAX_ROWS / IMPORT_MAX_BYTES 를 넘으면 그 뒤 행만 버리고
+    저장한 행까지를 truncated=true, limit_error 와 함께 돌려줍니다.
+    잘못된 행은 건너뛰고 errors 에 행 번호와 사유를 담아 돌려줍니다.
     """
+    max_bytes = current_app.config["IMPORT_MAX_BYTES"]
+    first_order = 1  # order_no 가 없는 행에 붙일 첫 번호
     try:
-        # 현재 마지막 order_no 조회
-        max_order_q = text(
-            "SELECT ISNULL(MAX(order_no), 0) AS max_order FROM dbo.study_task_template WHERE plan_id = :plan_id"
-        )
-        max_order = db.session.execute(max_order_q, {"plan_id": plan_id}).fetchone().max_order or 0
-
-        rows_to_insert = []
+        if request.content_length and request.content_length > max_bytes:
+            raise ImportLimitError(f"파일 크기가 제한({max_bytes} bytes)을 넘었습니다.")
 
         if request.content_type and request.content_type.startswith("multipart/form-data"):
             file = request.files.get("file")
@@ -1161,81 +1216,75 @@ def upload_templates(plan_id: int):
                 return jsonify({"ok": False, "error": "파일을 선택하세요."}), 400
             filename = file.filename.lower()
             if filename.endswith(".csv"):
-                rows_to_insert = _parse_csv_file(file.stream)
+                rows = iter_csv_rows(file.stream, max_bytes=max_bytes)
             elif filename.endswith(".xlsx"):
                 try:
-                    import openpyxl  # optional dependency
-
-                    wb = openpyxl.load_workbook(file)
-                    ws = wb.active
-                    # 첫 행이 헤더라고 가정: title, link_url (memo 제외)
-                    headers = [str(c.value).strip().lower() if c.value else "" for c in next(ws.iter_rows(max_row=1))]
-                    col_title = headers.index("title") if "title" in headers else 0
-                    col_link = headers.index("link_url") if "link_url" in headers else None
-                    order = 1
-                    for row in ws.iter_rows(min_row=2):
-                        title = str(row[col_title].value).strip() if row[col_title].value else ""
-                        link = str(row[col_link].value).strip() if (col_link is not None and row[col_link].value) else None
-                        if title:
-                            rows_to_insert.append({"order_no": order, "title": title, "link_url": link})
-                            order += 1
+                    import openpyxl  # noqa: F401  optional dependency
                 except ImportError:
                     return jsonify({"ok": False, "error": "Excel(.xlsx) 업로드는 openpyxl 설치가 필요합니다."}), 400
+                if _upload_size(file) > max_bytes:
+                    raise ImportLimitError(f"파일 크기가 제한({max_bytes} bytes)을 넘었습니다.")
+                rows = iter_xlsx_rows(file)
             else:
                 return jsonify({"ok": False, "error": "지원되지 않는 파일 형식입니다. .csv 또는 .xlsx 사용"}), 400
 
         elif request.is_json:
             data = request.get_json(force=True)
             if isinstance(data.get("rows"), list):
-                rows_to_insert = [
-                    {
-                        "order_no": r.get("order_no"),
-                        "title": r.get("title", "").strip(),
-                        "link_url": r.get("link_url"),
-                    }
-                    for r in data.get("rows", [])
-                    if r.get("title")
-                ]
-            else:
-                paste_text = data.get("paste_text", "")
-                rows_to_insert = _parse_paste_text(paste_text)
+                # rows 에 order_no 가 없으면 현재 마지막 order_no 다음부터 부여 (붙여넣기는 1부터)
+                max_order_q = text(
+                    "SELECT ISNULL(MAX(order_no), 0) AS max_order FROM dbo.study_task_template WHERE plan_id = :plan_id"
+                )
+                max_order = db.session.execute(max_order_q, {"plan_id": plan_id}).fetchone().max_order or 0
+                first_order = max_order + 1
+            rows = _json_template_rows(data)
         else:
             return jsonify({"ok": False, "error": "잘못된 요청 형식입니다."}), 400
+    except ImportLimitError as e:
+        return jsonify({"ok": False, "error": str(e)}), 413
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
 
-        if not rows_to_insert:
-            return jsonify({"ok": False, "error": "추가할 행이 없습니다."}), 400
+    options = {
+        "batch_size": current_app.config["IMPORT_BATCH_SIZE"],
+        "max_rows": current_app.config["IMPORT_MAX_ROWS"],
+        "first_order": first_order,
+    }
+    if request.args.get("progress") == "1":
+        progress = iter_import_progress(plan_id, rows, **options)
+        return Response(stream_with_context(_import_progress_lines(progress)),
+                        mimetype="application/x-ndjson")
 
-        # 삽입 실행
-        insert_q = text(
-            """
-            INSERT INTO dbo.study_task_template (plan_id, order_no, title, link_url, created_at)
-            VALUES (:plan_id, :order_no, :title, :link_url, SYSDATETIMEOFFSET())
-            """
-        )
+    try:
+        result = import_template_rows(plan_id, rows, **options)
+    except ImportLimitError as e:
+        db.session.rollback()
+        return jsonify({"ok": False, "error": str(e)}), 413
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"ok": False, "error": str(e)}), 500
 
-        order_cursor = max_order
-        for r in rows_to_insert:
-            order_cursor += 1 if not r.get("order_no") else 0
-            order_no = r.get("order_no") or order_cursor
-            db.session.execute(
-                insert_q,
-                {
-                    "plan_id": plan_id,
-                    "order_no": order_no,
-                    "title": r.get("title"),
-                    "link_url": r.get("link_url"),
-                },
-            )
+    if result["count"] == 0 and result["error_count"] == 0:
+        return jsonify({"ok": False, "error": "추가할 행이 없습니다."}), 400
+    return jsonify(dict(result, ok=True))
 
-        db.session.commit()
-        return jsonify({"ok": True, "count": len(rows_to_insert)})
 
+def _import_progress_lines(progress):
+    """가져오기 진행 상황 -> NDJSON 줄 (배치마다 한 줄, 마지막 줄은 done=true 최종 결과)"""
+    try:
+        for result in progress:
+            if result["done"]:
+                yield json.dumps(dict(result, ok=True), ensure_ascii=False) + "\n"
+            else:
+                yield json.dumps({"count": result["count"], "rows_read": result["rows_read"],
+                                  "batches": result["batches"], "done": False}) + "\n"
     except Exception as e:
         db.session.rollback()
-        return jsonify({"ok": False, "error": str(e)}), 500
+        yield json.dumps({"ok": False, "done": True, "error": str(e)}, ensure_ascii=False) + "\n"
 
 # 단일 템플릿 수정
-@app.route("/plan/<int:plan_id>/templates/<int:template_id>/update", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/templates/<int:template_id>/update", methods=["POST"])
+@bumps_user_version
 def update_template(plan_id: int, template_id: int):
     """템플릿 한 건 수정: title, link_url, order_no 지원"""
     try:
@@ -1285,7 +1334,8 @@ def update_template(plan_id: int, template_id: int):
         return jsonify({"ok": False, "error": str(e)}), 500
 
 # 단일 템플릿 삭제
-@app.route("/plan/<int:plan_id>/templates/<int:template_id>/delete", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/templates/<int:template_id>/delete", methods=["POST"])
+@bumps_user_version
 def delete_template(plan_id: int, template_id: int):
     """템플릿 한 건 삭제"""
     try:
@@ -1306,7 +1356,8 @@ def delete_template(plan_id: int, template_id: int):
         return jsonify({"ok": False, "error": str(e)}), 500
 
 # 템플릿 일괄 수정
-@app.route("/plan/<int:plan_id>/templates/bulk_update", methods=["POST"])
+@bp.route("/plan/<int:plan_id>/templates/bulk_update", methods=["POST"])
+@bumps_user_version
 def bulk_update_templates(plan_id: int):
     """템플릿 다건 수정: [{template_id, title, link_url, order_no}, ...]"""
     try:
@@ -1357,17 +1408,60 @@ def bulk_update_templates(plan_id: int):
         return jsonify({"ok": False, "error": str(e)}), 500
 
 # 템플릿 관리 전용 페이지
-@app.route("/templates/manage")
+@bp.route("/templates/manage")
+@reads_from_replica
 @login_required
 def template_manage_page():
-    plans = get_plans_from_db()
+    plans = get_plan_summaries()
     active_plan_id = request.args.get("plan_id", type=int)
     if not active_plan_id and plans:
         active_plan_id = plans[0]["plan_id"]
     return render_template("template_manage.html", plans=plans, active_plan_id=active_plan_id)
 
+# 내부 지표 (캐시 히트/미스, 워커별 DB 연결 풀 등)
+@bp.route("/internal/metrics")
+@metrics_token_required
+def internal_metrics():
+    return jsonify({
+        "ok": True,
+        "calendar_cache": get_calendar_cache().stats(),
+        "month_fragments": get_month_fragments().stats(),
+        "db_pool": pool_stats(),
+        "sql": request_metrics.sql_stats()
+    })
+
+# Prometheus 수집용 지표 (엔드포인트별 지연시간 / SQL 쿼리 수·시간 / 템플릿 렌더링 / 연결 풀)
+@bp.route("/metrics")
+@metrics_token_required
+def prometheus_metrics():
+    return Response(request_metrics.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+# 데이터 내보내기 (CSV / NDJSON 스트리밍)
+@bp.route("/export/<dataset>.<fmt>")
+@reads_from_replica
+@login_required
+def export_data(dataset, fmt):
+    """로그인한 사용자의 데이터 내보내기
+
+    - dataset: tasks (계획 + 작업 + 현재 상태/실제 학습시간/메모), logs (상태 변경 이력)
+    - fmt: csv 또는 ndjson
+    결과 전체를 메모리에 올리지 않고 EXPORT_FETCH_SIZE 행씩 읽어 바로 응답으로 흘려보냅니다.
+    """
+    if dataset not in EXPORT_DATASETS or fmt not in EXPORT_FORMATS:
+        return jsonify({"ok": False, "error": "지원되지 않는 내보내기 형식입니다. (tasks|logs).(csv|ndjson)"}), 404
+    
+    user_id = session.get('user_id', 1)
+    lines = iter_export(dataset, fmt, user_id, fetch_size=current_app.config["EXPORT_FETCH_SIZE"])
+    filename = f"study_{dataset}_{get_today_kst().strftime('%Y%m%d')}.{fmt}"
+    return Response(
+        stream_with_context(lines),
+        content_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # 오늘의 학습 페이지
-@app.route("/today")
+@bp.route("/today")
+@reads_from_replica
 @login_required
 def today_learning():
     """오늘 계획된 학습 작업을 크게 보여주는 페이지"""
@@ -1375,94 +1469,57 @@ def today_learning():
     today_str = today.strftime("%Y-%m-%d")
     user_id = session.get('user_id', 1)
     
-    # 오늘 날짜의 모든 학습 작업 조회
-    query = text("""
-        SELECT 
-            p.plan_id,
-            p.title as plan_title,
-            p.subject,
-            p.image_url,
-            p.color,
-            t.task_id,
-            t.task_title,
-            t.link_url,
-            t.order_no,
-            ISNULL(
-                (SELECT TOP 1 status 
-                 FROM dbo.study_plan_log 
-                 WHERE task_id = t.task_id 
-                 ORDER BY updated_at DESC), 
-                'planned'
-            ) as status,
-            ISNULL(
-                (SELECT TOP 1 actual_minutes 
-                 FROM dbo.study_plan_log 
-                 WHERE task_id = t.task_id 
-                 ORDER BY updated_at DESC), 
-                0
-            ) as minutes,
-            ISNULL(
-                (SELECT TOP 1 memo 
-                 FROM dbo.study_plan_log 
-                 WHERE task_id = t.task_id 
-                 ORDER BY updated_at DESC), 
-                ''
-            ) as memo
-        FROM dbo.study_plan_task t
-        JOIN dbo.study_plan p ON t.plan_id = p.plan_id
-        WHERE t.plan_date = :today
-          AND p.user_id = :user_id
-        ORDER BY t.order_no, p.plan_id
-    """)
-    
-    result = db.session.execute(query, {"today": today_str, "user_id": user_id}).fetchall()
-    
-    # 계획별로 그룹화
-    plans_dict = {}
-    for row in result:
-        plan_id = row.plan_id
-        if plan_id not in plans_dict:
-            # DB에서 색상 가져오기, 없으면 plan_id 기반으로 기본 색상 할당
-            saved_color = row.color if hasattr(row, 'color') and row.color else None
-            if not saved_color:
-                color_idx = (plan_id - 1) % len(PLAN_COLORS)
-                saved_color = PLAN_COLORS[color_idx]
-            
-            plans_dict[plan_id] = {
-                "plan_id": plan_id,
-                "plan_title": row.plan_title,
-                "subject": row.subject,
-                "image_url": row.image_url if hasattr(row, 'image_url') else None,
-                "color": saved_color,
-                "tasks": []
-            }
-        
-        plans_dict[plan_id]["tasks"].append({
-            "task_id": row.task_id,
-            "task_title": row.task_title,
-            "link_url": row.link_url,
-            "order_no": row.order_no,
-            "status": row.status,
-            "minutes": row.minutes,
-            "memo": row.memo
-        })
-    
-    today_plans = list(plans_dict.values())
-    
-    # 통계 계산
-    total_tasks = len(result)
-    completed_tasks = sum(1 for r in result if r.status == 'done')
-    completion_rate = int((completed_tasks / total_tasks * 100)) if total_tasks > 0 else 0
+    # 오늘 날짜의 모든 학습 작업 조회 후 계획별로 그룹화 + 통계 계산
+    result = get_tasks_for_date(user_id, today_str)
     
     return render_template(
         "today_learning.html",
         today=today,
         today_str=today_str,
-        plans=today_plans,
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        completion_rate=completion_rate
+        **today_context(result, _plan_color)
     )
 
+def create_app(config=None):
+    """앱 팩토리
+
+    config: Config 를 덮어쓸 설정 클래스 또는 dict (예: 테스트용 DB URL)
+    DB URL / 풀 크기는 app.config 에서 읽어 db_config.init_db 로 엔진을 설정합니다.
+    gunicorn --preload 로 띄우면 fork 후 gunicorn.conf.py 의 post_fork 에서 연결 풀을 버립니다.
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if isinstance(config, dict):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+    
+    if not os.getenv("DB_URL") and not (app.debug or app.testing) \
+            and app.config["SQLALCHEMY_DATABASE_URI"] == Config.SQLALCHEMY_DATABASE_URI:
+        app.logger.warning(
+            "DB_URL 환경변수가 없어 기본 SQLite 파일(%s)을 사용합니다. "
+            "운영에서는 DB_URL 을 지정하고, 새 SQLite DB 라면 python migrations.py 로 테이블을 만드세요.",
+            Config.SQLALCHEMY_DATABASE_URI,
+        )
+    init_db(app)
+    init_version_tracking(db)
+    init_read_routing(app, db)
+    with app.app_context():
+        init_request_metrics(app, db.engines)
+    
+    app.extensions["calendar_cache"] = CalendarCache(
+        maxsize=app.config["CALENDAR_CACHE_SIZE"],
+        ttl=app.config["CALENDAR_CACHE_TTL"],
+    )
+    app.extensions["month_fragments"] = MonthFragmentCache(
+        maxsize=app.config["MONTH_FRAGMENT_CACHE_SIZE"],
+        ttl=app.config["MONTH_FRAGMENT_CACHE_TTL"],
+    )
+    
+    app.register_blueprint(bp)
+    return app
+
+# gunicorn app:app 및 관리 스크립트(from app import app, db) 용 기본 앱
+app = create_app()
+
 if __name__ == "__main__":
     app.run(debug=True)
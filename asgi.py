@@ -0,0 +1,224 @@
+"""
+ASGI 진입점: 자주 호출되는 읽기 API 를 AsyncEngine 으로 처리
+
+- GET /today, GET /day/<day_id>, GET /plan/<plan_id>/daily
+  -> 비동기 뷰 (DB 응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리)
+- 그 밖의 모든 요청 (쓰기 API 포함) -> 기존 Flask 앱 (asgiref WsgiToAsgi, 스레드 풀)
+- DB_READ_URLS 가 있으면 비동기 뷰도 동기 뷰와 같은 규칙으로 복제본 엔진에서 조회 (read_routing)
+
+URL 규칙, 세션 쿠키, 템플릿, ETag 는 Flask 앱의 것을 그대로 사용하므로
+두 경로의 응답(본문과 ETag)은 같습니다.
+
+실행 방법 (requirements-async.txt 설치 후):
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker -b 0.0.0.0:5000 asgi:application
+"""
+from asgiref.wsgi import WsgiToAsgi
+from flask import jsonify, make_response, redirect, render_template, request, session, url_for
+from werkzeug.exceptions import HTTPException
+
+from app import app as flask_app, _plan_color, get_today_kst
+from async_db import (
+    create_read_engine, fetch_plan_owner_version, fetch_plan_progress, fetch_rows, fetch_tasks_for_date,
+    fetch_user_version,
+)
+from data_version import check_not_modified, set_version_etag
+from db_config import db
+from read_routing import read_bind_key
+from read_queries import daily_page_payload, daily_page_query, day_tasks_payload, parse_day_id, today_context
+from request_metrics import instrument_engine
+from sql_dialect import install as install_sql_dialect
+
+
+async def _conditional_get(version, build):
+    """data_version.conditional_get 의 비동기 버전 (build 는 응답을 만드는 코루틴 함수)"""
+    if version is None:
+        return make_response(await build())
+
+    etag, response = check_not_modified(version)
+    if response is None:
+        response = make_response(await build())
+        if response.status_code != 200:
+            return response
+    return set_version_etag(response, etag)
+
+
+async def today_learning(engine):
+    """app.today_learning 의 비동기 버전"""
+    if 'user_id' not in session:
+        return redirect(url_for('main.login'))
+
+    today = get_today_kst()
+    today_str = today.strftime("%Y-%m-%d")
+    async with engine.connect() as conn:
+        result = await fetch_tasks_for_date(conn, session['user_id'], today_str)
+
+    return render_template(
+        "today_learning.html",
+        today=today,
+        today_str=today_str,
+        **today_context(result, _plan_color)
+    )
+
+
+async def day_detail(engine, day_id):
+    """app.day_detail 의 비동기 버전"""
+    user_id = session.get('user_id', 1)
+
+    async def build():
+        year = request.args.get('year', 2025, type=int)
+        try:
+            date_str = parse_day_id(day_id, year)
+            plan_id_param = request.args.get('plan_id', type=int)
+            result = await fetch_tasks_for_date(conn, user_id, date_str, plan_id_param)
+            return jsonify(day_tasks_payload(date_str, result))
+        except (ValueError, IndexError):
+            return jsonify({"ok": False, "error": "잘못된 날짜 형식입니다"})
+        except Exception as e:
+            return jsonify({"ok": False, "error": str(e)}), 500
+
+    async with engine.connect() as conn:
+        version = await fetch_user_version(conn, user_id)
+        return await _conditional_get(None if version is None else (user_id, version), build)
+
+
+async def get_daily_plans(engine, plan_id):
+    """app.get_daily_plans 의 비동기 버전"""
+    async def build():
+        try:
+            query, params, limit = daily_page_query(
+                plan_id, request.args,
+                flask_app.config["DAILY_PAGE_SIZE"], flask_app.config["DAILY_PAGE_SIZE_MAX"],
+                is_sqlite=engine.dialect.name == "sqlite",
+            )
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+
+        try:
+            rows = await fetch_rows(conn, query, params)
+            payload = daily_page_payload(rows, limit)
+            if not request.args.get("cursor"):
+                progress = await fetch_plan_progress(conn, session.get('user_id', 1))
+                payload["progress"] = progress.get(plan_id, {"task_count": 0, "done_count": 0})
+            return jsonify(payload)
+        except Exception as e:
+            return jsonify({"ok": False, "error": str(e)}), 500
+
+    async with engine.connect() as conn:
+        version = await fetch_plan_owner_version(conn, plan_id)
+        return await _conditional_get(version, build)
+
+
+# Flask 엔드포인트 이름 -> 비동기 뷰
+ASYNC_VIEWS = {
+    "main.today_learning": today_learning,
+    "main.day_detail": day_detail,
+    "main.get_daily_plans": get_daily_plans,
+}
+
+
+class AsyncReadApp:
+    """ASYNC_VIEWS 에 있는 GET 요청만 비동기로 처리하고 나머지는 Flask 앱으로 넘기는 ASGI 앱"""
+
+    def __init__(self, app, views=ASYNC_VIEWS, engine=None):
+        self.app = app
+        self.views = views
+        self.engine = engine
+        self.replicas = {}  # 복제본 bind key -> AsyncEngine (DB_READ_URLS)
+        self.wsgi = WsgiToAsgi(app)
+
+    def _create_engine(self, url):
+        engine = create_read_engine(url, pool_size=self.app.config.get("ASYNC_POOL_SIZE", 10))
+        # SQLite 는 T-SQL 문장 변환 + 내장 모드 PRAGMA (sql_dialect)
+        install_sql_dialect(engine.sync_engine, self.app.config)
+        # 요청별 SQL 지표 (/metrics) 에 비동기 경로의 쿼리도 포함
+        instrument_engine(engine.sync_engine)
+        return engine
+
+    def get_engine(self, bind_key=None):
+        """primary (bind_key 가 None) 또는 복제본 bind 의 AsyncEngine"""
+        # SQLite 상대 경로는 Flask-SQLAlchemy 가 instance 폴더 기준으로 바꾸므로 동기 엔진의 실제 URL 사용
+        if bind_key is not None:
+            if bind_key not in self.replicas:
+                with self.app.app_context():
+                    url = db.engines[bind_key].url
+                self.replicas[bind_key] = self._create_engine(url)
+            return self.replicas[bind_key]
+        if self.engine is None:
+            url = self.app.config.get("ASYNC_DB_URL")
+            if not url:
+                with self.app.app_context():
+                    url = db.engine.url
+            self.engine = self._create_engine(url)
+        return self.engine
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            matched = self._match(scope)
+            if matched is not None:
+                await self._dispatch(scope, send, *matched)
+                return
+        await self.wsgi(scope, receive, send)
+
+    def _match(self, scope):
+        """Flask URL 규칙으로 엔드포인트를 찾아 (비동기 뷰, view_args) 반환, 대상이 아니면 None"""
+        adapter = self.app.url_map.bind("", script_name=scope.get("root_path") or None)
+        try:
+            endpoint, view_args = adapter.match(scope["path"], method=scope["method"])
+        except HTTPException:
+            return None
+        view = self.views.get(endpoint)
+        return None if view is None else (view, view_args)
+
+    def _request_context(self, scope):
+        headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope["headers"]]
+        host = dict((k.lower(), v) for k, v in headers).get("host", "localhost")
+        client = scope.get("client") or ("", 0)
+        return self.app.test_request_context(
+            path=scope["path"],
+            base_url=f'{scope.get("scheme", "http")}://{host}{scope.get("root_path", "")}',
+            query_string=scope.get("query_string", b"").decode("latin-1"),
+            method=scope["method"],
+            headers=headers,
+            environ_base={"REMOTE_ADDR": client[0]},
+        )
+
+    async def _dispatch(self, scope, send, view, view_args):
+        # 요청 컨텍스트는 contextvars 기반이라 요청(태스크)마다 분리되므로 await 동안 유지해도 안전
+        with self._request_context(scope):
+            response = self.app.preprocess_request()
+            if response is None:
+                # 동기 뷰의 @reads_from_replica 와 같은 규칙 (최근에 쓴 사용자는 primary)
+                response = await view(self.get_engine(read_bind_key()), **view_args)
+            response = self.app.process_response(make_response(response))
+
+        await send({
+            "type": "http.response.start",
+            "status": response.status_code,
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in response.headers.items()],
+        })
+        body = b"" if scope["method"] == "HEAD" else response.get_data()
+        # WSGI 서버처럼 응답을 닫아 call_on_close 콜백(요청별 SQL 지표 기록) 실행
+        response.close()
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.get_engine()
+                for bind_key in self.app.extensions.get("read_replicas", []):
+                    self.get_engine(bind_key)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for engine in [self.engine, *self.replicas.values()]:
+                    if engine is not None:
+                        await engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = AsyncReadApp(flask_app)
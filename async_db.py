@@ -0,0 +1,76 @@
+"""
+비동기 읽기 경로용 AsyncEngine 과 쿼리 (asgi.py 에서 사용)
+
+- ASYNC_DB_URL 이 있으면 그대로 쓰고, 없으면 동기 DB URL 의 드라이버만 바꿉니다.
+  mssql+pyodbc -> mssql+aioodbc, sqlite -> sqlite+aiosqlite
+- SQL 과 결과 가공은 동기 뷰와 같은 read_queries / data_version 의 것을 사용합니다.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from data_version import PLAN_OWNER_VERSION_SQL, USER_VERSION_SQL
+from plan_stats import PROGRESS_SQL, progress_by_plan
+from read_queries import TASKS_FOR_DATE_SQL, tasks_for_date_params
+from sql_dialect import SQLITE_CONNECT_ARGS
+
+# 동기 드라이버 -> 비동기 드라이버
+ASYNC_DRIVERS = {
+    "mssql+pyodbc": "mssql+aioodbc",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url):
+    """동기 DB URL -> 비동기 드라이버 URL (이미 비동기 드라이버면 그대로)"""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url
+    if url.drivername not in ASYNC_DRIVERS:
+        raise ValueError(f"비동기 드라이버를 알 수 없는 DB URL 입니다: {url.drivername}")
+    return url.set(drivername=ASYNC_DRIVERS[url.drivername])
+
+
+def create_read_engine(url, pool_size=10):
+    """읽기 전용 AsyncEngine 생성 (연결 옵션은 db_config.init_db 와 동일)"""
+    url = async_database_url(url)
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = dict(SQLITE_CONNECT_ARGS)  # DATE / DATETIMEOFFSET -> date / datetime
+    if url.database not in (None, "", ":memory:"):
+        # aiosqlite 파일 DB 의 기본 풀은 NullPool(요청마다 연결 + 스레드 생성)이므로 큐 풀을 명시
+        # (메모리 SQLite 는 연결 1개를 공유하는 StaticPool 그대로 사용)
+        options.update(poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, pool_timeout=30)
+    return create_async_engine(url, **options)
+
+
+async def fetch_tasks_for_date(conn, user_id, date_str, plan_id=None):
+    """get_tasks_for_date 의 비동기 버전"""
+    result = await conn.execute(TASKS_FOR_DATE_SQL, tasks_for_date_params(user_id, date_str, plan_id))
+    return result.fetchall()
+
+
+async def fetch_user_version(conn, user_id):
+    result = await conn.execute(USER_VERSION_SQL, {"user_id": user_id})
+    return result.scalar()
+
+
+async def fetch_plan_owner_version(conn, plan_id):
+    result = await conn.execute(PLAN_OWNER_VERSION_SQL, {"plan_id": plan_id})
+    return result.scalar()
+
+
+async def fetch_plan_progress(conn, user_id):
+    """get_plan_progress 의 비동기 버전"""
+    result = await conn.execute(text(PROGRESS_SQL), {"user_id": user_id})
+    return progress_by_plan(result.fetchall())
+
+
+async def fetch_rows(conn, query, params):
+    result = await conn.execute(query, params)
+    return result.fetchall()
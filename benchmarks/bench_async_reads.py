@@ -0,0 +1,220 @@
+"""
+읽기 경로 벤치마크: 동기(스레드 풀 + Engine) vs 비동기(asyncio + AsyncEngine)
+실행 방법: python benchmarks/bench_async_reads.py [--tasks 20000] [--requests 2000]
+                                                 [--concurrency 8,32,128] [--threads 8] [--pool-size 32] [--rtt-ms 2]
+
+임시 SQLite 파일에 migrations.py 스키마를 만들고 /today, /day/<day_id>, /plan/<id>/daily 와
+같은 쿼리(read_queries)와 응답 가공을 실행해 처리량(req/s)과 지연시간(p50 / p95)을 비교합니다.
+- 동기: gunicorn 워커처럼 --threads 개 스레드가 요청을 나눠 처리
+- 비동기: 동시 요청 수만큼 코루틴이 AsyncEngine 으로 처리
+- --rtt-ms: 쿼리마다 네트워크 왕복 시간을 더해 원격 MSSQL 을 흉내냄
+  (SQLite 만으로는 DB 대기가 없고 aiosqlite 가 호출마다 스레드를 거치므로 동기 경로가 더 빠름.
+   비동기의 이점은 원격 DB 왕복 대기가 스레드 수를 넘는 동시 요청에 걸릴 때 나타남)
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+from werkzeug.datastructures import MultiDict  # noqa: E402
+
+import migrations  # noqa: E402
+from async_db import (  # noqa: E402
+    create_read_engine, fetch_plan_owner_version, fetch_rows, fetch_tasks_for_date, fetch_user_version,
+)
+from data_version import PLAN_OWNER_VERSION_SQL, USER_VERSION_SQL  # noqa: E402
+from db_config import db  # noqa: E402
+from read_queries import (  # noqa: E402
+    TASKS_FOR_DATE_SQL, daily_page_payload, daily_page_query, day_tasks_payload, tasks_for_date_params,
+    today_context,
+)
+from sql_dialect import SQLITE_CONNECT_ARGS, install as install_sql_dialect  # noqa: E402
+
+STATUSES = [None, "done", "done", "partial", "missed"]
+START = date(2025, 1, 1)
+DAYS = 730
+
+
+def _color(plan_id, saved_color):
+    return saved_color or "#E8F4FF"
+
+
+def build_database(path, n_users, n_plans, n_tasks, seed=42):
+    """스키마 생성 후 사용자 / 계획 / 작업 데이터 입력"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+    rnd = random.Random(seed)
+    with app.app_context():
+        migrations.run_migrations()
+        db.session.execute(
+            text("INSERT INTO study_plan_user (user_id, user_name) VALUES (:id, :name)"),
+            [{"id": u, "name": f"user{u}"} for u in range(1, n_users + 1)],
+        )
+        plans = [{"id": p, "user_id": (p - 1) % n_users + 1, "title": f"plan {p}"} for p in range(1, n_plans + 1)]
+        db.session.execute(
+            text("INSERT INTO study_plan (plan_id, user_id, title) VALUES (:id, :user_id, :title)"), plans
+        )
+        tasks = []
+        for i in range(n_tasks):
+            tasks.append({
+                "plan_id": rnd.randint(1, n_plans),
+                "plan_date": START + timedelta(days=rnd.randrange(DAYS)),
+                "title": f"task {i}",
+                "order_no": i % 5 + 1,
+                "status": rnd.choice(STATUSES),
+            })
+        db.session.execute(text("""
+            INSERT INTO study_plan_task (plan_id, plan_date, task_title, order_no, status)
+            VALUES (:plan_id, :plan_date, :title, :order_no, :status)
+        """), tasks)
+        db.session.commit()
+    with app.app_context():
+        db.engine.dispose()
+
+
+def make_workload(n_requests, n_users, n_plans, seed=7):
+    """(종류, 사용자, 날짜 또는 계획) 요청 목록"""
+    rnd = random.Random(seed)
+    kinds = ["today", "day", "daily"]
+    workload = []
+    for _ in range(n_requests):
+        kind = rnd.choice(kinds)
+        user_id = rnd.randint(1, n_users)
+        day = (START + timedelta(days=rnd.randrange(DAYS))).strftime("%Y-%m-%d")
+        workload.append((kind, user_id, day, rnd.randint(1, n_plans)))
+    return workload
+
+
+DAILY_ARGS = MultiDict({"limit": "200"})
+
+
+def sync_request(engine, item, rtt):
+    kind, user_id, day, plan_id = item
+    with engine.connect() as conn:
+        if kind == "today":
+            time.sleep(rtt)
+            rows = conn.execute(TASKS_FOR_DATE_SQL, tasks_for_date_params(user_id, day)).fetchall()
+            return today_context(rows, _color)
+        if kind == "day":
+            time.sleep(rtt)
+            conn.execute(USER_VERSION_SQL, {"user_id": user_id}).scalar()
+            time.sleep(rtt)
+            rows = conn.execute(TASKS_FOR_DATE_SQL, tasks_for_date_params(user_id, day)).fetchall()
+            return day_tasks_payload(day, rows)
+        time.sleep(rtt)
+        conn.execute(PLAN_OWNER_VERSION_SQL, {"plan_id": plan_id}).scalar()
+        query, params, limit = daily_page_query(plan_id, DAILY_ARGS, 200, 1000, is_sqlite=True)
+        time.sleep(rtt)
+        return daily_page_payload(conn.execute(query, params).fetchall(), limit)
+
+
+async def async_request(engine, item, rtt):
+    kind, user_id, day, plan_id = item
+    async with engine.connect() as conn:
+        if kind == "today":
+            await asyncio.sleep(rtt)
+            rows = await fetch_tasks_for_date(conn, user_id, day)
+            return today_context(rows, _color)
+        if kind == "day":
+            await asyncio.sleep(rtt)
+            await fetch_user_version(conn, user_id)
+            await asyncio.sleep(rtt)
+            rows = await fetch_tasks_for_date(conn, user_id, day)
+            return day_tasks_payload(day, rows)
+        await asyncio.sleep(rtt)
+        await fetch_plan_owner_version(conn, plan_id)
+        query, params, limit = daily_page_query(plan_id, DAILY_ARGS, 200, 1000, is_sqlite=True)
+        await asyncio.sleep(rtt)
+        return daily_page_payload(await fetch_rows(conn, query, params), limit)
+
+
+def run_sync(path, workload, concurrency, threads, rtt):
+    """동시 요청 concurrency 개를 threads 개 스레드가 처리 (대기 중인 요청은 큐에서 기다림)"""
+    engine = create_engine(f"sqlite:///{path}", pool_size=threads, max_overflow=0, connect_args=SQLITE_CONNECT_ARGS)
+    install_sql_dialect(engine)
+    latencies = []
+
+    def timed(item, queued_at):
+        sync_request(engine, item, rtt)
+        latencies.append(time.perf_counter() - queued_at)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # 동시에 concurrency 개 요청만 대기열에 두도록 묶어서 제출
+        for i in range(0, len(workload), concurrency):
+            batch_start = time.perf_counter()
+            futures = [pool.submit(timed, item, batch_start) for item in workload[i:i + concurrency]]
+            for f in futures:
+                f.result()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed, latencies
+
+
+async def _run_async(path, workload, concurrency, pool_size, rtt):
+    engine = create_read_engine(f"sqlite:///{path}", pool_size=pool_size)
+    install_sql_dialect(engine.sync_engine)
+    latencies = []
+
+    async def timed(item, queued_at):
+        await async_request(engine, item, rtt)
+        latencies.append(time.perf_counter() - queued_at)
+
+    start = time.perf_counter()
+    for i in range(0, len(workload), concurrency):
+        batch_start = time.perf_counter()
+        await asyncio.gather(*(timed(item, batch_start) for item in workload[i:i + concurrency]))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed, latencies
+
+
+def run_async(path, workload, concurrency, pool_size, rtt):
+    return asyncio.run(_run_async(path, workload, concurrency, pool_size, rtt))
+
+
+def report(label, concurrency, elapsed, latencies):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{label:6s} c={concurrency:<4d} {len(latencies) / elapsed:9.0f} req/s"
+          f"   p50 {p50:8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동기 vs 비동기 읽기 경로 벤치마크")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="8,32,128", help="동시 요청 수 (쉼표 구분)")
+    parser.add_argument("--threads", type=int, default=8, help="동기 경로의 워커 스레드 수")
+    parser.add_argument("--pool-size", type=int, default=32, help="비동기 경로의 연결 풀 크기")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="쿼리마다 더할 네트워크 왕복 시간 (ms)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"데이터 생성: users={args.users}, plans={args.plans}, tasks={args.tasks}")
+        build_database(path, args.users, args.plans, args.tasks)
+        workload = make_workload(args.requests, args.users, args.plans)
+        rtt = args.rtt_ms / 1000
+        print(f"\nrequests={args.requests}, threads={args.threads}, pool={args.pool_size}, rtt={args.rtt_ms}ms")
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            report("sync", concurrency, *run_sync(path, workload, concurrency, args.threads, rtt))
+            report("async", concurrency, *run_async(path, workload, concurrency, args.pool_size, rtt))
+
+
+if __name__ == "__main__":
+    main()
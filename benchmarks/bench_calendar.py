@@ -0,0 +1,146 @@
+"""
+달력 생성 마이크로 벤치마크: 기존 generate_fake_calendar 방식 vs calendar_grid 엔진
+실행 방법: python benchmarks/bench_calendar.py [--tasks 5000] [--plans 8] [--repeat 20]
+
+DB 없이 계획/작업 데이터를 메모리에서 만들어 달력 생성 시간만 비교합니다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from calendar import monthrange
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_grid import build_year_calendar  # noqa: E402
+
+STATUSES = ["planned", "done", "done", "partial", "missed"]
+COLORS = ["#FFE5E9", "#FFF0E0", "#FFFDE7", "#E8F8E8", "#E8F4FF", "#F0E5F9", "#FFF0EB"]
+
+
+def make_plans(n_plans, n_tasks, year, seed=42):
+    """여러 해에 걸친 작업을 가진 계획 목록 생성 (get_plans_from_db 결과 형태)"""
+    rnd = random.Random(seed)
+    start = date(year - 2, 1, 1)
+    span = (date(year + 1, 12, 31) - start).days
+    plans = []
+    per_plan = max(1, n_tasks // n_plans)
+    for p in range(1, n_plans + 1):
+        daily = []
+        for i in range(per_plan):
+            d = start + timedelta(days=rnd.randrange(span))
+            daily.append({
+                "task_id": p * 1_000_000 + i,
+                "date": d.strftime("%Y-%m-%d"),
+                "order": i + 1,
+                "description": f"Task {i + 1}",
+                "status": rnd.choice(STATUSES),
+            })
+        daily.sort(key=lambda dp: dp["date"])
+        plans.append({"plan_id": p, "color": COLORS[(p - 1) % len(COLORS)], "daily_plans": daily})
+    return plans
+
+
+def legacy_calendar(year, plans, today, plan_id=None):
+    """기존 app.generate_fake_calendar 의 계산 부분 (비교용 사본)"""
+    def month_days(y, m):
+        first_weekday, last_day = monthrange(y, m)
+        days = [None] * ((first_weekday + 1) % 7)
+        days += [date(y, m, d) for d in range(1, last_day + 1)]
+        return days
+
+    daily_plan_map = {}
+    for plan in plans:
+        if plan_id and plan.get("plan_id") != plan_id:
+            continue
+        plan_color = plan.get("color", "#E5E7EB")
+        plan_id_num = plan.get("plan_id")
+        for dp in plan.get("daily_plans", []):
+            date_str = dp.get("date")
+            status = dp.get("status", "planned")
+            if date_str:
+                if date_str in daily_plan_map:
+                    daily_plan_map[date_str]["multiple"] = True
+                    daily_plan_map[date_str]["total_count"] += 1
+                    if status == "done":
+                        daily_plan_map[date_str]["done_count"] += 1
+                    if status == "done" or daily_plan_map[date_str]["status"] == "done":
+                        daily_plan_map[date_str]["status"] = "done"
+                else:
+                    daily_plan_map[date_str] = {
+                        "status": status, "color": plan_color, "plan_id": plan_id_num,
+                        "multiple": False, "total_count": 1,
+                        "done_count": 1 if status == "done" else 0,
+                    }
+
+    data = {}
+    for m in range(1, 13):
+        month_list = []
+        for d in month_days(year, m):
+            if d is None:
+                month_list.append(None)
+                continue
+            date_str = d.strftime("%Y-%m-%d")
+            color = plan_id_val = None
+            is_multiple = all_done = False
+            if date_str in daily_plan_map:
+                entry = daily_plan_map[date_str]
+                status, color, plan_id_val = entry["status"], entry["color"], entry["plan_id"]
+                is_multiple = entry.get("multiple", False)
+                if is_multiple:
+                    total, done = entry.get("total_count", 0), entry.get("done_count", 0)
+                    all_done = total > 0 and total == done
+            else:
+                status = "none"
+            month_list.append({
+                "date": d, "status": status, "is_today": d == today,
+                "day_id": f"{m:02d}{d.day:02d}", "color": color, "plan_id": plan_id_val,
+                "multiple": is_multiple, "all_done": all_done,
+            })
+        data[m] = month_list
+    return data
+
+
+def _same_output(a, b):
+    for m in range(1, 13):
+        for x, y in zip(a[m], b[m], strict=True):
+            if x is None or y is None:
+                if x is not y:
+                    return False
+            elif dict(x) != y._asdict():
+                return False
+    return True
+
+
+def bench(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--plans", type=int, default=8)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    today = date(args.year, 6, 15)
+    print(f"{'tasks':>8} {'legacy(ms)':>12} {'grid(ms)':>10} {'speedup':>8}")
+    for n in args.tasks:
+        plans = make_plans(args.plans, n, args.year)
+        assert _same_output(legacy_calendar(args.year, plans, today),
+                            build_year_calendar(args.year, plans, today)), "결과 불일치"
+        legacy = bench(lambda: legacy_calendar(args.year, plans, today), args.repeat)
+        grid = bench(lambda: build_year_calendar(args.year, plans, today), args.repeat)
+        print(f"{n:>8} {legacy * 1000:>12.2f} {grid * 1000:>10.2f} {legacy / grid:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+엔드포인트 벤치마크: 로컬 SQLite 에 앱(create_app)을 띄워 주요 화면/API 의 지연시간과 메모리 할당 측정
+실행 방법: python benchmarks/bench_endpoints.py [--sizes 2000,20000,100000] [--plans 8] [--repeat 20]
+                                               [--alloc-repeat 5] [--output result.json]
+                                               [--compare baseline.json] [--threshold 1.2]
+
+데이터 크기(벤치마크 사용자의 작업 수)마다 임시 SQLite 파일에 migrations.py 스키마(create_tables.py 와 같은 테이블)를
+만들고 계획 / 작업 / 로그 / 템플릿을 넣은 뒤, Flask test_client 로 다음 요청을 보냅니다.
+- GET /                         캘린더 캐시 / 월 조각 캐시를 매번 비운 상태 (get_plans / generate_fake_calendar 경로)
+- GET / (cached)                캐시가 채워진 상태
+- GET /today, GET /day/<day_id>, GET /plan/<id>/daily (첫 페이지)
+- POST /plan/<id>/daily         계획 전체 목록을 보내며 매번 작업 하나의 상태만 바꿈 (save_daily_plans 의 diff 경로)
+- POST /plan/create_from_template
+
+측정값 (요청별)
+- latency_ms: 평균 / p50 / p95 / 최소 / 최대 (tracemalloc 없이 측정)
+- alloc_kb: tracemalloc 으로 따로 측정한 요청 중 최대 사용량(peak) 과 요청 후 남은 증가량(net)
+- queries: 요청당 SQL 문 수 (request_metrics 집계)
+결과는 JSON 으로 --output 파일(없으면 stdout)에 쓰고, 사람이 읽는 표는 stderr 로 출력합니다.
+--compare 로 이전 결과 파일을 주면 (크기, 엔드포인트)별 p50 / peak 비율을 출력하고,
+--threshold 배 이상 느려지거나 메모리를 더 쓴 항목이 있으면 종료 코드 1 을 반환합니다.
+
+SQLite 실행은 앱과 같은 sql_dialect 계층(T-SQL 변환 + 내장 모드 PRAGMA)을 사용합니다.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+import migrations  # noqa: E402
+from app import create_app, get_today_kst  # noqa: E402
+from db_config import db  # noqa: E402
+from request_metrics import request_metrics  # noqa: E402
+
+USER_ID = 1
+STATUSES = [None, None, "done", "done", "partial", "missed"]
+TEMPLATE_ITEMS = 100
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri"]
+
+
+def seed(n_tasks, n_plans, today, seed_value=42):
+    """벤치마크 사용자 1명의 계획 / 작업 / 로그 / 템플릿 입력 (앱 컨텍스트 안에서 호출)
+
+    작업은 오늘 기준 2년 전 ~ 1년 후 날짜에 흩어지고, 상태가 있는 작업은 로그 1~3건을 가집니다.
+    """
+    rnd = random.Random(seed_value)
+    start = today - timedelta(days=730)
+    span = 1095
+    session = db.session
+    session.execute(
+        text("INSERT INTO study_plan_user (user_id, user_name) VALUES (:id, :name)"),
+        {"id": USER_ID, "name": "bench"},
+    )
+    session.execute(
+        text("INSERT INTO study_plan (plan_id, user_id, title, subject, color) "
+             "VALUES (:id, :user_id, :title, :subject, :color)"),
+        [{"id": p, "user_id": USER_ID, "title": f"plan {p}", "subject": "bench", "color": None}
+         for p in range(1, n_plans + 1)],
+    )
+
+    tasks, logs = [], []
+    order_by_slot = {}
+    for task_id in range(1, n_tasks + 1):
+        plan_id = rnd.randint(1, n_plans)
+        plan_date = start + timedelta(days=rnd.randrange(span))
+        order_no = order_by_slot.get((plan_id, plan_date), 0) + 1
+        order_by_slot[(plan_id, plan_date)] = order_no
+        status = rnd.choice(STATUSES) if plan_date <= today else None
+        minutes = rnd.choice([0, 30, 45, 60]) if status else None
+        updated_at = None
+        if status:
+            for i in range(rnd.randint(1, 3)):
+                updated_at = datetime.combine(plan_date, datetime.min.time()) + timedelta(hours=9 + i)
+                logs.append({"task_id": task_id, "status": status if i == 0 else "partial",
+                             "minutes": minutes, "updated_at": updated_at})
+            # 마지막 로그가 최신 상태
+            logs[-1]["status"] = status
+        tasks.append({
+            "task_id": task_id, "plan_id": plan_id, "plan_date": plan_date,
+            "title": f"task {task_id}", "order_no": order_no,
+            "status": status, "minutes": minutes, "updated_at": updated_at,
+        })
+    session.execute(text("""
+        INSERT INTO study_plan_task
+            (task_id, plan_id, plan_date, task_title, order_no, status, actual_minutes, memo, status_updated_at)
+        VALUES (:task_id, :plan_id, :plan_date, :title, :order_no, :status, :minutes, NULL, :updated_at)
+    """), tasks)
+    if logs:
+        session.execute(text("""
+            INSERT INTO study_plan_log (task_id, user_id, status, actual_minutes, memo, updated_at)
+            VALUES (:task_id, 1, :status, :minutes, '', :updated_at)
+        """), logs)
+
+    session.execute(
+        text("INSERT INTO study_template (template_id, template_title, subject) VALUES (1, 'bench', 'bench')")
+    )
+    session.execute(
+        text("INSERT INTO study_task_template (template_id, order_no, title, link_url) "
+             "VALUES (1, :order_no, :title, NULL)"),
+        [{"order_no": i, "title": f"item {i}"} for i in range(1, TEMPLATE_ITEMS + 1)],
+    )
+    session.commit()
+    return len(logs)
+
+
+def _largest_plan_payload(n_plans):
+    """작업이 가장 많은 계획과 그 전체 일일 계획 목록 (POST /plan/<id>/daily 요청 본문용)"""
+    counts = db.session.execute(text(
+        "SELECT plan_id, COUNT(*) AS n FROM study_plan_task GROUP BY plan_id ORDER BY n DESC, plan_id"
+    )).fetchall()
+    plan_id = counts[0].plan_id if counts else 1
+    rows = db.session.execute(text("""
+        SELECT task_id, plan_date, task_title, link_url, order_no, COALESCE(status, 'planned') AS status
+        FROM study_plan_task WHERE plan_id = :plan_id ORDER BY plan_date, order_no, task_id
+    """), {"plan_id": plan_id}).fetchall()
+    daily_plans = [{
+        "task_id": r.task_id,
+        "date": r.plan_date.strftime("%Y-%m-%d"),
+        "description": r.task_title,
+        "link_url": r.link_url,
+        "order": r.order_no,
+        "status": r.status,
+    } for r in rows]
+    return plan_id, daily_plans
+
+
+def _query_totals(endpoint):
+    """request_metrics 의 엔드포인트별 (요청 수, 쿼리 수 합계)"""
+    for label, histogram in request_metrics.query_count.items():
+        if label == endpoint:
+            return histogram.count, histogram.sum
+    return 0, 0.0
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_cases(app, client, today, n_plans):
+    """(이름, Flask 엔드포인트, 요청 함수, 요청 전 준비 함수) 목록"""
+    with app.app_context():
+        plan_id, daily_plans = _largest_plan_payload(n_plans)
+    day_id = today.strftime("%m%d")
+    toggles = {"i": 0}
+
+    def clear_calendar_caches():
+        app.extensions["calendar_cache"].clear()
+        app.extensions["month_fragments"].fragments.clear()
+
+    def post_daily():
+        # 매번 한 작업의 상태만 바꿔 diff -> 로그 1건 + 상태 동기화 경로를 탐
+        i = toggles["i"]
+        toggles["i"] += 1
+        if daily_plans:
+            item = daily_plans[i % len(daily_plans)]
+            item["status"] = "done" if item["status"] == "planned" else "planned"
+        return client.post(f"/plan/{plan_id}/daily", json={"daily_plans": daily_plans})
+
+    template_body = {
+        "source_template_id": 1,
+        "title": "bench template plan",
+        "subject": "bench",
+        "start_date": today.strftime("%Y-%m-%d"),
+        "end_date": (today + timedelta(days=365)).strftime("%Y-%m-%d"),
+        "selected_weekdays": WEEKDAYS,
+    }
+
+    return [
+        ("GET /", "main.index", lambda: client.get(f"/{today.year}"), clear_calendar_caches),
+        ("GET / (cached)", "main.index", lambda: client.get(f"/{today.year}"), None),
+        ("GET /today", "main.today_learning", lambda: client.get("/today"), None),
+        ("GET /day/<day_id>", "main.day_detail",
+         lambda: client.get(f"/day/{day_id}?year={today.year}"), None),
+        ("GET /plan/<id>/daily", "main.get_daily_plans", lambda: client.get(f"/plan/{plan_id}/daily"), None),
+        ("POST /plan/<id>/daily", "main.save_daily_plans", post_daily, None),
+        ("POST /plan/create_from_template", "main.create_plan_from_template",
+         lambda: client.post("/plan/create_from_template", json=template_body), None),
+    ], {"plan_id": plan_id, "plan_tasks": len(daily_plans)}
+
+
+def run_case(request, prepare, endpoint, repeat, alloc_repeat, warmup=2):
+    statuses = {}
+    errors = []
+
+    def send():
+        # WSGI 서버처럼 본문(스트리밍 포함)을 끝까지 읽고 닫음 (request_metrics 는 응답을 닫을 때 기록)
+        response = request()
+        body = response.get_data(as_text=True)
+        response.close()
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code >= 400 and len(errors) < 3:
+            errors.append(body[:300])
+
+    for _ in range(warmup):
+        if prepare:
+            prepare()
+        send()
+
+    count_before, queries_before = _query_totals(endpoint)
+    latencies = []
+    for _ in range(repeat):
+        if prepare:
+            prepare()
+        started = time.perf_counter()
+        send()
+        latencies.append((time.perf_counter() - started) * 1000)
+    count_after, queries_after = _query_totals(endpoint)
+    queries = (queries_after - queries_before) / max(count_after - count_before, 1)
+
+    peaks, nets = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_repeat):
+            if prepare:
+                prepare()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            send()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append((peak - before) / 1024)
+            nets.append((current - before) / 1024)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        "requests": repeat,
+        "status": {str(code): n for code, n in sorted(statuses.items())},
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3),
+            "p50": round(_percentile(latencies, 0.50), 3),
+            "p95": round(_percentile(latencies, 0.95), 3),
+            "min": round(latencies[0], 3),
+            "max": round(latencies[-1], 3),
+        },
+        "alloc_kb": {
+            "peak": round(statistics.median(peaks), 1) if peaks else None,
+            "net": round(statistics.median(nets), 1) if nets else None,
+        },
+        "queries": round(queries, 2),
+    }
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def run_size(n_tasks, args, today):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        app = create_app({
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+            "SECRET_KEY": "bench",
+            "SQL_QUERY_BUDGET": 0,
+        })
+        app.logger.disabled = True
+        with app.app_context():
+            with contextlib.redirect_stdout(sys.stderr):  # stdout 은 JSON 결과용
+                migrations.run_migrations()
+            started = time.perf_counter()
+            n_logs = seed(n_tasks, args.plans, today)
+            seed_seconds = time.perf_counter() - started
+
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["user_id"] = USER_ID
+            sess["user_name"] = "bench"
+
+        cases, info = build_cases(app, client, today, args.plans)
+        results = []
+        for name, endpoint, request, prepare in cases:
+            if args.only and not any(f in name for f in args.only):
+                continue
+            result = run_case(request, prepare, endpoint, args.repeat, args.alloc_repeat)
+            results.append(dict({"size": n_tasks, "endpoint": name}, **result))
+            print(f"  {n_tasks:>8} {name:<34} p50 {result['latency_ms']['p50']:>9.2f}ms "
+                  f"p95 {result['latency_ms']['p95']:>9.2f}ms peak {result['alloc_kb']['peak']:>9.1f}KB "
+                  f"queries {result['queries']:>5} status {result['status']}", file=sys.stderr)
+
+        with app.app_context():
+            db.engine.dispose()
+        dataset = {"size": n_tasks, "plans": args.plans, "logs": n_logs,
+                   "seed_seconds": round(seed_seconds, 2), **info}
+        return dataset, results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """이전 결과 대비 p50 / peak 비율 출력, 회귀 항목 수 반환"""
+    old = {(r["size"], r["endpoint"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n{'size':>8} {'endpoint':<34} {'p50 old':>9} {'p50 new':>9} {'ratio':>6} "
+          f"{'peak old':>9} {'peak new':>9} {'ratio':>6}", file=sys.stderr)
+    for r in current["results"]:
+        o = old.get((r["size"], r["endpoint"]))
+        if o is None:
+            continue
+        p_old, p_new = o["latency_ms"]["p50"], r["latency_ms"]["p50"]
+        m_old, m_new = o["alloc_kb"]["peak"] or 0, r["alloc_kb"]["peak"] or 0
+        p_ratio = p_new / p_old if p_old else 1.0
+        m_ratio = m_new / m_old if m_old else 1.0
+        flag = ""
+        if p_ratio >= threshold or m_ratio >= threshold:
+            regressions += 1
+            flag = "  <- 회귀"
+        print(f"{r['size']:>8} {r['endpoint']:<34} {p_old:>9.2f} {p_new:>9.2f} {p_ratio:>6.2f} "
+              f"{m_old:>9.1f} {m_new:>9.1f} {m_ratio:>6.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔드포인트 지연시간 / 메모리 할당 벤치마크 (SQLite)")
+    parser.add_argument("--sizes", default="2000,20000,100000", help="벤치마크 사용자의 작업 수 목록 (쉼표 구분)")
+    parser.add_argument("--plans", type=int, default=8, help="계획 수")
+    parser.add_argument("--repeat", type=int, default=20, help="엔드포인트별 지연시간 측정 요청 수")
+    parser.add_argument("--alloc-repeat", type=int, default=5, help="엔드포인트별 tracemalloc 측정 요청 수")
+    parser.add_argument("--only", action="append", help="이름에 이 문자열이 들어간 엔드포인트만 (여러 번 지정 가능)")
+    parser.add_argument("--output", help="JSON 결과 파일 (없으면 stdout)")
+    parser.add_argument("--compare", help="비교할 이전 JSON 결과 파일")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 볼 비율 (--compare)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    today = get_today_kst()
+    report = {
+        "meta": {
+            "benchmark": "endpoints",
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "today": today.isoformat(),
+            "repeat": args.repeat,
+            "alloc_repeat": args.alloc_repeat,
+        },
+        "datasets": [],
+        "results": [],
+    }
+    for n_tasks in sizes:
+        print(f"▶ 작업 {n_tasks}개", file=sys.stderr)
+        dataset, results = run_size(n_tasks, args, today)
+        report["datasets"].append(dataset)
+        report["results"].extend(results)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+대량 INSERT 공용 모듈
+
+- bulk_insert: 여러 행을 한 번에 INSERT
+    MSSQL(pyodbc)  : executemany (엔진의 fast_executemany 로 파라미터 배열 1회 전송)
+    SQLite         : 여러 행 VALUES (...), (...) 를 묶어서 실행
+- insert_returning_id: 한 행 INSERT 후 새 ID 를 같은 문장에서 반환
+    MSSQL: OUTPUT INSERTED.<id>,  SQLite: RETURNING <id>
+    (SELECT MAX(id) 방식은 동시 요청 시 다른 사용자의 ID 를 가져올 수 있음)
+- bulk_insert_returning_ids: 여러 행을 한 문장으로 INSERT 하고 새 ID 들을 행 순서대로 반환
+- insert_many: 튜플 목록을 DBAPI executemany 로 INSERT (seeds.py 처럼 수백만 행을 만들 때)
+
+커밋은 호출자가 담당하므로 여러 INSERT 를 하나의 트랜잭션으로 묶을 수 있습니다.
+"""
+from sqlalchemy import text
+from db_config import db
+from sql_dialect import now_sql
+
+# SQLite 기본 바인드 변수 상한(구버전 999)을 넘지 않도록 묶음 크기 계산
+SQLITE_MAX_VARIABLES = 999
+# MSSQL 한 문장의 파라미터 상한(2100)보다 조금 작게
+MSSQL_MAX_PARAMETERS = 2000
+
+
+def _dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+def insert_returning_id(table, values, id_column, now_columns=("created_at",)):
+    """한 행 INSERT 후 생성된 ID 반환"""
+    dialect_name = _dialect_name()
+    now = now_sql(dialect_name)
+    columns = list(values.keys())
+    col_sql = ", ".join(columns + list(now_columns))
+    val_sql = ", ".join([f":{c}" for c in columns] + [now] * len(now_columns))
+
+    if dialect_name == "sqlite":
+        stmt = f"INSERT INTO {table} ({col_sql}) VALUES ({val_sql}) RETURNING {id_column}"
+    else:
+        stmt = f"INSERT INTO {table} ({col_sql}) OUTPUT INSERTED.{id_column} VALUES ({val_sql})"
+    return db.session.execute(text(stmt), values).scalar_one()
+
+
+def bulk_insert(table, columns, rows, now_columns=("created_at",)):
+    """여러 행 INSERT (rows: columns 키를 가진 dict 목록), 삽입한 행 수 반환"""
+    if not rows:
+        return 0
+    dialect_name = _dialect_name()
+    now = now_sql(dialect_name)
+    col_sql = ", ".join(list(columns) + list(now_columns))
+
+    if dialect_name != "sqlite":
+        val_sql = ", ".join([f":{c}" for c in columns] + [now] * len(now_columns))
+        stmt = text(f"INSERT INTO {table} ({col_sql}) VALUES ({val_sql})")
+        db.session.execute(stmt, [{c: r.get(c) for c in columns} for r in rows])
+        return len(rows)
+
+    chunk_size = max(1, SQLITE_MAX_VARIABLES // max(1, len(columns)))
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        params = {}
+        values_sql = []
+        for i, r in enumerate(chunk):
+            placeholders = []
+            for c in columns:
+                params[f"{c}_{i}"] = r.get(c)
+                placeholders.append(f":{c}_{i}")
+            values_sql.append("(" + ", ".join(placeholders + [now] * len(now_columns)) + ")")
+        db.session.execute(text(f"INSERT INTO {table} ({col_sql}) VALUES {', '.join(values_sql)}"), params)
+    return len(rows)
+
+
+def _values_chunks(columns, rows, max_variables):
+    """rows -> (VALUES 자리표시자 목록, 파라미터) 묶음 (묶음마다 바인드 변수 max_variables 개 이하)"""
+    chunk_size = max(1, max_variables // max(1, len(columns)))
+    for start in range(0, len(rows), chunk_size):
+        params = {}
+        values_sql = []
+        for i, r in enumerate(rows[start:start + chunk_size]):
+            for c in columns:
+                params[f"{c}_{i}"] = r.get(c)
+            values_sql.append([f":{c}_{i}" for c in columns])
+        yield values_sql, params
+
+
+def bulk_insert_returning_ids(table, columns, rows, id_column, now_columns=("created_at",)):
+    """여러 행 INSERT 후 생성된 ID 목록을 rows 순서대로 반환 (묶음마다 문장 1회)
+
+    IDENTITY / rowid 는 행 순서대로 증가하도록 넣으므로 반환된 ID 를 정렬하면 rows 순서와 같습니다.
+    - SQLite: VALUES 순서대로 rowid 할당, RETURNING <id>
+    - MSSQL : INSERT ... SELECT ... ORDER BY 는 그 순서대로 IDENTITY 값을 할당 (OUTPUT 자체는 순서 보장 없음)
+    """
+    if not rows:
+        return []
+    dialect_name = _dialect_name()
+    now = now_sql(dialect_name)
+    col_sql = ", ".join(list(columns) + list(now_columns))
+    ids = []
+
+    if dialect_name == "sqlite":
+        for values_sql, params in _values_chunks(columns, rows, SQLITE_MAX_VARIABLES):
+            values = ", ".join("(" + ", ".join(v + [now] * len(now_columns)) + ")" for v in values_sql)
+            stmt = f"INSERT INTO {table} ({col_sql}) VALUES {values} RETURNING {id_column}"
+            ids.extend(sorted(db.session.execute(text(stmt), params).scalars()))
+        return ids
+
+    select_sql = ", ".join([f"v.{c}" for c in columns] + [now] * len(now_columns))
+    for values_sql, params in _values_chunks(columns, rows, MSSQL_MAX_PARAMETERS):
+        values = ", ".join("(" + ", ".join(v + [str(i)]) + ")" for i, v in enumerate(values_sql))
+        stmt = (
+            f"INSERT INTO {table} ({col_sql}) OUTPUT INSERTED.{id_column} "
+            f"SELECT {select_sql} FROM (VALUES {values}) AS v ({', '.join(columns)}, ord) ORDER BY v.ord"
+        )
+        ids.extend(sorted(db.session.execute(text(stmt), params).scalars()))
+    return ids
+
+
+def insert_many(table, columns, rows, identity_insert=False):
+    """튜플 목록(columns 순서)을 문장 하나의 executemany 로 INSERT, 삽입한 행 수 반환
+
+    bulk_insert 와 달리 행마다 dict / 바인드 이름을 만들지 않아 대량 생성에 적합합니다.
+    (SQLite / pyodbc 모두 ? 파라미터, MSSQL 은 fast_executemany 로 배열 전송)
+    identity_insert: IDENTITY 컬럼에 ID 를 직접 넣는 경우 MSSQL 에서 SET IDENTITY_INSERT ON/OFF 로 감쌈
+    """
+    if not rows:
+        return 0
+    conn = db.session.connection()
+    mssql = conn.dialect.name == "mssql"
+    stmt = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    if identity_insert and mssql:
+        conn.exec_driver_sql(f"SET IDENTITY_INSERT {table} ON")
+    try:
+        conn.exec_driver_sql(stmt, rows)
+    finally:
+        if identity_insert and mssql:
+            conn.exec_driver_sql(f"SET IDENTITY_INSERT {table} OFF")
+    return len(rows)
@@ -0,0 +1,85 @@
+"""
+사용자별 캘린더 화면 데이터 캐시 (프로세스 내 LRU)
+
+키는 (user_id, year, plan_id 필터, 오늘 날짜, 사용자 data_version) 이며,
+날짜가 바뀌거나 사용자 데이터가 바뀌면 (data_version.py, 쓰기마다 +1) 자연스럽게 새 키가 됩니다.
+캐시는 워커 프로세스마다 따로 있지만 버전은 DB 에 있으므로 다른 워커의 쓰기 뒤에도 옛 값을 쓰지 않습니다.
+쓰기 API 가 커밋된 뒤 invalidate_user() 로 이 프로세스의 해당 사용자 항목을 비워 메모리를 돌려받습니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class CalendarCache:
+    """크기(maxsize)와 만료 시간(ttl, 초) 제한이 있는 LRU 캐시"""
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """캐시된 값 반환, 없거나 만료되었으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key, builder):
+        """캐시에 있으면 반환, 없으면 builder() 결과를 저장 후 반환"""
+        value = self.get(key)
+        if value is None:
+            value = builder()
+            self.set(key, value)
+        return value
+
+    def invalidate_user(self, user_id):
+        """해당 사용자의 모든 항목 삭제 (키의 첫 요소가 user_id)"""
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == user_id]
+            for k in stale:
+                del self._entries[k]
+            self.invalidations += 1
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """히트/미스 카운터 및 현재 크기"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,134 @@
+"""
+연간 달력 그리드 엔진
+
+연도별로 변하지 않는 뼈대(앞쪽 공백, day_id, 날짜 객체, 월 시작 위치)는 프로세스당 한 번만 만들고,
+일별 상태/색상/개수는 '1월 1일부터의 일수'를 인덱스로 하는 배열에 채운 뒤
+마지막에 템플릿이 읽을 월별 리스트만 만듭니다.
+"""
+from array import array
+from calendar import monthrange
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
+
+# 템플릿에서 d.date, d.status ... 형태로 읽는 달력 칸
+DayCell = namedtuple(
+    "DayCell",
+    ["date", "status", "is_today", "day_id", "color", "plan_id", "multiple", "all_done"],
+)
+
+# 상태 코드 (배열에는 정수로 저장)
+STATUS_NAMES = ("none", "planned", "done", "partial", "missed")
+_STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+_DONE = _STATUS_CODES["done"]
+
+YearSkeleton = namedtuple(
+    "YearSkeleton",
+    ["year", "prefix", "index_by_md", "days", "month_offsets", "month_lengths", "paddings", "empty_cells"],
+)
+
+
+@lru_cache(maxsize=16)
+def year_skeleton(year):
+    """연도별 불변 데이터 (프로세스 내 캐시)"""
+    days = []
+    month_offsets = []
+    month_lengths = []
+    paddings = []
+    empty_cells = []
+    index_by_md = {}
+    for m in range(1, 13):
+        first_weekday, last_day = monthrange(year, m)
+        month_offsets.append(len(days))
+        month_lengths.append(last_day)
+        # 일요일 시작 달력 기준 앞쪽 공백
+        paddings.append((first_weekday + 1) % 7)
+        for d in range(1, last_day + 1):
+            day = date(year, m, d)
+            index_by_md[f"{m:02d}-{d:02d}"] = len(days)
+            days.append(day)
+            empty_cells.append(DayCell(day, "none", False, f"{m:02d}{d:02d}", None, None, False, False))
+    return YearSkeleton(
+        year,
+        f"{year:04d}-",
+        index_by_md,
+        tuple(days),
+        tuple(month_offsets),
+        tuple(month_lengths),
+        tuple(paddings),
+        tuple(empty_cells),
+    )
+
+
+def build_year_calendar(year, plans, today, plan_id=None):
+    """계획 목록으로 월별 달력 데이터 생성
+
+    반환값: {월: [None(공백) 또는 DayCell, ...]}
+    - 한 날짜에 여러 계획이 있으면 첫 계획의 색상/plan_id 를 쓰고 multiple=True
+    - 하나라도 done 이면 상태는 done, 모두 done 이면 all_done=True
+    """
+    skeleton = year_skeleton(year)
+    n = len(skeleton.days)
+
+    status = bytearray(n)            # 0 = 계획 없음
+    total = array("H", bytes(2 * n))
+    done = array("H", bytes(2 * n))
+    color_idx = array("h", [-1]) * n
+    plan_ids = array("l", bytes(array("l").itemsize * n))
+    colors = []
+    prefix = skeleton.prefix
+    index_by_md = skeleton.index_by_md
+
+    for plan in plans:
+        # 특정 계획 필터링: plan_id가 지정된 경우 해당 계획만 반영
+        if plan_id and plan.get("plan_id") != plan_id:
+            continue
+        colors.append(plan.get("color", "#E5E7EB"))  # 기본 회색
+        ci = len(colors) - 1
+        pid = plan.get("plan_id")
+        for dp in plan.get("daily_plans", []):
+            # 'YYYY-MM-DD' 문자열을 파싱하지 않고 연도 접두어 + 'MM-DD' 조회로 인덱스 계산
+            date_str = dp.get("date")
+            if not date_str or not date_str.startswith(prefix):
+                continue
+            idx = index_by_md.get(date_str[5:])
+            if idx is None:
+                continue
+            code = _STATUS_CODES.get(dp.get("status", "planned"), 1)
+            if total[idx] == 0:
+                status[idx] = code
+                color_idx[idx] = ci
+                plan_ids[idx] = pid
+            elif code == _DONE:
+                status[idx] = _DONE
+            total[idx] += 1
+            if code == _DONE:
+                done[idx] += 1
+
+    # 템플릿용 월별 리스트 (계획 없는 날은 미리 만들어 둔 칸을 그대로 사용)
+    today_idx = today.toordinal() - skeleton.days[0].toordinal()
+    data = {}
+    for m in range(1, 13):
+        start = skeleton.month_offsets[m - 1]
+        month_list = [None] * skeleton.paddings[m - 1]
+        for idx in range(start, start + skeleton.month_lengths[m - 1]):
+            cnt = total[idx]
+            if cnt == 0 and idx != today_idx:
+                month_list.append(skeleton.empty_cells[idx])
+                continue
+            base = skeleton.empty_cells[idx]
+            if cnt == 0:
+                month_list.append(base._replace(is_today=True))
+                continue
+            month_list.append(DayCell(
+                base.date,
+                STATUS_NAMES[status[idx]],
+                idx == today_idx,
+                base.day_id,
+                colors[color_idx[idx]],
+                plan_ids[idx],
+                cnt > 1,
+                cnt > 1 and cnt == done[idx],
+            ))
+        data[m] = month_list
+    return data
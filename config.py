@@ -7,8 +7,64 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_AS_ASCII = False
 
-    # 편의 옵션
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
+    # 연결 풀 (워커 프로세스마다 pool_size + max_overflow 개까지 연결, 지표는 /internal/metrics 의 db_pool)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+    # SQLite 내장 모드 (DB_URL 이 sqlite 파일일 때, sql_dialect.py): WAL / synchronous=NORMAL / mmap
+    # 한 서버에서 앱과 DB 를 같이 돌리는 소규모 배포용 (원격 MSSQL 왕복 없음)
+    SQLITE_TUNED = os.getenv("SQLITE_TUNED", "1") == "1"
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))  # 연결별 페이지 캐시
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # 쓰기 잠금 대기
+    # 연결 간 페이지 캐시 공유 (기본 끔: 테이블 단위 잠금이라 WAL 의 읽기/쓰기 동시성이 줄어듦)
+    SQLITE_SHARED_CACHE = os.getenv("SQLITE_SHARED_CACHE", "0") == "1"
+
+    # 읽기 전용 복제본 (read_routing.py): 쉼표로 구분한 URL 목록, 비어 있으면 모든 요청이 DB_URL 사용
+    # 읽기 화면(/, /today, /day/<day_id>, /templates 등)은 복제본, 쓰기는 DB_URL (primary)
+    DB_READ_URLS = [url.strip() for url in os.getenv("DB_READ_URLS", "").split(",") if url.strip()]
+    # 커밋한 사용자의 읽기를 primary 로 보내는 시간(초): 복제 지연보다 길게
+    DB_READ_STICKY_SECONDS = float(os.getenv("DB_READ_STICKY_SECONDS", "5"))
+
+    # 편의 옵션 (세션 서명 키: 운영에서는 SECRET_KEY 환경변수로 지정)
+    SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
+
+    # 캘린더 화면 캐시 (사용자별 LRU): 최대 항목 수 / 만료 시간(초)
+    CALENDAR_CACHE_SIZE = int(os.getenv("CALENDAR_CACHE_SIZE", "256"))
+    CALENDAR_CACHE_TTL = int(os.getenv("CALENDAR_CACHE_TTL", "300"))
+
+    # 달력 월 단위 HTML 조각 캐시: 최대 조각 수 / 만료 시간(초)
+    MONTH_FRAGMENT_CACHE_SIZE = int(os.getenv("MONTH_FRAGMENT_CACHE_SIZE", "2048"))
+    MONTH_FRAGMENT_CACHE_TTL = int(os.getenv("MONTH_FRAGMENT_CACHE_TTL", "3600"))
+
+    # GET /plan/<plan_id>/daily 페이지 크기 (기본 / 최대)
+    DAILY_PAGE_SIZE = int(os.getenv("DAILY_PAGE_SIZE", "200"))
+    DAILY_PAGE_SIZE_MAX = int(os.getenv("DAILY_PAGE_SIZE_MAX", "1000"))
+
+    # 템플릿 파일 가져오기: 배치 크기(행) / 최대 행 수 / 최대 파일 크기(bytes)
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "200000"))
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(20 * 1024 * 1024)))
+
+    # 데이터 내보내기: DB 에서 한 번에 가져올 행 수
+    EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+
+    # /day/update_batch 한 요청의 최대 항목 수
+    STATUS_BATCH_MAX = int(os.getenv("STATUS_BATCH_MAX", "500"))
+
+    # 한 요청의 SQL 쿼리 수가 이 값을 넘으면 경고 로그 (N+1 감지, 0 이면 끔)
+    SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "20"))
+
+    # /metrics, /internal/metrics 접근 토큰 (Authorization: Bearer <token>), 비어 있으면 두 엔드포인트 비활성
+    # 쿼리 문장, 워커 pid, 연결 풀 상태가 담기므로 수집기(Prometheus 의 bearer_token 등)에만 알려줄 것
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # 비동기 읽기 경로 (asgi.py): 비어 있으면 DB URL 의 드라이버만 비동기 드라이버로 바꿔 사용
+    ASYNC_DB_URL = os.getenv("ASYNC_DB_URL")
+    ASYNC_POOL_SIZE = int(os.getenv("ASYNC_POOL_SIZE", "10"))
 
 
 """
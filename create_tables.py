@@ -5,6 +5,7 @@
 from db_config import db, init_db
 from flask import Flask
 from sqlalchemy import text
+from task_status import refresh_task_status
 
 app = Flask(__name__)
 init_db(app)
@@ -59,6 +60,11 @@ def create_tables():
                         task_title NVARCHAR(200) NOT NULL,
                         order_no INT NOT NULL,
                         created_at DATETIMEOFFSET NOT NULL DEFAULT SYSDATETIMEOFFSET(),
+                        -- 최신 study_plan_log 값 (rebuild_task_status.py 로 재계산 가능)
+                        status NVARCHAR(10) NULL,
+                        actual_minutes INT NULL,
+                        memo NVARCHAR(500) NULL,
+                        status_updated_at DATETIMEOFFSET NULL,
                         CONSTRAINT FK_task_plan FOREIGN KEY (plan_id) 
                             REFERENCES dbo.study_plan(plan_id)
                     )
@@ -173,6 +179,9 @@ def insert_sample_data():
             """)
             db.session.execute(plan2_query)
             
+            # 로그 기준으로 작업 현재 상태 컬럼 채우기
+            refresh_task_status(plan_id=plan1_id)
+            
             db.session.commit()
             print("✅ 샘플 데이터가 추가되었습니다!")
             
@@ -0,0 +1,119 @@
+"""
+사용자 데이터 스트리밍 내보내기 (CSV / NDJSON)
+
+쿼리 결과를 yield_per 로 나눠 받으며 한 행씩 인코딩해 내보내므로
+계정의 데이터 양과 관계없이 워커 메모리는 한 묶음(EXPORT_FETCH_SIZE 행) 수준으로 유지됩니다.
+"""
+import csv
+import json
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from db_config import db
+
+# 데이터셋별 (컬럼 순서, 쿼리)
+EXPORT_DATASETS = {
+    # 계획 + 작업 + 현재 상태(최신 로그: 상태/실제 학습시간/메모), 작업이 없는 계획도 한 행 포함
+    "tasks": (
+        ["plan_id", "plan_title", "subject", "task_id", "plan_date", "order_no",
+         "task_title", "link_url", "status", "actual_minutes", "memo", "status_updated_at"],
+        """
+        SELECT
+            p.plan_id,
+            p.title as plan_title,
+            p.subject,
+            t.task_id,
+            t.plan_date,
+            t.order_no,
+            t.task_title,
+            t.link_url,
+            CASE WHEN t.task_id IS NULL THEN NULL ELSE ISNULL(t.status, 'planned') END as status,
+            t.actual_minutes,
+            t.memo,
+            t.status_updated_at
+        FROM dbo.study_plan p
+        LEFT JOIN dbo.study_plan_task t ON p.plan_id = t.plan_id
+        WHERE p.user_id = :user_id
+        ORDER BY p.plan_id, t.plan_date, t.order_no, t.task_id
+        """,
+    ),
+    # 상태 변경 이력 전체
+    "logs": (
+        ["log_id", "task_id", "plan_id", "plan_date", "task_title",
+         "status", "actual_minutes", "memo", "updated_at"],
+        """
+        SELECT
+            l.log_id,
+            l.task_id,
+            t.plan_id,
+            t.plan_date,
+            t.task_title,
+            l.status,
+            l.actual_minutes,
+            l.memo,
+            l.updated_at
+        FROM dbo.study_plan_log l
+        JOIN dbo.study_plan_task t ON l.task_id = t.task_id
+        JOIN dbo.study_plan p ON t.plan_id = p.plan_id
+        WHERE p.user_id = :user_id
+        ORDER BY l.task_id, l.updated_at, l.log_id
+        """,
+    ),
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+def _plain(value):
+    """날짜/시간은 ISO 문자열로 변환"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class _LineBuffer:
+    """csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(dataset, user_id, fetch_size=1000):
+    """데이터셋 행을 dict 로 하나씩 생성 (서버 측 커서, fetch_size 행씩 가져옴)"""
+    columns, query = EXPORT_DATASETS[dataset]
+    result = db.session.execute(
+        text(query),
+        {"user_id": user_id},
+        execution_options={"stream_results": True, "yield_per": fetch_size},
+    )
+    try:
+        for row in result:
+            yield {c: _plain(getattr(row, c)) for c in columns}
+    finally:
+        result.close()
+
+
+def iter_csv_lines(dataset, rows):
+    """헤더 + 행 -> CSV 줄 (Excel 에서 한글이 깨지지 않도록 BOM 으로 시작)"""
+    columns, _ = EXPORT_DATASETS[dataset]
+    writer = csv.writer(_LineBuffer())
+    yield "\ufeff" + writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([row[c] for c in columns])
+
+
+def iter_ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_export(dataset, fmt, user_id, fetch_size=1000):
+    """형식(csv / ndjson)에 맞춰 인코딩된 줄 생성"""
+    rows = iter_export_rows(dataset, user_id, fetch_size=fetch_size)
+    if fmt == "csv":
+        return iter_csv_lines(dataset, rows)
+    return iter_ndjson_lines(rows)
@@ -0,0 +1,146 @@
+"""
+데이터 버전과 ETag 조건부 GET
+
+- 사용자 버전: study_plan_user.data_version (계획/작업/상태가 바뀔 때마다 +1)
+- 템플릿 버전: study_template.version (템플릿 항목이 바뀔 때마다 +1)
+- 템플릿 목록 버전: data_version 테이블의 'templates' 행 (템플릿이 추가될 때마다 +1)
+
+쓰기 API 는 요청 시작 시 mark_*_changed() 로 표시만 하고,
+실제 +1 은 세션 before_commit 훅에서 같은 트랜잭션 안에 실행되므로
+데이터 변경과 버전 변경이 항상 함께 커밋됩니다. (한 요청에서 여러 번 커밋하면 커밋마다 +1)
+
+읽기 API 는 conditional_get() 데코레이터로 버전 기반 strong ETag 를 붙이고,
+If-None-Match 가 일치하면 작업 테이블을 조회하기 전에 304 를 반환합니다.
+"""
+import hashlib
+from functools import wraps
+
+from flask import Response, g, has_app_context, make_response, request
+from sqlalchemy import event, text, bindparam
+
+from db_config import db
+
+TEMPLATE_CATALOG = None  # mark_template_changed() 에 넘기면 템플릿 목록 버전을 올림
+
+# 버전 조회 쿼리 (asgi.py 의 비동기 경로와 공용)
+USER_VERSION_SQL = text("SELECT data_version FROM dbo.study_plan_user WHERE user_id = :user_id")
+PLAN_OWNER_VERSION_SQL = text("""
+    SELECT u.data_version
+    FROM dbo.study_plan p
+    JOIN dbo.study_plan_user u ON p.user_id = u.user_id
+    WHERE p.plan_id = :plan_id
+""")
+
+
+def mark_user_changed(user_id):
+    """이번 요청의 커밋마다 user_id 의 데이터 버전을 올리도록 표시"""
+    g.setdefault('_changed_users', set()).add(user_id)
+
+
+def mark_template_changed(template_id=TEMPLATE_CATALOG):
+    """이번 요청의 커밋마다 템플릿(또는 템플릿 목록) 버전을 올리도록 표시"""
+    g.setdefault('_changed_templates', set()).add(template_id)
+
+
+def _bump_pending_versions(session):
+    """before_commit 훅: 표시된 버전들을 같은 트랜잭션에서 +1"""
+    if not has_app_context():
+        return
+    users = g.get('_changed_users')
+    templates = g.get('_changed_templates')
+    if users:
+        session.execute(text("""
+            UPDATE dbo.study_plan_user SET data_version = data_version + 1
+            WHERE user_id IN :user_ids
+        """).bindparams(bindparam("user_ids", expanding=True)), {"user_ids": list(users)})
+        rows = session.execute(text("""
+            SELECT user_id, data_version FROM dbo.study_plan_user WHERE user_id IN :user_ids
+        """).bindparams(bindparam("user_ids", expanding=True)), {"user_ids": list(users)}).fetchall()
+        g.setdefault('_user_versions', {}).update({r.user_id: r.data_version for r in rows})
+    if templates:
+        template_ids = [t for t in templates if t is not TEMPLATE_CATALOG]
+        if template_ids:
+            session.execute(text("""
+                UPDATE dbo.study_template SET version = version + 1
+                WHERE template_id IN :template_ids
+            """).bindparams(bindparam("template_ids", expanding=True)), {"template_ids": template_ids})
+        if TEMPLATE_CATALOG in templates:
+            session.execute(text(
+                "UPDATE dbo.data_version SET version = version + 1 WHERE scope = 'templates'"
+            ))
+
+
+def init_version_tracking(app_db=db):
+    """세션 커밋 직전에 버전을 올리는 훅 등록 (create_app 이 여러 번 호출되어도 한 번만)"""
+    if not event.contains(app_db.session, "before_commit", _bump_pending_versions):
+        event.listen(app_db.session, "before_commit", _bump_pending_versions)
+
+
+def committed_user_version(user_id):
+    """이번 요청에서 커밋된 새 사용자 버전 (커밋이 없었으면 현재 버전 조회)"""
+    version = g.get('_user_versions', {}).get(user_id)
+    return version if version is not None else get_user_version(user_id)
+
+
+def get_user_version(user_id):
+    """현재 사용자 data_version (사용자가 없으면 None)"""
+    return db.session.execute(USER_VERSION_SQL, {"user_id": user_id}).scalar()
+
+
+def get_plan_owner_version(plan_id):
+    """계획 소유자의 data_version (계획이 없으면 None)"""
+    return db.session.execute(PLAN_OWNER_VERSION_SQL, {"plan_id": plan_id}).scalar()
+
+
+def get_template_version(template_id):
+    """템플릿 version (템플릿이 없으면 None)"""
+    query = text("SELECT version FROM dbo.study_template WHERE template_id = :template_id")
+    return db.session.execute(query, {"template_id": template_id}).scalar()
+
+
+def get_template_catalog_version():
+    query = text("SELECT version FROM dbo.data_version WHERE scope = 'templates'")
+    return db.session.execute(query).scalar()
+
+
+def make_etag(*parts):
+    """버전과 요청 URL 로 strong ETag 값 생성"""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def check_not_modified(version):
+    """현재 요청의 (ETag, 304 응답) 반환. If-None-Match 가 일치하지 않으면 응답은 None"""
+    etag = make_etag(request.full_path, version)
+    if request.if_none_match.contains(etag):
+        return etag, Response(status=304)
+    return etag, None
+
+
+def set_version_etag(response, etag):
+    response.set_etag(etag)
+    # 브라우저가 캐시해 두되 매번 If-None-Match 로 재검증하도록 함
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_get(version_of):
+    """ETag 조건부 GET 데코레이터
+
+    version_of(**view_args) 는 응답 내용을 결정하는 버전 값(튜플 등)을 반환하며,
+    None 이면 ETag 없이 그대로 처리합니다. ETag 는 (경로 + 쿼리스트링, 버전) 으로 만듭니다.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            version = version_of(**kwargs)
+            if version is None:
+                return f(*args, **kwargs)
+
+            etag, response = check_not_modified(version)
+            if response is None:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            return set_version_etag(response, etag)
+        return decorated_function
+    return decorator
@@ -0,0 +1,28 @@
+"""
+gunicorn 설정 (gunicorn app:app 실행 시 자동으로 읽음)
+
+preload_app: 마스터에서 앱을 한 번 import 한 뒤 워커를 fork 하므로
+워커 시작이 빠르고 코드/템플릿 메모리를 copy-on-write 로 공유합니다.
+SQLAlchemy 연결 풀은 프로세스 간에 공유하면 안 되므로 post_fork 에서 워커마다 버립니다.
+
+운영 실행이므로 DB_URL 이 없으면 시작하지 않습니다
+(기본값인 빈 SQLite 파일로 떠서 모든 화면이 500 이 되지 않도록).
+SQLite 내장 모드로 운영하려면 DB_URL=sqlite:////data/study_calendar.db 처럼 명시하세요.
+"""
+import os
+
+if not os.getenv("DB_URL"):
+    raise SystemExit("DB_URL 환경변수가 없습니다. 운영 DB 연결 문자열을 지정하세요 (config.py 의 예시 참고).")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+
+def post_fork(server, worker):
+    """fork 직후 워커에서 부모의 연결 풀을 버림 (preload 시 마스터가 연 연결을 물려받지 않도록)"""
+    from app import app
+    from db_config import dispose_engines
+
+    dispose_engines(app)
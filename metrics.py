@@ -0,0 +1,141 @@
+"""
+프로세스 내 지표 도구 (카운터 / 히스토그램)
+
+워커 프로세스마다 따로 집계되며, 값은 /internal/metrics 에서 JSON 으로 확인합니다.
+"""
+import threading
+
+# 지연시간 히스토그램 기본 구간 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """구간별 누적 개수(le 이하)와 합계/개수를 세는 히스토그램"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self.buckets)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def observe(self, value):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+
+    def snapshot(self):
+        """{"buckets": [(le, 누적 개수), ...], "count", "sum", "max"} (마지막 구간 le 는 "+Inf")"""
+        with self._lock:
+            cumulative = []
+            running = 0
+            for bound, n in zip(self.buckets, self._counts):
+                running += n
+                cumulative.append((bound, running))
+            cumulative.append(("+Inf", self.count))
+            return {"buckets": cumulative, "count": self.count, "sum": self.sum, "max": self.max}
+
+    def stats(self):
+        """JSON 용 요약 (ms 단위)"""
+        snap = self.snapshot()
+        return {
+            "count": snap["count"],
+            "avg_ms": round(snap["sum"] * 1000 / snap["count"], 3) if snap["count"] else 0.0,
+            "max_ms": round(snap["max"] * 1000, 3),
+            # [[le(ms), 누적 개수], ...] (JSON 키 정렬에 순서가 섞이지 않도록 목록으로)
+            "buckets_ms": [[round(le * 1000, 3) if le != "+Inf" else le, n] for le, n in snap["buckets"]],
+        }
+
+
+class LabeledHistograms:
+    """라벨 값(예: Flask 엔드포인트)별 히스토그램 묶음"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, label, value):
+        histogram = self._histograms.get(label)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(label, Histogram(self.buckets))
+        histogram.observe(value)
+
+    def items(self):
+        with self._lock:
+            return sorted(self._histograms.items())
+
+
+class LabeledCounter:
+    """라벨 값별 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def incr(self, label, n=1):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + n
+
+    def items(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_histogram(lines, name, help_text, series, label_name):
+    """[(라벨 값, Histogram)] -> Prometheus 텍스트 형식 줄 추가"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for label, histogram in series:
+        snap = histogram.snapshot()
+        for le, count in snap["buckets"]:
+            le = le if le == "+Inf" else _number(float(le))
+            lines.append(f"{name}_bucket{_labels(**{label_name: label, 'le': le})} {count}")
+        lines.append(f"{name}_sum{_labels(**{label_name: label})} {_number(snap['sum'])}")
+        lines.append(f"{name}_count{_labels(**{label_name: label})} {snap['count']}")
+
+
+def prometheus_counter(lines, name, help_text, values, label_name=None):
+    """카운터 -> Prometheus 텍스트 형식 줄 추가 (values: [(라벨 값, 값)] 또는 숫자)"""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    if label_name is None:
+        lines.append(f"{name} {_number(values)}")
+        return
+    for label, value in values:
+        lines.append(f"{name}{_labels(**{label_name: label})} {_number(value)}")
+
+
+def prometheus_gauge(lines, name, help_text, values, label_name=None):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    if label_name is None:
+        lines.append(f"{name} {_number(values)}")
+        return
+    for label, value in values:
+        lines.append(f"{name}{_labels(**{label_name: label})} {_number(value)}")
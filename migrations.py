@@ -0,0 +1,289 @@
+"""
+버전 기반 스키마 마이그레이션
+실행 방법: python migrations.py [--online] [--list]
+
+- 적용된 단계는 schema_migrations 테이블에 기록되어 한 번만 실행됩니다.
+- MSSQL(dbo 스키마)과 SQLite 를 모두 지원합니다.
+- --online: MSSQL 인덱스를 ONLINE = ON 으로 생성 (Enterprise / Azure SQL 에서만 지원)
+  환경변수 MIGRATIONS_ONLINE_INDEX=1 로도 지정할 수 있습니다.
+"""
+import argparse
+import os
+
+from flask import Flask
+from sqlalchemy import text
+
+from db_config import db, init_db
+
+
+class Migrator:
+    """방언(MSSQL / SQLite)별 DDL 도우미"""
+
+    def __init__(self, session, online=False):
+        self.session = session
+        self.dialect = session.get_bind().dialect.name
+        self.online = online and self.dialect == "mssql"
+
+    @property
+    def is_sqlite(self):
+        return self.dialect == "sqlite"
+
+    def t(self, name):
+        """테이블 이름 (MSSQL 은 dbo. 접두어)"""
+        return name if self.is_sqlite else f"dbo.{name}"
+
+    def execute(self, sql, params=None):
+        return self.session.execute(text(sql), params or {})
+
+    def render(self, ddl):
+        """{t} {pk} {now} 자리표시자를 방언에 맞게 치환"""
+        if self.is_sqlite:
+            return ddl.format(t="", pk="INTEGER PRIMARY KEY AUTOINCREMENT", now="CURRENT_TIMESTAMP")
+        return ddl.format(t="dbo.", pk="INT PRIMARY KEY IDENTITY(1,1)", now="SYSDATETIMEOFFSET()")
+
+    def table_exists(self, table):
+        if self.is_sqlite:
+            q = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        else:
+            q = "SELECT 1 FROM sys.tables WHERE name = :name AND schema_id = SCHEMA_ID('dbo')"
+        return self.execute(q, {"name": table}).fetchone() is not None
+
+    def column_exists(self, table, column):
+        if self.is_sqlite:
+            rows = self.execute(f"PRAGMA table_info({table})").fetchall()
+            return any(r[1] == column for r in rows)
+        q = "SELECT COL_LENGTH(:table, :column) AS len"
+        return self.execute(q, {"table": self.t(table), "column": column}).fetchone().len is not None
+
+    def index_exists(self, table, name):
+        if self.is_sqlite:
+            q = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+            return self.execute(q, {"name": name}).fetchone() is not None
+        q = "SELECT 1 FROM sys.indexes WHERE name = :name AND object_id = OBJECT_ID(:table)"
+        return self.execute(q, {"name": name, "table": self.t(table)}).fetchone() is not None
+
+    def create_table(self, table, ddl):
+        if not self.table_exists(table):
+            self.execute(self.render(ddl))
+            print(f"  + {table} 테이블 생성")
+
+    def add_column(self, table, column, col_type):
+        if not self.column_exists(table, column):
+            self.execute(f"ALTER TABLE {self.t(table)} ADD {column} {col_type}")
+            print(f"  + {table}.{column} 컬럼 추가")
+
+    def create_index(self, table, name, columns, include=()):
+        """커버링 인덱스 생성 (SQLite 는 INCLUDE 가 없어 키 뒤에 붙임)"""
+        if self.index_exists(table, name):
+            return
+        if self.is_sqlite:
+            cols = ", ".join(list(columns) + list(include))
+            self.execute(f"CREATE INDEX {name} ON {table} ({cols})")
+        else:
+            sql = f"CREATE INDEX {name} ON {self.t(table)} ({', '.join(columns)})"
+            if include:
+                sql += f" INCLUDE ({', '.join(include)})"
+            if self.online:
+                sql += " WITH (ONLINE = ON)"
+            self.execute(sql)
+        print(f"  + {name} 인덱스 생성")
+
+
+# ======================= 마이그레이션 단계 =======================
+
+def _m001_base_tables(m):
+    """create_tables.py 와 같은 기본 테이블 + 템플릿 테이블"""
+    m.create_table("study_plan_user", """
+        CREATE TABLE {t}study_plan_user (
+            user_id {pk},
+            created_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.create_table("study_plan", """
+        CREATE TABLE {t}study_plan (
+            plan_id {pk},
+            user_id INT NOT NULL REFERENCES {t}study_plan_user(user_id),
+            title NVARCHAR(100) NOT NULL,
+            subject NVARCHAR(50) NULL,
+            created_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.create_table("study_plan_task", """
+        CREATE TABLE {t}study_plan_task (
+            task_id {pk},
+            plan_id INT NOT NULL REFERENCES {t}study_plan(plan_id),
+            plan_date DATE NOT NULL,
+            task_title NVARCHAR(200) NOT NULL,
+            order_no INT NOT NULL,
+            created_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.create_table("study_plan_log", """
+        CREATE TABLE {t}study_plan_log (
+            log_id {pk},
+            task_id INT NOT NULL REFERENCES {t}study_plan_task(task_id),
+            user_id INT NOT NULL REFERENCES {t}study_plan_user(user_id),
+            status NVARCHAR(10) NOT NULL,
+            actual_minutes INT NULL,
+            memo NVARCHAR(500) NULL,
+            updated_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.create_table("study_template", """
+        CREATE TABLE {t}study_template (
+            template_id {pk},
+            template_title NVARCHAR(200) NOT NULL,
+            subject NVARCHAR(50) NULL,
+            description NVARCHAR(500) NULL,
+            created_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.create_table("study_task_template", """
+        CREATE TABLE {t}study_task_template (
+            item_id {pk},
+            template_id INT NULL,
+            plan_id INT NULL,
+            order_no INT NOT NULL,
+            title NVARCHAR(200) NOT NULL,
+            link_url NVARCHAR(1000) NULL,
+            created_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+
+
+def _m002_missing_columns(m):
+    """임시 스크립트로 추가되던 컬럼들 (add_color_column.py 등)"""
+    m.add_column("study_plan_user", "user_name", "NVARCHAR(50) NULL")
+    m.add_column("study_plan", "image_url", "NVARCHAR(1000) NULL")
+    m.add_column("study_plan", "color", "NVARCHAR(20) NULL")
+    m.add_column("study_plan_task", "link_url", "NVARCHAR(1000) NULL")
+
+
+def _m003_task_status_columns(m):
+    """작업 현재 상태 read model (task_status.py) 컬럼 + 로그 기준 재계산"""
+    added = not m.column_exists("study_plan_task", "status")
+    m.add_column("study_plan_task", "status", "NVARCHAR(10) NULL")
+    m.add_column("study_plan_task", "actual_minutes", "INT NULL")
+    m.add_column("study_plan_task", "memo", "NVARCHAR(500) NULL")
+    m.add_column("study_plan_task", "status_updated_at", "DATETIMEOFFSET NULL")
+    if added:
+        # 새로 추가한 경우에만 기존 로그로 채움 (MSSQL / SQLite 모두, 새 DB 면 로그가 없어 바로 끝남)
+        from task_status import refresh_task_status
+        refresh_task_status()
+
+
+def _m004_covering_indexes(m):
+    """조회 경로용 커버링 인덱스"""
+    # 계획 목록: WHERE user_id ORDER BY created_at DESC
+    m.create_index("study_plan", "IX_study_plan_user_created",
+                   ["user_id", "created_at DESC"])
+    # 달력/일일 계획: WHERE plan_id [AND plan_date 범위] ORDER BY plan_date, order_no
+    m.create_index("study_plan_task", "IX_study_plan_task_plan_date_order",
+                   ["plan_id", "plan_date", "order_no"],
+                   include=["task_title", "status"])
+    # /day/<day_id>, /today: WHERE plan_date = :date
+    m.create_index("study_plan_task", "IX_study_plan_task_date",
+                   ["plan_date"], include=["plan_id"])
+    # 최신 로그 조회: WHERE task_id ORDER BY updated_at DESC
+    m.create_index("study_plan_log", "IX_study_plan_log_task_updated",
+                   ["task_id", "updated_at DESC"],
+                   include=["status", "actual_minutes", "memo"])
+    # 템플릿 항목: WHERE template_id ORDER BY order_no
+    m.create_index("study_task_template", "IX_study_task_template_order",
+                   ["template_id", "order_no"])
+
+
+def _m005_user_data_version(m):
+    """사용자별 데이터 버전 (data_version.py, 쓰기마다 +1)"""
+    m.add_column("study_plan_user", "data_version", "BIGINT NOT NULL DEFAULT 0")
+
+
+def _m006_template_versions(m):
+    """템플릿별 version + 템플릿 목록 버전 (data_version.py, ETag 용)"""
+    m.add_column("study_template", "version", "INT NOT NULL DEFAULT 0")
+    m.create_table("data_version", """
+        CREATE TABLE {t}data_version (
+            scope NVARCHAR(50) NOT NULL PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    exists = m.execute(f"SELECT 1 FROM {m.t('data_version')} WHERE scope = 'templates'").fetchone()
+    if not exists:
+        m.execute(f"INSERT INTO {m.t('data_version')} (scope, version) VALUES ('templates', 0)")
+
+
+MIGRATIONS = [
+    (1, "기본 테이블", _m001_base_tables),
+    (2, "누락 컬럼 추가 (user_name, image_url, color, link_url)", _m002_missing_columns),
+    (3, "작업 현재 상태 컬럼", _m003_task_status_columns),
+    (4, "커버링 인덱스", _m004_covering_indexes),
+    (5, "사용자 데이터 버전", _m005_user_data_version),
+    (6, "템플릿 버전", _m006_template_versions),
+]
+
+
+def _ensure_migrations_table(m):
+    m.create_table("schema_migrations", """
+        CREATE TABLE {t}schema_migrations (
+            version INT NOT NULL PRIMARY KEY,
+            description NVARCHAR(200) NOT NULL,
+            applied_at DATETIMEOFFSET NOT NULL DEFAULT {now}
+        )
+    """)
+    m.session.commit()
+
+
+def applied_versions(m):
+    rows = m.execute(f"SELECT version FROM {m.t('schema_migrations')}").fetchall()
+    return {r.version for r in rows}
+
+
+def run_migrations(online=False):
+    """적용되지 않은 단계를 순서대로 실행 (단계마다 커밋), 실행한 버전 목록 반환"""
+    m = Migrator(db.session, online=online)
+    _ensure_migrations_table(m)
+    done = applied_versions(m)
+    ran = []
+    for version, description, step in MIGRATIONS:
+        if version in done:
+            continue
+        print(f"▶ {version:03d} {description}")
+        try:
+            step(m)
+            m.execute(
+                f"INSERT INTO {m.t('schema_migrations')} (version, description) VALUES (:version, :description)",
+                {"version": version, "description": description},
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        ran.append(version)
+    return ran
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 실행")
+    parser.add_argument("--online", action="store_true",
+                        default=os.getenv("MIGRATIONS_ONLINE_INDEX") == "1",
+                        help="MSSQL 인덱스를 ONLINE = ON 으로 생성")
+    parser.add_argument("--list", action="store_true", help="적용 상태만 출력")
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    init_db(app)
+
+    with app.app_context():
+        if args.list:
+            m = Migrator(db.session)
+            _ensure_migrations_table(m)
+            done = applied_versions(m)
+            for version, description, _ in MIGRATIONS:
+                mark = "✓" if version in done else " "
+                print(f"[{mark}] {version:03d} {description}")
+        else:
+            ran = run_migrations(online=args.online)
+            if ran:
+                print(f"\n✅ {len(ran)}개 마이그레이션 적용 완료")
+            else:
+                print("✅ 적용할 마이그레이션이 없습니다.")
@@ -0,0 +1,79 @@
+"""
+메인 화면 달력의 월 단위 렌더링 캐시
+
+index.html 의 12개월 달력은 templates/calendar_month.html 조각으로 한 달씩 렌더링해
+(user_id, year, month, 월 버전) 키로 저장하고, 페이지는 캐시된 조각을 이어 붙여 만듭니다.
+
+월 버전은 그 달 칸(DayCell) 목록 자체입니다. 상태 하나를 바꾸면 그 날짜가 속한 달의 칸만 달라지므로
+다시 렌더링되는 것은 그 한 달뿐이고, 나머지 달은 그대로 캐시를 씁니다.
+(사용자 data_version 은 변경마다 12개월 모두를 무효화하므로 키로 쓰지 않음)
+오래된 조각은 명시적으로 지우지 않고 LRU / TTL 로 밀려납니다.
+"""
+import threading
+import time
+
+from markupsafe import Markup
+
+from calendar_cache import CalendarCache
+
+
+class RenderTimer:
+    """렌더링 횟수 / 누적 시간 / 최대 시간 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def time(self, render, *args, **kwargs):
+        """render(*args, **kwargs) 를 실행하며 걸린 시간 기록"""
+        started = time.perf_counter()
+        try:
+            return render(*args, **kwargs)
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_ms": round(self.total_seconds * 1000, 3),
+                "avg_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3),
+            }
+
+
+class MonthFragmentCache:
+    """월별 달력 HTML 조각 캐시 + 렌더링 시간 지표"""
+
+    def __init__(self, maxsize=2048, ttl=3600):
+        self.fragments = CalendarCache(maxsize=maxsize, ttl=ttl)
+        self.fragment_render = RenderTimer()  # 조각 렌더링 (캐시 미스)
+        self.page_render = RenderTimer()      # index.html 전체 렌더링
+
+    def render_months(self, user_id, year, calendar_data, render_month):
+        """{월: 렌더링된 HTML} 반환. 캐시에 없는 달만 render_month(m, cells) 로 렌더링"""
+        month_html = {}
+        for m in range(1, 13):
+            cells = tuple(calendar_data.get(m, ()))
+            key = (user_id, year, m, cells)
+            html = self.fragments.get(key)
+            if html is None:
+                html = Markup(self.fragment_render.time(render_month, m, cells))
+                self.fragments.set(key, html)
+            month_html[m] = html
+        return month_html
+
+    def stats(self):
+        return {
+            "fragments": self.fragments.stats(),
+            "fragment_render": self.fragment_render.stats(),
+            "page_render": self.page_render.stats(),
+        }
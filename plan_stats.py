@@ -0,0 +1,106 @@
+"""
+학습 통계 서비스
+
+계획별 작업 수/완료 수는 study_plan_task 의 현재 상태 컬럼(task_status.py)을
+GROUP BY 로 집계해 한 번의 쿼리로 구합니다. 작업 목록을 메모리에 올려 순회하지 않으며,
+(plan_id, plan_date, order_no) INCLUDE (status) 인덱스(migrations.py)로 테이블 접근 없이 계산됩니다.
+"""
+import calendar
+from datetime import date
+
+from flask import g
+from sqlalchemy import text
+
+from db_config import db
+
+PROGRESS_SQL = """
+    SELECT
+        p.plan_id,
+        COUNT(t.task_id) as task_count,
+        ISNULL(SUM(CASE WHEN t.status = 'done' THEN 1 ELSE 0 END), 0) as done_count
+    FROM dbo.study_plan p
+    LEFT JOIN dbo.study_plan_task t ON p.plan_id = t.plan_id
+    WHERE p.user_id = :user_id
+    GROUP BY p.plan_id
+"""
+
+PLANNED_DAYS_SQL = """
+    SELECT COUNT(DISTINCT t.plan_date) as planned_days
+    FROM dbo.study_plan_task t
+    JOIN dbo.study_plan p ON t.plan_id = p.plan_id
+    WHERE p.user_id = :user_id
+      AND t.plan_date >= :date_from AND t.plan_date <= :date_to
+      AND (:plan_id IS NULL OR p.plan_id = :plan_id)
+"""
+
+
+def get_plan_progress(user_id):
+    """계획별 (작업 수, 완료 수) -> {plan_id: {"task_count", "done_count"}}
+
+    같은 요청 안에서는 flask.g 에 저장된 결과를 재사용합니다.
+    """
+    progress_cache = g.setdefault('_plan_progress_by_user', {})
+    if user_id not in progress_cache:
+        rows = db.session.execute(text(PROGRESS_SQL), {"user_id": user_id}).fetchall()
+        progress_cache[user_id] = progress_by_plan(rows)
+    return progress_cache[user_id]
+
+
+def progress_by_plan(rows):
+    """PROGRESS_SQL 결과 -> {plan_id: {"task_count", "done_count"}}"""
+    return {
+        row.plan_id: {"task_count": row.task_count, "done_count": row.done_count}
+        for row in rows
+    }
+
+
+def summarize_progress(counters):
+    """계획별 카운터 목록 -> 통계 카드 값 (전체 계획/할당/완료/완료율)"""
+    counters = list(counters)
+    total_assigned = sum(c["task_count"] for c in counters)
+    completed = sum(c["done_count"] for c in counters)
+    return {
+        "total_plans": len(counters),
+        "total_assigned": total_assigned,
+        "completed": completed,
+        "completion_rate": int(completed / total_assigned * 100) if total_assigned > 0 else 0,
+    }
+
+
+def get_user_stats(user_id, plan_id=None):
+    """사용자 전체(또는 한 계획) 통계"""
+    progress = get_plan_progress(user_id)
+    if plan_id is not None:
+        counters = [progress[plan_id]] if plan_id in progress else []
+    else:
+        counters = progress.values()
+    return summarize_progress(counters)
+
+
+def get_year_summary(user_id, year, today, plan_id=None):
+    """선택 연도의 전체/지난/남은 일수와 학습이 계획된 날짜 수
+
+    - passed: 오늘까지 지난 일수 (오늘 포함, 지난 해는 전체, 다음 해는 0)
+    - planned: 해당 연도에 작업이 하나 이상 있는 날짜 수
+    """
+    total = 366 if calendar.isleap(year) else 365
+    if year < today.year:
+        passed = total
+    elif year > today.year:
+        passed = 0
+    else:
+        passed = today.timetuple().tm_yday
+
+    row = db.session.execute(text(PLANNED_DAYS_SQL), {
+        "user_id": user_id,
+        "date_from": date(year, 1, 1),
+        "date_to": date(year, 12, 31),
+        "plan_id": plan_id,
+    }).fetchone()
+
+    return {
+        "total": total,
+        "passed": passed,
+        "remain": total - passed,
+        "planned": row.planned_days or 0,
+    }
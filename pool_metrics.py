@@ -0,0 +1,162 @@
+"""
+DB 연결 풀 지표 (워커 프로세스별)
+
+지연이 MSSQL 때문인지 풀 고갈(연결 대기) 때문인지 구분할 수 있도록 엔진마다 다음을 집계합니다.
+- checkouts / checkins / connects: 풀에서 빌린 횟수 / 반납 횟수 / 새 DBAPI 연결 수
+- overflow_checkouts: pool_size 를 넘어 overflow 연결을 쓰던 시점의 checkout 수, peak_checked_out: 최대 동시 사용 수
+- checkout_wait: 풀에서 연결을 얻기까지 걸린 시간 (대기 + 새 연결 생성) 히스토그램
+- timeouts: pool_timeout 안에 연결을 얻지 못한 횟수
+- pre_ping: pre-ping 쿼리 시간 히스토그램, invalidations: 끊긴 연결 폐기 수
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from metrics import Histogram
+
+# 엔진 이름(bind key, 기본 엔진은 "default") -> PoolMetrics
+POOL_METRICS = {}
+
+
+class PoolMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkout_wait = Histogram()
+        self.pre_ping = Histogram()
+        self.reset()
+
+    def reset(self):
+        """카운터 초기화 (fork 직후 부모 프로세스의 값을 버릴 때)"""
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.connects = 0
+            self.overflow_checkouts = 0
+            self.peak_checked_out = 0
+            self.timeouts = 0
+            self.invalidations = 0
+        self.checkout_wait.reset()
+        self.pre_ping.reset()
+
+    def incr(self, counter, n=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def on_checkout(self, pool):
+        checked_out = pool.checkedout()
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            if checked_out > pool.size():
+                self.overflow_checkouts += 1
+
+    def stats(self):
+        pool = self.pool
+        with self._lock:
+            result = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_checked_out": self.peak_checked_out,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            result["pool"] = {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        result["checkout_wait"] = self.checkout_wait.stats()
+        result["pre_ping"] = self.pre_ping.stats()
+        return result
+
+
+class InstrumentedQueuePool(QueuePool):
+    """연결을 얻기까지의 대기 시간과 타임아웃을 기록하는 QueuePool"""
+
+    metrics = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.incr("timeouts")
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() 로 풀을 새로 만들어도 같은 지표에 계속 집계
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine, name="default"):
+    """엔진의 풀 이벤트와 pre-ping 에 지표 수집을 연결하고 PoolMetrics 반환"""
+    metrics = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.pool = engine.pool
+        metrics.on_checkout(engine.pool)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    # pre-ping 은 풀이 dialect.do_ping() 을 호출하므로 이 엔진의 dialect 에서만 감쌈
+    do_ping = engine.dialect.do_ping
+
+    def timed_ping(dbapi_connection):
+        started = time.perf_counter()
+        try:
+            return do_ping(dbapi_connection)
+        finally:
+            metrics.pre_ping.observe(time.perf_counter() - started)
+
+    engine.dialect.do_ping = timed_ping
+    POOL_METRICS[name] = metrics
+    return metrics
+
+
+def instrument_engines(engines):
+    """Flask-SQLAlchemy db.engines ({bind key: engine}) 전체에 지표 연결"""
+    for bind_key, engine in engines.items():
+        instrument_engine(engine, bind_key or "default")
+
+
+def reset_pool_metrics():
+    for metrics in POOL_METRICS.values():
+        metrics.reset()
+
+
+def pool_stats():
+    """워커 프로세스(pid)별 엔진 풀 지표"""
+    return {
+        "pid": os.getpid(),
+        "engines": {name: m.stats() for name, m in POOL_METRICS.items()},
+    }
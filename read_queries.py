@@ -0,0 +1,200 @@
+"""
+자주 호출되는 읽기 API 의 쿼리와 결과 가공 (/today, /day/<day_id>, GET /plan/<plan_id>/daily)
+
+동기(Flask + db.session) 뷰와 비동기(asgi.py + AsyncEngine) 뷰가 같은 SQL 과
+같은 응답 형태를 쓰도록 한 곳에 모았습니다. 여기의 함수는 DB 에 접근하지 않으며,
+쿼리 실행은 각 경로에서 합니다.
+- 기본값 처리는 T-SQL 과 SQLite 모두에서 동작하는 COALESCE 를 사용
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+# 특정 날짜의 작업 (상태/실제 학습시간/메모는 study_plan_task 의 현재 상태 컬럼에서 읽음)
+TASKS_FOR_DATE_SQL = text("""
+    SELECT
+        p.plan_id,
+        p.title as plan_title,
+        p.subject,
+        p.image_url,
+        p.color,
+        t.task_id,
+        t.task_title,
+        t.link_url,
+        t.order_no,
+        COALESCE(t.status, 'planned') as status,
+        COALESCE(t.actual_minutes, 0) as minutes,
+        COALESCE(t.memo, '') as memo
+    FROM dbo.study_plan_task t
+    JOIN dbo.study_plan p ON t.plan_id = p.plan_id
+    WHERE t.plan_date = :date
+      AND p.user_id = :user_id
+      AND (:plan_id IS NULL OR p.plan_id = :plan_id)
+    ORDER BY t.order_no, p.plan_id
+""")
+
+
+def tasks_for_date_params(user_id, date_str, plan_id=None):
+    return {"date": date_str, "user_id": user_id, "plan_id": plan_id}
+
+
+def parse_day_id(day_id, year):
+    """day_id ("MMDD") + 연도 -> "YYYY-MM-DD" (형식이 잘못되면 ValueError / IndexError)"""
+    month = int(day_id[:2])
+    day = int(day_id[2:])
+    return date(year, month, day).strftime("%Y-%m-%d")
+
+
+def day_tasks_payload(date_str, rows):
+    """/day/<day_id> 응답"""
+    return {
+        "ok": True,
+        "date": date_str,
+        "tasks": [{
+            "task_id": row.task_id,
+            "plan_title": row.plan_title,
+            "subject": row.subject,
+            "task_title": row.task_title,
+            "link_url": row.link_url,
+            "status": row.status
+        } for row in rows]
+    }
+
+
+def today_context(rows, color_of):
+    """/today 템플릿 변수 (계획별 그룹 + 통계). color_of(plan_id, saved_color) -> 표시 색상"""
+    plans_dict = {}
+    for row in rows:
+        plan_id = row.plan_id
+        if plan_id not in plans_dict:
+            plans_dict[plan_id] = {
+                "plan_id": plan_id,
+                "plan_title": row.plan_title,
+                "subject": row.subject,
+                "image_url": row.image_url,
+                "color": color_of(plan_id, row.color),
+                "tasks": []
+            }
+
+        plans_dict[plan_id]["tasks"].append({
+            "task_id": row.task_id,
+            "task_title": row.task_title,
+            "link_url": row.link_url,
+            "order_no": row.order_no,
+            "status": row.status,
+            "minutes": row.minutes,
+            "memo": row.memo
+        })
+
+    total_tasks = len(rows)
+    completed_tasks = sum(1 for r in rows if r.status == 'done')
+    return {
+        "plans": list(plans_dict.values()),
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "completion_rate": int((completed_tasks / total_tasks * 100)) if total_tasks > 0 else 0,
+    }
+
+
+def encode_daily_cursor(plan_date, order_no, task_id):
+    """마지막 행의 (plan_date, order_no, task_id) -> 다음 페이지 커서 토큰"""
+    if isinstance(plan_date, str):  # SQLite 드라이버는 DATE 를 문자열로 돌려줄 수 있음
+        plan_date = datetime.strptime(plan_date[:10], "%Y-%m-%d").date()
+    raw = json.dumps([plan_date.strftime("%Y-%m-%d"), order_no, task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_daily_cursor(token):
+    """커서 토큰 -> (plan_date, order_no, task_id), 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        plan_date, order_no, task_id = json.loads(raw)
+        return datetime.strptime(plan_date, "%Y-%m-%d").date(), int(order_no), int(task_id)
+    except Exception:
+        raise ValueError("잘못된 cursor 입니다.")
+
+
+def _parse_date_arg(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"{name} 는 YYYY-MM-DD 형식이어야 합니다.")
+
+
+def daily_page_query(plan_id, args, default_limit, max_limit, is_sqlite=False):
+    """요청 인자(limit, cursor, date_from, date_to) -> (쿼리, 파라미터, limit)
+
+    다음 페이지 존재 여부 확인을 위해 limit + 1 행을 조회합니다.
+    인자 형식이 잘못되면 ValueError.
+    """
+    limit = args.get('limit', default_limit, type=int)
+    limit = max(1, min(limit, max_limit))
+    params = {"plan_id": plan_id, "limit": limit + 1}
+    filters = ""
+
+    date_from = _parse_date_arg(args, 'date_from')
+    date_to = _parse_date_arg(args, 'date_to')
+    if date_from is not None:
+        filters += " AND t.plan_date >= :date_from"
+        params["date_from"] = date_from
+    if date_to is not None:
+        filters += " AND t.plan_date <= :date_to"
+        params["date_to"] = date_to
+
+    cursor = args.get('cursor')
+    if cursor:
+        params["c_date"], params["c_order"], params["c_id"] = decode_daily_cursor(cursor)
+        filters += """
+          AND (t.plan_date > :c_date
+               OR (t.plan_date = :c_date AND (t.order_no > :c_order
+                   OR (t.order_no = :c_order AND t.task_id > :c_id))))"""
+
+    query = text(f"""
+        SELECT {"" if is_sqlite else "TOP (:limit)"}
+            t.task_id,
+            t.plan_date,
+            t.task_title,
+            t.link_url,
+            t.order_no,
+            COALESCE(t.status, 'planned') as status
+        FROM dbo.study_plan_task t
+        WHERE t.plan_id = :plan_id{filters}
+        ORDER BY t.plan_date, t.order_no, t.task_id
+        {"LIMIT :limit" if is_sqlite else ""}
+    """)
+    return query, params, limit
+
+
+def _date_str(value):
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else str(value)[:10]
+
+
+def daily_page_payload(rows, limit):
+    """limit + 1 행 조회 결과 -> GET /plan/<plan_id>/daily 응답"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    daily_plans = [{
+        "task_id": row.task_id,
+        "date": _date_str(row.plan_date),
+        "description": row.task_title,
+        "link_url": row.link_url,
+        "order": row.order_no,
+        "status": row.status
+    } for row in rows]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_daily_cursor(last.plan_date, last.order_no, last.task_id)
+
+    return {
+        "ok": True,
+        "daily_plans": daily_plans,
+        "next_cursor": next_cursor
+    }
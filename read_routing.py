@@ -0,0 +1,96 @@
+"""
+읽기 전용 복제본(replica) 라우팅
+
+- DB_READ_URLS 의 URL 마다 Flask-SQLAlchemy bind("replica_1", "replica_2", ...) 를 만들고 (db_config.init_db)
+  @reads_from_replica 뷰의 쿼리는 요청마다 무작위로 고른 복제본 엔진으로 보냅니다.
+- 그 밖의 요청(쓰기 API 포함)은 모두 기본 엔진(primary)을 씁니다.
+- read-your-writes: 요청 중 커밋이 있었으면 세션 쿠키에 DB_READ_STICKY_SECONDS 뒤의 시각을 기록하고,
+  그때까지 그 사용자의 읽기는 primary 로 보냅니다 (체크박스 저장 직후 복제 지연으로 옛 상태가 보이지 않도록).
+  쿠키는 응답 헤더와 함께 나가므로, 본문 제너레이터에서 커밋하는 스트리밍 쓰기(가져오기 ?progress=1)는
+  시작할 때 기한 없이 primary 로 고정하고, 그 사용자의 다음 요청에서 그때부터 DB_READ_STICKY_SECONDS 로 바꿉니다
+  (스트리밍이 얼마나 걸리든 끝난 뒤의 읽기가 복제 지연에 걸리지 않도록).
+  쿠키에 저장하므로 워커 프로세스가 여러 개여도 같은 사용자에게 적용됩니다.
+DB_READ_URLS 가 비어 있으면 모든 요청이 primary 를 씁니다.
+"""
+import random
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND_PREFIX = "replica_"
+PRIMARY_UNTIL_KEY = "_read_primary_until"
+PRIMARY_PENDING_KEY = "_read_primary_pending"  # 스트리밍 쓰기 중: 다음 요청까지 primary
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def replica_binds(urls):
+    """DB_READ_URLS -> {bind key: URL}"""
+    return {f"{REPLICA_BIND_PREFIX}{i}": url for i, url in enumerate(urls, start=1)}
+
+
+def replica_keys(engines):
+    return [key for key in engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+
+
+class RoutingSession(Session):
+    """요청이 복제본으로 정해졌으면 (g._read_bind) 그 엔진, 아니면 Flask-SQLAlchemy 기본 선택"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            key = g.get("_read_bind")
+            if key is not None:
+                return self._db.engines[key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_bind_key():
+    """현재 요청의 읽기에 쓸 복제본 bind key (복제본이 없거나 최근에 쓴 사용자면 None = primary)"""
+    keys = current_app.extensions.get("read_replicas")
+    if not keys or session.get(PRIMARY_PENDING_KEY) or session.get(PRIMARY_UNTIL_KEY, 0) > time.time():
+        return None
+    return random.choice(keys)
+
+
+# 읽기 전용 뷰 데코레이터: 복제본에서 조회 (ETag 버전 조회도 같은 엔진을 쓰도록 conditional_get 보다 바깥에 둠)
+def reads_from_replica(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g._read_bind = read_bind_key()
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _mark_write(session_):
+    if has_request_context():
+        g._committed = True
+
+
+def init_read_routing(app, db):
+    """복제본 목록 등록 + 커밋한 사용자를 잠시 primary 에 고정하는 훅 (create_app 에서 호출)"""
+    with app.app_context():
+        app.extensions["read_replicas"] = replica_keys(db.engines)
+    if not event.contains(db.session, "after_commit", _mark_write):
+        event.listen(db.session, "after_commit", _mark_write)
+
+    def _stick(seconds):
+        session[PRIMARY_UNTIL_KEY] = time.time() + seconds
+
+    @app.before_request
+    def _finish_streaming_write():
+        # 직전 스트리밍 쓰기의 고정을 지금부터 DB_READ_STICKY_SECONDS 로 (이 요청의 읽기는 primary)
+        if session.get(PRIMARY_PENDING_KEY):
+            session.pop(PRIMARY_PENDING_KEY)
+            _stick(app.config["DB_READ_STICKY_SECONDS"])
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if not app.extensions["read_replicas"]:
+            return response
+        if response.is_streamed and request.method not in SAFE_METHODS:
+            session[PRIMARY_PENDING_KEY] = True
+        elif g.get("_committed"):
+            _stick(app.config["DB_READ_STICKY_SECONDS"])
+        return response
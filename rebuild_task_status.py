@@ -0,0 +1,26 @@
+"""
+study_plan_task 현재 상태 컬럼 재계산 스크립트
+실행 방법: python rebuild_task_status.py
+
+기존 DB에 상태 컬럼을 추가하고 study_plan_log 의 최신 행으로 다시 채웁니다.
+여러 번 실행해도 안전합니다.
+"""
+from db_config import db, init_db
+from flask import Flask
+from task_status import ensure_status_columns, refresh_task_status
+
+app = Flask(__name__)
+init_db(app)
+
+with app.app_context():
+    try:
+        ensure_status_columns()
+        print('✓ study_plan_task 상태 컬럼 확인/추가 완료')
+
+        updated = refresh_task_status()
+        db.session.commit()
+        print(f'✅ {updated}개 작업의 현재 상태를 study_plan_log 기준으로 재계산했습니다!')
+    except Exception as e:
+        db.session.rollback()
+        print(f'❌ 오류 발생: {e}')
+        raise
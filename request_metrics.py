@@ -0,0 +1,170 @@
+"""
+요청별 SQL 계측과 Prometheus 형식 /metrics
+
+- SQLAlchemy before/after_cursor_execute 훅으로 요청마다 쿼리 수, DB 시간 합계, 가장 느린 쿼리를
+  flask.g 에 모으고, 응답을 닫을 때(스트리밍 본문까지 보낸 뒤) Flask 엔드포인트 라벨로 집계합니다.
+- 한 요청의 쿼리 수가 SQL_QUERY_BUDGET 을 넘으면 (N+1 의심) 경고 로그를 남기고 카운터를 올립니다.
+- Jinja 렌더링 시간은 before_render_template / template_rendered 시그널로 템플릿별 집계합니다.
+값은 워커 프로세스별이며, 엔드포인트별 가장 느린 쿼리 문장은 /internal/metrics 의 "sql" 에서 확인합니다.
+"""
+import threading
+import time
+from functools import partial
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+from metrics import (
+    LATENCY_BUCKETS, LabeledCounter, LabeledHistograms, prometheus_counter, prometheus_gauge,
+    prometheus_histogram,
+)
+from pool_metrics import POOL_METRICS
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+SLOW_STATEMENT_MAX_LENGTH = 500
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.request_latency = LabeledHistograms(LATENCY_BUCKETS)
+        self.db_time = LabeledHistograms(LATENCY_BUCKETS)
+        self.query_count = LabeledHistograms(QUERY_COUNT_BUCKETS)
+        self.render_time = LabeledHistograms(LATENCY_BUCKETS)
+        self.budget_exceeded = LabeledCounter()
+        self._lock = threading.Lock()
+        self._slowest = {}  # endpoint -> (초, 쿼리 문장)
+
+    def record_request(self, endpoint, seconds, sql):
+        self.request_latency.observe(endpoint, seconds)
+        self.db_time.observe(endpoint, sql["time"])
+        self.query_count.observe(endpoint, sql["count"])
+        slowest = sql["slowest"]
+        if slowest is not None:
+            with self._lock:
+                if slowest[0] > self._slowest.get(endpoint, (0.0, None))[0]:
+                    self._slowest[endpoint] = slowest
+
+    def sql_stats(self):
+        """엔드포인트별 요청 수 / 쿼리 수 / DB 시간 / 가장 느린 쿼리 (JSON 용)"""
+        counts = dict(self.query_count.items())
+        with self._lock:
+            slowest = dict(self._slowest)
+        result = {}
+        for endpoint, db_time in self.db_time.items():
+            queries = counts[endpoint]
+            entry = {
+                "requests": db_time.count,
+                "queries": int(queries.sum),
+                "max_queries": int(queries.max),
+                "db_time_ms": round(db_time.sum * 1000, 3),
+                "max_db_time_ms": round(db_time.max * 1000, 3),
+            }
+            if endpoint in slowest:
+                seconds, statement = slowest[endpoint]
+                entry["slowest"] = {"ms": round(seconds * 1000, 3), "statement": statement}
+            result[endpoint] = entry
+        return result
+
+    def prometheus(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        prometheus_histogram(lines, "http_request_duration_seconds", "Request latency by Flask endpoint.",
+                             self.request_latency.items(), "endpoint")
+        prometheus_histogram(lines, "db_request_time_seconds", "Total SQL time per request.",
+                             self.db_time.items(), "endpoint")
+        prometheus_histogram(lines, "db_queries_per_request", "SQL statements executed per request.",
+                             self.query_count.items(), "endpoint")
+        prometheus_counter(lines, "db_query_budget_exceeded_total",
+                           "Requests that executed more statements than SQL_QUERY_BUDGET.",
+                           self.budget_exceeded.items(), "endpoint")
+        prometheus_histogram(lines, "template_render_seconds", "Jinja template render time.",
+                             self.render_time.items(), "template")
+
+        pools = sorted(POOL_METRICS.items())
+        prometheus_histogram(lines, "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection.",
+                             [(name, m.checkout_wait) for name, m in pools], "engine")
+        prometheus_histogram(lines, "db_pool_pre_ping_seconds", "Pool pre-ping time.",
+                             [(name, m.pre_ping) for name, m in pools], "engine")
+        for counter in ("checkouts", "connects", "overflow_checkouts", "timeouts", "invalidations"):
+            prometheus_counter(lines, f"db_pool_{counter}_total", f"Pool {counter.replace('_', ' ')}.",
+                               [(name, getattr(m, counter)) for name, m in pools], "engine")
+        prometheus_gauge(lines, "db_pool_checked_out", "Connections currently checked out.",
+                         [(name, m.pool.checkedout()) for name, m in pools if hasattr(m.pool, "checkedout")],
+                         "engine")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    started = conn.info.get("_query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    sql = g.setdefault("_sql_stats", {"count": 0, "time": 0.0, "slowest": None})
+    sql["count"] += 1
+    sql["time"] += elapsed
+    if sql["slowest"] is None or elapsed > sql["slowest"][0]:
+        sql["slowest"] = (elapsed, " ".join(statement.split())[:SLOW_STATEMENT_MAX_LENGTH])
+
+
+def instrument_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _endpoint_label():
+    return request.endpoint or "unmatched"
+
+
+def init_request_metrics(app, engines):
+    """앱 요청 훅 / 템플릿 시그널 / 엔진 쿼리 훅 등록"""
+    for engine in engines.values():
+        instrument_engine(engine)
+
+    @app.before_request
+    def _start_request_timer():
+        g._request_started = time.perf_counter()
+
+    def _record(endpoint, method, path, started, sql):
+        request_metrics.record_request(endpoint, time.perf_counter() - started, sql)
+
+        budget = app.config["SQL_QUERY_BUDGET"]
+        if budget and sql["count"] > budget:
+            request_metrics.budget_exceeded.incr(endpoint)
+            app.logger.warning(
+                "SQL 쿼리 예산 초과 (N+1 의심): %s %s -> %d개 쿼리 (예산 %d), DB %.1fms, 가장 느린 쿼리: %s",
+                method, path, sql["count"], budget, sql["time"] * 1000,
+                sql["slowest"][1] if sql["slowest"] else "-",
+            )
+
+    @app.after_request
+    def _record_request(response):
+        started = g.get("_request_started")
+        if started is None:
+            return response
+        # 스트리밍 응답(/export, 가져오기 ?progress=1)은 본문 제너레이터 안에서 쿼리를 실행하므로
+        # 응답을 닫을 때(본문 전송 후) 기록. stream_with_context 는 같은 g 를 쓰므로 sql 에 계속 누적됨
+        sql = g.setdefault("_sql_stats", {"count": 0, "time": 0.0, "slowest": None})
+        response.call_on_close(partial(_record, _endpoint_label(), request.method, request.path, started, sql))
+        return response
+
+    def _start_render(sender, template, context, **extra):
+        g.setdefault("_render_started", []).append(time.perf_counter())
+
+    def _finish_render(sender, template, context, **extra):
+        started = g.get("_render_started")
+        if started:
+            request_metrics.render_time.observe(template.name or "(string)", time.perf_counter() - started.pop())
+
+    before_render_template.connect(_start_render, app, weak=False)
+    template_rendered.connect(_finish_render, app, weak=False)
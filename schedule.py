@@ -0,0 +1,55 @@
+"""
+요일 기반 학습 일정 계산
+
+날짜 범위를 하루씩 돌며 weekday() 를 검사하는 대신,
+선택된 요일마다 첫 날짜를 구한 뒤 7일 간격 서수(ordinal) 범위를 병합해
+결과 날짜 수에 비례하는 비용으로 일정을 만듭니다.
+"""
+from datetime import date
+from heapq import merge
+from itertools import islice
+
+WEEKDAY_MAP = {
+    "mon": 0,
+    "tue": 1,
+    "wed": 2,
+    "thu": 3,
+    "fri": 4,
+    "sat": 5,
+    "sun": 6,
+}
+
+
+def parse_weekdays(selected_weekdays):
+    """['mon', 'wed', ...] -> {0, 2, ...} (알 수 없는 값은 무시)"""
+    return {WEEKDAY_MAP[w] for w in selected_weekdays or [] if w in WEEKDAY_MAP}
+
+
+def iter_weekday_ordinals(start_date, end_date, weekdays):
+    """start_date~end_date 사이 선택 요일의 서수를 오름차순으로 생성"""
+    start_ord = start_date.toordinal()
+    end_ord = end_date.toordinal()
+    if start_ord > end_ord or not weekdays:
+        return iter(())
+    start_weekday = start_date.weekday()
+    ranges = [
+        range(start_ord + (wd - start_weekday) % 7, end_ord + 1, 7)
+        for wd in sorted(set(weekdays))
+    ]
+    return merge(*ranges)
+
+
+def weekday_dates(start_date, end_date, weekdays, skip_dates=None, limit=None):
+    """선택 요일에 해당하는 날짜 목록 (bulk INSERT 행 생성용)
+
+    - weekdays: 0(월)~6(일) 정수 집합 (parse_weekdays 결과)
+    - skip_dates: 제외할 날짜(휴일 등) 집합
+    - limit: 앞에서부터 최대 개수 (템플릿 항목 수만큼만 필요할 때)
+    """
+    ordinals = iter_weekday_ordinals(start_date, end_date, weekdays)
+    if skip_dates:
+        skip = {d.toordinal() for d in skip_dates}
+        ordinals = (o for o in ordinals if o not in skip)
+    if limit is not None:
+        ordinals = islice(ordinals, limit)
+    return [date.fromordinal(o) for o in ordinals]
@@ -1,18 +1,185 @@
-# seed.py
-from datetime import date
-from app import create_app, db, User, StudyPlan
-
-app = create_app()
-with app.app_context():
-    db.drop_all()
-    db.create_all()
-
-    u = User(name="Demo", email="demo@user.com")
-    db.session.add(u); db.session.commit()
-
-    p1 = StudyPlan(user_id=u.user_id, title="TOEFL 단어 외우기", subject="TOEFL",
-                   start_date=date(2025,1,1), end_date=date(2025,12,31))
-    p2 = StudyPlan(user_id=u.user_id, title="Wordly wise 3000 #4", subject="영어 단어",
-                   start_date=date(2025,10,1), end_date=date(2025,12,31))
-    db.session.add_all([p1, p2]); db.session.commit()
-    print("Seeded.")
+"""
+대량 샘플 데이터 생성기
+실행 방법: python seeds.py [--users 10] [--plans 5] [--start 2024-01-01] [--years 3] [--as-of 2026-10-18]
+                           [--tasks-per-day 1-3] [--max-logs 4] [--seed 42] [--batch 20000]
+
+DB_URL 의 데이터베이스(SQLite / MSSQL)에 마이그레이션을 적용한 뒤
+사용자 N명 x 사용자별 계획 M개와 요일 일정에 맞춘 작업, 여러 행의 상태 로그를 넣습니다.
+- 계획: 기간 안에서 시작일 / 2~18개월 길이 / 요일 2~6개 / 하루 작업 수를 무작위로 정함
+- 작업: schedule.weekday_dates 로 요일에 맞춘 날짜마다 하루 작업 수만큼 (order_no 는 계획 안에서 1부터)
+- 로그: --as-of 이전 작업만, 사용자별 성실도에 따라 1~--max-logs 건 (partial/missed 후 done 등)
+        마지막 로그를 작업의 현재 상태 컬럼(status 등)에 그대로 복사해 refresh_task_status 없이 일치시킴
+- 같은 인자(--seed, --as-of 포함)면 항상 같은 데이터 (사용자마다 seed 에서 파생한 난수열 사용)
+- ID 는 기존 최대값 다음부터 직접 지정하므로 기존 데이터가 있는 DB 에도 추가할 수 있음
+- --batch 행마다 executemany(bulk_sql.insert_many) 후 커밋 (메모리는 한 배치분만 사용)
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from flask import Flask
+
+import migrations
+from bulk_sql import insert_many
+from db_config import db, init_db
+from schedule import weekday_dates
+
+SUBJECTS = ["영어", "수학", "국어", "과학", "TOEFL", "한국사", "코딩", "독서"]
+WEEKDAY_PATTERNS = [(0, 1, 2, 3, 4), (0, 2, 4), (1, 3), (0, 1, 2, 3, 4, 5), (5, 6), (0, 1, 3, 4), (0, 1, 2, 3, 4, 5, 6)]
+MEMOS = ["", "", "", "복습 필요", "어려웠음", "오답 정리", "다시 보기"]
+
+USER_COLUMNS = ["user_id", "user_name", "created_at"]
+PLAN_COLUMNS = ["plan_id", "user_id", "title", "subject", "created_at"]
+TASK_COLUMNS = ["task_id", "plan_id", "plan_date", "task_title", "order_no", "link_url", "created_at",
+                "status", "actual_minutes", "memo", "status_updated_at"]
+LOG_COLUMNS = ["task_id", "user_id", "status", "actual_minutes", "memo", "updated_at"]
+
+
+def _parse_range(value):
+    """'1-3' -> (1, 3), '2' -> (2, 2)"""
+    low, _, high = value.partition("-")
+    low = int(low)
+    high = int(high) if high else low
+    if low < 1 or high < low:
+        raise argparse.ArgumentTypeError(f"잘못된 범위: {value}")
+    return low, high
+
+
+def _at(day, hour, minute=0):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=minute)
+
+
+def _log_history(rnd, plan_date, diligence, max_logs):
+    """작업 하나의 로그 목록 [(status, minutes, memo, updated_at)] (오래된 순, 없으면 빈 목록)"""
+    if rnd.random() > diligence + 0.1:
+        return []  # 기록하지 않은 작업
+    final = "done" if rnd.random() < diligence else rnd.choice(["partial", "missed"])
+    n = 1 + min(max_logs - 1, int(rnd.expovariate(1.5)))
+    updated_at = _at(plan_date, rnd.randint(7, 22), rnd.randrange(60))
+    history = []
+    for i in range(n):
+        status = final if i == n - 1 else rnd.choice(["partial", "missed"])
+        minutes = 0 if status == "missed" else rnd.choice([10, 20, 30, 30, 45, 60, 90])
+        history.append((status, minutes, rnd.choice(MEMOS), updated_at))
+        updated_at += timedelta(hours=rnd.randint(1, 72))
+    return history
+
+
+class Generator:
+    """배치 버퍼 + ID 할당 (부모 행을 먼저 넣도록 users -> plans -> tasks -> logs 순으로 flush)"""
+
+    def __init__(self, args):
+        self.args = args
+        self.m = migrations.Migrator(db.session)
+        self.buffers = {"study_plan_user": [], "study_plan": [], "study_plan_task": [], "study_plan_log": []}
+        self.counts = dict.fromkeys(self.buffers, 0)
+        self.next_id = {
+            "study_plan_user": self._max_id("study_plan_user", "user_id") + 1,
+            "study_plan": self._max_id("study_plan", "plan_id") + 1,
+            "study_plan_task": self._max_id("study_plan_task", "task_id") + 1,
+        }
+
+    def _max_id(self, table, column):
+        return self.m.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {self.m.t(table)}").scalar()
+
+    def allocate(self, table):
+        new_id = self.next_id[table]
+        self.next_id[table] += 1
+        return new_id
+
+    def add(self, table, row):
+        self.buffers[table].append(row)
+
+    def maybe_flush(self):
+        if len(self.buffers["study_plan_task"]) + len(self.buffers["study_plan_log"]) >= self.args.batch:
+            self.flush()
+
+    def flush(self):
+        columns = {"study_plan_user": USER_COLUMNS, "study_plan": PLAN_COLUMNS,
+                   "study_plan_task": TASK_COLUMNS, "study_plan_log": LOG_COLUMNS}
+        for table, rows in self.buffers.items():
+            if rows:
+                self.counts[table] += insert_many(self.m.t(table), columns[table], rows,
+                                                  identity_insert=table != "study_plan_log")
+                rows.clear()
+        db.session.commit()
+        print(f"  작업 {self.counts['study_plan_task']}, 로그 {self.counts['study_plan_log']}", file=sys.stderr)
+
+    def generate_user(self, index):
+        args = self.args
+        # 사용자별 난수열: 배치 크기 / 기존 데이터와 관계없이 같은 seed 면 같은 데이터
+        rnd = random.Random(args.seed * 1_000_003 + index)
+        user_id = self.allocate("study_plan_user")
+        window_days = (args.end - args.start).days
+        self.add("study_plan_user", (user_id, f"{args.prefix}{user_id}", _at(args.start, 9)))
+        diligence = rnd.uniform(0.45, 0.95)
+
+        for p in range(args.plans):
+            plan_id = self.allocate("study_plan")
+            subject = rnd.choice(SUBJECTS)
+            plan_start = args.start + timedelta(days=rnd.randrange(max(window_days - 60, 1)))
+            plan_end = min(plan_start + timedelta(days=rnd.randint(60, 540)), args.end)
+            weekdays = rnd.choice(WEEKDAY_PATTERNS)
+            per_day = rnd.randint(*args.tasks_per_day)
+            self.add("study_plan", (plan_id, user_id, f"{subject} 계획 {p + 1}", subject, _at(plan_start, 8)))
+
+            order_no = 0
+            for plan_date in weekday_dates(plan_start, plan_end, weekdays):
+                for _ in range(per_day):
+                    order_no += 1
+                    task_id = self.allocate("study_plan_task")
+                    history = _log_history(rnd, plan_date, diligence, args.max_logs) \
+                        if plan_date <= args.as_of else []
+                    for status, minutes, memo, updated_at in history:
+                        self.add("study_plan_log", (task_id, user_id, status, minutes, memo, updated_at))
+                    latest = history[-1] if history else (None, None, None, None)
+                    link_url = f"https://example.com/{subject}/{order_no}" if rnd.random() < 0.2 else None
+                    self.add("study_plan_task", (
+                        task_id, plan_id, plan_date, f"{subject} {order_no}강", order_no, link_url,
+                        _at(plan_start, 8), *latest,
+                    ))
+                self.maybe_flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 샘플 데이터 생성 (DB_URL 대상)")
+    parser.add_argument("--users", type=int, default=10, help="사용자 수")
+    parser.add_argument("--plans", type=int, default=5, help="사용자별 계획 수")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2024, 1, 1), help="일정 시작일")
+    parser.add_argument("--years", type=int, default=3, help="일정 기간(년)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="이 날짜까지의 작업만 로그 생성 (재현하려면 명시)")
+    parser.add_argument("--tasks-per-day", type=_parse_range, default=(1, 3), help="계획별 하루 작업 수 범위")
+    parser.add_argument("--max-logs", type=int, default=4, help="작업별 최대 로그 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=20000, help="한 번에 INSERT / 커밋할 행 수")
+    parser.add_argument("--prefix", default="seed_user_", help="사용자 이름 접두어 (로그인 이름 = 접두어 + user_id)")
+    args = parser.parse_args()
+    args.end = args.start.replace(year=args.start.year + args.years) - timedelta(days=1)
+
+    app = Flask(__name__)
+    init_db(app)
+
+    with app.app_context():
+        migrations.run_migrations()
+        started = time.perf_counter()
+        generator = Generator(args)
+        try:
+            for index in range(args.users):
+                generator.generate_user(index)
+            generator.flush()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started
+        total = sum(generator.counts.values())
+        print(f"\n✅ {elapsed:.1f}초 동안 {total}행 생성 ({total / max(elapsed, 1e-9):,.0f}행/초)")
+        for table, count in generator.counts.items():
+            print(f"  {table}: {count}")
+
+
+if __name__ == "__main__":
+    main()
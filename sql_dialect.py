@@ -0,0 +1,113 @@
+"""
+SQL 방언 계층 (MSSQL / SQLite)
+
+앱의 SQL 은 MSSQL(T-SQL) 기준으로 작성하고, SQLite 엔진에는 install() 로 다음을 연결합니다.
+- 문장 변환: 실행 직전에 T-SQL 표기를 SQLite 표기로 바꿈 (문장별로 캐시하므로 같은 문장은 한 번만 변환)
+    dbo.<table>          -> <table>
+    ISNULL(a, b)         -> COALESCE(a, b)
+    SYSDATETIMEOFFSET()  -> CURRENT_TIMESTAMP
+- 타입 변환: DATE / DATETIMEOFFSET 컬럼을 pyodbc 와 같은 date / datetime 객체로 반환
+- 내장 모드(SQLITE_TUNED): 연결마다 WAL / synchronous=NORMAL / mmap_size / cache_size / busy_timeout 설정
+
+문장 구조 자체가 다른 경우는 호출하는 쪽에서 세션 bind 의 dialect.name 으로 나눠 만듭니다.
+- TOP (:limit) / LIMIT            read_queries.daily_page_query
+- OUTPUT INSERTED / RETURNING     bulk_sql.insert_returning_id
+- UPDATE t ... FROM ... JOIN      task_status.refresh_task_status
+- SET IDENTITY_INSERT             bulk_sql.insert_many (MSSQL 에서만)
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+_TRANSLATIONS = [
+    (re.compile(r"\bdbo\."), ""),
+    (re.compile(r"\bISNULL\("), "COALESCE("),
+    (re.compile(r"\bSYSDATETIMEOFFSET\(\)"), "CURRENT_TIMESTAMP"),
+]
+
+
+def _convert_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+
+def _convert_datetime(value):
+    text_value = value.decode()
+    try:
+        return datetime.fromisoformat(text_value)
+    except ValueError:
+        return text_value
+
+
+# 컬럼 선언 타입 기준 변환 (connect_args 의 detect_types=PARSE_DECLTYPES 와 함께 동작)
+sqlite3.register_converter("DATE", _convert_date)
+sqlite3.register_converter("DATETIMEOFFSET", _convert_datetime)
+
+SQLITE_CONNECT_ARGS = {"detect_types": sqlite3.PARSE_DECLTYPES}
+
+
+def now_sql(name):
+    """현재 시각 SQL 식"""
+    return "CURRENT_TIMESTAMP" if name == "sqlite" else "SYSDATETIMEOFFSET()"
+
+
+@lru_cache(maxsize=1024)
+def to_sqlite(statement):
+    """T-SQL 표기 -> SQLite 표기"""
+    for pattern, replacement in _TRANSLATIONS:
+        statement = pattern.sub(replacement, statement)
+    return statement
+
+
+def _translate(conn, cursor, statement, parameters, context, executemany):
+    return to_sqlite(statement), parameters
+
+
+def is_memory_url(url):
+    url = make_url(url)
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def sqlite_url(url, shared_cache=False):
+    """shared_cache 면 파일 DB URL 을 URI 형식(file:...?cache=shared)으로 바꿈"""
+    url = make_url(url)
+    if not shared_cache or is_memory_url(url) or url.database.startswith("file:"):
+        return url
+    return url.set(database=f"file:{url.database}", query={**url.query, "cache": "shared", "uri": "true"})
+
+
+def _pragmas(config):
+    pragmas = [f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))}"]
+    if config.get("SQLITE_TUNED", True):
+        pragmas += [
+            "PRAGMA journal_mode = WAL",        # 읽기와 쓰기가 서로 막지 않음
+            "PRAGMA synchronous = NORMAL",      # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음
+            f"PRAGMA mmap_size = {int(config.get('SQLITE_MMAP_SIZE', 0))}",
+            f"PRAGMA cache_size = -{int(config.get('SQLITE_CACHE_SIZE_KB', 2000))}",
+            "PRAGMA temp_store = MEMORY",
+        ]
+    return pragmas
+
+
+def install(engine, config=None):
+    """SQLite 엔진에 문장 변환과 연결별 PRAGMA 연결 (SQLite 가 아니면 아무것도 하지 않음)
+
+    config: SQLITE_* 설정을 담은 dict (app.config). 메모리 DB 에는 PRAGMA 를 적용하지 않습니다.
+    """
+    if engine.dialect.name != "sqlite" or event.contains(engine, "before_cursor_execute", _translate):
+        return
+    event.listen(engine, "before_cursor_execute", _translate, retval=True)
+    if is_memory_url(engine.url):
+        return
+
+    pragmas = _pragmas(config or {})
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
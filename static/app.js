@@ -1,27 +1,108 @@
 // static/app.js
-function nextStatus(current) {
-  const order = ["planned","done","partial","missed","none"];
-  const i = order.indexOf(current);
-  return order[(i + 1) % order.length];
-}
+// 체크박스 상태 변경을 모아 /day/update_batch 로 한 번에 저장 (마지막 변경 후 400ms)
+const statusBatch = { pending: new Map(), waiters: [], timer: null, inFlight: new Set() };
 
-document.addEventListener("click", async (e) => {
-  const cell = e.target.closest("[data-day-id]");
-  if (!cell) return;
+function queueStatusUpdate(taskId, completed) {
+  taskId = Number(taskId);
+  statusBatch.pending.set(taskId, { task_id: taskId, status: completed ? "done" : "planned" });
+  clearTimeout(statusBatch.timer);
+  statusBatch.timer = setTimeout(flushStatusUpdates, 400);
+  return new Promise((resolve, reject) => statusBatch.waiters.push({ taskId, resolve, reject }));
+}
 
-  const dayId = cell.dataset.dayId;
-  const status = nextStatus(cell.dataset.status);
+function hasPendingStatusUpdates() {
+  return statusBatch.pending.size > 0 || statusBatch.inFlight.size > 0;
+}
 
-  const res = await fetch("/day/status", {
-    method: "POST",
-    headers: {"Content-Type":"application/json"},
-    body: JSON.stringify({ day_id: Number(dayId), status })
-  });
-  const j = await res.json();
-  if (j.ok) {
-    cell.dataset.status = status;
-    cell.className = "day " + status;
-  } else {
-    alert(j.error || "update failed");
+// 모아둔 변경을 바로 보내고, 이미 보낸 요청까지 모두 끝나면 resolve
+// keepalive: 페이지를 떠나는 중에도 요청이 끝까지 전송되도록 (pagehide / visibilitychange)
+function flushStatusUpdates(keepalive = false) {
+  clearTimeout(statusBatch.timer);
+  const updates = [...statusBatch.pending.values()];
+  const waiters = statusBatch.waiters;
+  statusBatch.pending = new Map();
+  statusBatch.waiters = [];
+  if (updates.length > 0) {
+    const request = fetch("/day/update_batch", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ updates }),
+      keepalive: keepalive === true
+    })
+      .then(res => res.json())
+      .then(data => {
+        if (!data.ok) throw new Error(data.error || "저장 중 오류가 발생했습니다.");
+        return new Map(data.results.map(r => [r.task_id, r]));
+      });
+    // 대기 중인 체크박스에 결과를 알리기 전에 inFlight 에서 빼야 hasPendingStatusUpdates() 가 정확함
+    const done = request.then(results => {
+      statusBatch.inFlight.delete(done);
+      waiters.forEach(w => {
+        const r = results.get(w.taskId);
+        if (r && r.ok) w.resolve(r);
+        else w.reject(new Error((r && r.error) || "저장 중 오류가 발생했습니다."));
+      });
+    }, err => {
+      statusBatch.inFlight.delete(done);
+      waiters.forEach(w => w.reject(err));
+    });
+    statusBatch.inFlight.add(done);
   }
+  return Promise.all([...statusBatch.inFlight]);
+}
+
+// 페이지를 떠나거나 숨길 때 남은 변경을 바로 전송 (400ms 대기 중인 변경이 버려지지 않도록)
+window.addEventListener("pagehide", () => flushStatusUpdates(true));
+document.addEventListener("visibilitychange", () => {
+  if (document.visibilityState === "hidden") flushStatusUpdates(true);
 });
+
+// 일일 계획을 cursor 페이지 단위로 모두 가져오기 (페이지가 도착할 때마다 onPage(rows, page) 호출)
+async function fetchDailyPlanPages(planId, onPage) {
+  let cursor = null;
+  do {
+    const url = `/plan/${planId}/daily` + (cursor ? `?cursor=${encodeURIComponent(cursor)}` : '');
+    const res = await fetch(url);
+    const data = await res.json();
+    if (!data.ok) throw new Error(data.error || "일일 계획 조회 실패");
+    onPage(data.daily_plans, data);
+    cursor = data.next_cursor;
+  } while (cursor);
+}
+
+// 일일 계획 편집 표(tbody)를 페이지가 도착할 때마다 채우기 (buildRow(plan) -> <tr>)
+// 불러오는 중이거나 도중에 실패한 표는 저장하지 않음 (저장 시 목록에 없는 작업은 삭제되므로)
+async function loadDailyPlanTable(tbody, planId, buildRow) {
+  tbody.dataset.loading = "1";
+  delete tbody.dataset.loadFailed;
+  let cleared = false;
+  try {
+    await fetchDailyPlanPages(planId, rows => {
+      if (rows.length > 0 && !cleared) {
+        tbody.innerHTML = ''; // 기존 내용 제거
+        cleared = true;
+      }
+      rows.forEach(plan => tbody.appendChild(buildRow(plan)));
+    });
+  } catch (error) {
+    console.error("데이터 로드 오류:", error);
+    tbody.dataset.loadFailed = "1";
+    const columns = tbody.closest("table").querySelectorAll("thead th").length;
+    tbody.innerHTML = `
+      <tr class="load-error-row">
+        <td colspan="${columns}" class="px-4 py-4 text-center text-red-500">
+          일일 계획을 불러오지 못했습니다. 닫았다가 다시 열어 주세요.
+        </td>
+      </tr>
+    `;
+  } finally {
+    delete tbody.dataset.loading;
+  }
+}
+
+// 저장할 수 없는 표면 안내 문구, 저장해도 되면 null
+function dailyPlanTableSaveBlocker(tbody) {
+  if (tbody.dataset.loading) return "일일 계획을 불러오는 중입니다. 잠시 후 다시 저장해주세요.";
+  if (tbody.dataset.loadFailed) return "일일 계획을 불러오지 못해 저장할 수 없습니다. 닫았다가 다시 열어 주세요.";
+  return null;
+}
@@ -0,0 +1,198 @@
+"""
+작업(task)별 현재 상태 read model
+
+study_plan_task 의 status / actual_minutes / memo / status_updated_at 컬럼은
+study_plan_log 의 최신 행을 그대로 복사해 둔 값입니다.
+조회 화면은 이 컬럼만 읽고, 로그를 쓰는 경로는 refresh_task_status() 로 동기화합니다.
+"""
+from sqlalchemy import text, bindparam
+from db_config import db
+from migrations import Migrator
+
+# task별 최신 로그 1건 (status/actual_minutes/memo 를 한 번의 정렬로 함께 확정)
+# updated_at 이 같으면 (SQLite CURRENT_TIMESTAMP 는 초 단위) 나중에 쓴 로그(log_id 큰 쪽)가 최신
+# {log_where} 로 로그 범위를 먼저 좁혀 필요한 task 파티션만 정렬합니다.
+LATEST_LOG_SQL = """
+    SELECT task_id, status, actual_minutes, memo, updated_at
+    FROM (
+        SELECT task_id, status, actual_minutes, memo, updated_at,
+               ROW_NUMBER() OVER (PARTITION BY task_id ORDER BY updated_at DESC, log_id DESC) as rn
+        FROM dbo.study_plan_log
+        {log_where}
+    ) ranked
+    WHERE rn = 1
+"""
+
+# 최신 로그 1건을 task 컬럼으로 복사 (task 범위는 WHERE 절로 제한)
+_REFRESH_SQL = """
+    UPDATE t
+    SET status = l.status,
+        actual_minutes = l.actual_minutes,
+        memo = l.memo,
+        status_updated_at = l.updated_at
+    FROM dbo.study_plan_task t
+    LEFT JOIN ({latest}) l ON t.task_id = l.task_id
+    {where}
+"""
+
+# SQLite: UPDATE 대상에 별칭 JOIN 을 쓸 수 없으므로 LEFT JOIN 결과(로그 없는 작업은 NULL)를 FROM 에 두고
+# 같은 task_id 행을 갱신 (바인드 순서는 MSSQL 문장과 같음: {latest} -> {where})
+_REFRESH_SQL_SQLITE = """
+    UPDATE dbo.study_plan_task AS t
+    SET status = l.status,
+        actual_minutes = l.actual_minutes,
+        memo = l.memo,
+        status_updated_at = l.updated_at
+    FROM (
+        SELECT t.task_id, x.status, x.actual_minutes, x.memo, x.updated_at
+        FROM dbo.study_plan_task t
+        LEFT JOIN ({latest}) x ON t.task_id = x.task_id
+        {where}
+    ) l
+    WHERE t.task_id = l.task_id
+"""
+
+
+_MAX_IDS_PER_QUERY = 1000
+
+
+def _refresh_sql(where, log_where):
+    template = _REFRESH_SQL_SQLITE if db.session.get_bind().dialect.name == "sqlite" else _REFRESH_SQL
+    return template.format(latest=LATEST_LOG_SQL.format(log_where=log_where), where=where)
+
+
+def refresh_task_status(task_ids=None, plan_id=None):
+    """study_plan_log 기준으로 task 현재 상태 컬럼 재계산 (커밋은 호출자가 담당)
+
+    - task_ids: 해당 작업들만 갱신
+    - plan_id: 해당 계획의 작업들만 갱신
+    - 둘 다 없으면 전체 재계산
+    """
+    if task_ids is not None:
+        task_ids = list(task_ids)
+        if not task_ids:
+            return 0
+        if len(task_ids) > _MAX_IDS_PER_QUERY:
+            # IN 목록이 두 번 쓰이므로 MSSQL 파라미터 상한(2100)을 넘지 않게 나눠 실행
+            return sum(
+                refresh_task_status(task_ids=task_ids[i:i + _MAX_IDS_PER_QUERY])
+                for i in range(0, len(task_ids), _MAX_IDS_PER_QUERY)
+            )
+        query = text(_refresh_sql(
+            where="WHERE t.task_id IN :task_ids",
+            log_where="WHERE task_id IN :task_ids",
+        )).bindparams(bindparam("task_ids", expanding=True))
+        params = {"task_ids": task_ids}
+    elif plan_id is not None:
+        query = text(_refresh_sql(
+            where="WHERE t.plan_id = :plan_id",
+            log_where="WHERE task_id IN (SELECT task_id FROM dbo.study_plan_task WHERE plan_id = :plan_id)",
+        ))
+        params = {"plan_id": plan_id}
+    else:
+        query = text(_refresh_sql(where="", log_where=""))
+        params = {}
+
+    result = db.session.execute(query, params)
+    return result.rowcount
+
+
+VALID_STATUSES = ("planned", "done", "partial", "missed")
+
+# 상태 변경마다 로그 행 추가 (이전 로그는 이력으로 남김) - executemany 로 한 번에 실행
+# actual_minutes / memo 가 NULL 이면 현재 상태 컬럼(최신 로그의 복사본) 값을 이어받습니다.
+_APPEND_LOG_SQL = """
+    INSERT INTO dbo.study_plan_log (task_id, user_id, status, actual_minutes, memo, updated_at)
+    SELECT t.task_id, :user_id, :status,
+           COALESCE(:actual_minutes, t.actual_minutes), COALESCE(:memo, t.memo), SYSDATETIMEOFFSET()
+    FROM dbo.study_plan_task t
+    WHERE t.task_id = :task_id
+"""
+
+
+def _owned_task_ids(user_id, task_ids):
+    """task_ids 중 user_id 의 계획에 속한 작업 ID 집합"""
+    query = text("""
+        SELECT t.task_id
+        FROM dbo.study_plan_task t
+        JOIN dbo.study_plan p ON t.plan_id = p.plan_id
+        WHERE p.user_id = :user_id AND t.task_id IN :task_ids
+    """).bindparams(bindparam("task_ids", expanding=True))
+    owned = set()
+    for i in range(0, len(task_ids), _MAX_IDS_PER_QUERY):
+        chunk = task_ids[i:i + _MAX_IDS_PER_QUERY]
+        rows = db.session.execute(query, {"user_id": user_id, "task_ids": chunk}).fetchall()
+        owned.update(r.task_id for r in rows)
+    return owned
+
+
+def _parse_status_update(entry):
+    """{task_id, status, minutes, memo} 검증 -> (정규화된 행, 오류 메시지)"""
+    try:
+        task_id = int(entry.get("task_id"))
+    except (TypeError, ValueError, AttributeError):
+        return None, "task_id가 필요합니다."
+    status = entry.get("status")
+    if status not in VALID_STATUSES:
+        return {"task_id": task_id}, f"status 는 {', '.join(VALID_STATUSES)} 중 하나여야 합니다."
+    minutes = entry.get("minutes")
+    if minutes is not None:
+        try:
+            minutes = int(minutes)
+        except (TypeError, ValueError):
+            return {"task_id": task_id}, "minutes 는 숫자여야 합니다."
+        if minutes < 0:
+            return {"task_id": task_id}, "minutes 는 0 이상이어야 합니다."
+    memo = entry.get("memo")
+    if memo is not None and len(str(memo)) > 500:
+        return {"task_id": task_id}, "memo 는 500자 이하여야 합니다."
+    return {
+        "task_id": task_id,
+        "status": status,
+        "actual_minutes": minutes,
+        "memo": None if memo is None else str(memo),
+    }, None
+
+
+def apply_status_updates(user_id, updates):
+    """작업 상태 변경 여러 건을 한 번에 적용 (커밋은 호출자가 담당)
+
+    - updates: [{task_id, status, minutes?, memo?}, ...]  minutes/memo 를 생략하면 기존 값 유지
+    - 같은 task_id 가 여러 번 오면 마지막 값 적용
+    - 검증 실패/다른 사용자의 작업은 건너뛰고 결과에 오류로 표시
+    로그 추가 1문장(executemany) + 현재 상태 컬럼 갱신 1문장으로 처리하며,
+    입력 순서대로 작업별 결과 [{task_id, ok, status | error}] 를 반환합니다.
+    """
+    parsed = [_parse_status_update(entry or {}) for entry in updates]
+    rows = {row["task_id"]: row for row, error in parsed if error is None}
+    owned = _owned_task_ids(user_id, list(rows)) if rows else set()
+
+    valid = [dict(rows[task_id], user_id=user_id) for task_id in rows if task_id in owned]
+    if valid:
+        db.session.execute(text(_APPEND_LOG_SQL), valid)
+        refresh_task_status(task_ids=[row["task_id"] for row in valid])
+
+    results = []
+    for row, error in parsed:
+        task_id = row["task_id"] if row else None
+        if error is None and task_id not in owned:
+            error = "작업을 찾을 수 없습니다."
+        if error is None:
+            results.append({"task_id": task_id, "ok": True, "status": rows[task_id]["status"]})
+        else:
+            results.append({"task_id": task_id, "ok": False, "error": error})
+    return results
+
+
+def ensure_status_columns():
+    """기존 DB에 현재 상태 컬럼이 없으면 추가 (MSSQL / SQLite)"""
+    columns = [
+        ("status", "NVARCHAR(10) NULL"),
+        ("actual_minutes", "INT NULL"),
+        ("memo", "NVARCHAR(500) NULL"),
+        ("status_updated_at", "DATETIMEOFFSET NULL"),
+    ]
+    m = Migrator(db.session)
+    for name, ddl in columns:
+        m.add_column("study_plan_task", name, ddl)
+    db.session.commit()
@@ -0,0 +1,179 @@
+"""
+템플릿 항목 스트리밍 가져오기 (CSV / XLSX / 붙여넣기)
+
+파일 전체를 리스트로 만들지 않고 행 단위 제너레이터로 읽어
+batch_size 행씩 bulk_insert 후 커밋합니다.
+- 메모리: 한 배치 + 최대 max_errors 개의 오류만 유지
+- 트랜잭션: 배치마다 커밋하므로 긴 잠금이 생기지 않음
+  (중간에 실패하면 이전 배치까지는 저장되며, 결과의 count 로 확인)
+- 행 수 / 파일 크기 제한을 넘으면 그 뒤 행만 버리고 저장한 행까지를 결과로 반환 (truncated)
+- 잘못된 행은 건너뛰고 errors 에 (행 번호, 사유) 로 기록
+행 스트림은 (행 번호, order_no, title, link_url) 을 생성합니다. 행 번호는 입력에서의 위치(오류 표시용)이고,
+order_no 가 None 이면 저장하는 행에만 first_order(기본 1)부터 차례로 붙입니다 (빈 행 / 잘못된 행 때문에 순서가 비지 않도록).
+"""
+import csv
+import io
+import re
+
+from bulk_sql import bulk_insert
+from db_config import db
+
+# 컬럼 길이 (migrations.py 의 study_task_template 정의와 동일)
+TITLE_MAX_LENGTH = 200
+LINK_MAX_LENGTH = 1000
+
+TEMPLATE_COLUMNS = ["plan_id", "order_no", "title", "link_url"]
+
+
+class ImportLimitError(ValueError):
+    """행 수 / 파일 크기 제한 초과"""
+
+
+class _ByteLimitedStream(io.RawIOBase):
+    """읽은 바이트 수가 max_bytes 를 넘으면 ImportLimitError (CSV 스트림용)"""
+
+    def __init__(self, raw, max_bytes):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self._read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._raw.read(len(buffer))
+        self._read += len(data)
+        if self._max_bytes and self._read > self._max_bytes:
+            raise ImportLimitError(f"파일 크기가 제한({self._max_bytes} bytes)을 넘었습니다.")
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def iter_csv_rows(file_stream, max_bytes=None):
+    """CSV 스트림 -> (행 번호, None, title, link_url) 생성. 헤더(optional): title,link_url"""
+    stream = io.BufferedReader(_ByteLimitedStream(file_stream, max_bytes))
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for i, row in enumerate(reader, start=1):
+        title = _clean(row.get("title") or row.get("Title"))
+        link = _clean(row.get("link_url") or row.get("link") or row.get("Link"))
+        yield i, None, title, link
+
+
+def iter_xlsx_rows(file_storage):
+    """XLSX -> (행 번호, None, title, link_url) 생성 (openpyxl read_only 모드, 첫 행은 헤더)"""
+    import openpyxl  # optional dependency
+
+    wb = openpyxl.load_workbook(file_storage, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        headers = [str(v).strip().lower() if v is not None else "" for v in header]
+        col_title = headers.index("title") if "title" in headers else 0
+        col_link = headers.index("link_url") if "link_url" in headers else None
+        for i, values in enumerate(rows, start=1):
+            title = _clean(values[col_title]) if col_title < len(values) else None
+            link = _clean(values[col_link]) if col_link is not None and col_link < len(values) else None
+            yield i, None, title, link
+    finally:
+        wb.close()
+
+
+def iter_paste_rows(paste_text):
+    """붙여넣기 텍스트 -> (줄 번호, None, title, link_url) 생성 (탭 또는 콤마 구분, 빈 줄은 건너뜀)"""
+    for line_no, ln in enumerate((paste_text or "").splitlines(), start=1):
+        if not ln.strip():
+            continue
+        parts = re.split(r"\t|,", ln.strip())
+        title = _clean(parts[0]) if len(parts) > 0 else None
+        link = _clean(parts[1]) if len(parts) > 1 else None
+        yield line_no, None, title, link
+
+
+def _validate(title, link):
+    """행 오류 사유 반환 (정상이면 None)"""
+    if not title:
+        return "title 이 비어 있습니다."
+    if len(title) > TITLE_MAX_LENGTH:
+        return f"title 은 {TITLE_MAX_LENGTH}자 이하여야 합니다."
+    if link and len(link) > LINK_MAX_LENGTH:
+        return f"link_url 은 {LINK_MAX_LENGTH}자 이하여야 합니다."
+    return None
+
+
+def iter_import_progress(plan_id, rows, batch_size=1000, max_rows=None, max_errors=100, first_order=1):
+    """(행 번호, order_no, title, link_url) 스트림을 batch_size 행씩 저장하며 진행 상황을 생성
+
+    - 배치를 커밋할 때마다 누적 결과를 yield 하고, 끝나면 done=True 인 최종 결과를 yield
+    - 빈 행(title, link 모두 없음)은 조용히 건너뜀
+    - order_no 가 None 인 행은 저장하는 행끼리 first_order 부터 차례로 번호를 붙임
+    - max_rows 행을 넘거나 스트림이 ImportLimitError(파일 크기)를 내면 읽기를 멈추고
+      그때까지의 행을 저장한 뒤 truncated=True, limit_error=사유 로 끝냄
+      (저장한 행이 하나도 없으면 ImportLimitError 를 그대로 냄)
+    결과: {"count", "rows_read", "batches", "errors", "error_count", "truncated", "limit_error", "done"}
+    """
+    result = {"count": 0, "rows_read": 0, "batches": 0, "errors": [], "error_count": 0,
+              "truncated": False, "limit_error": None, "done": False}
+    batch = []
+    next_order = first_order
+
+    def flush():
+        bulk_insert("dbo.study_task_template", TEMPLATE_COLUMNS, batch)
+        db.session.commit()
+        result["count"] += len(batch)
+        result["batches"] += 1
+        batch.clear()
+
+    rows = iter(rows)
+    while True:
+        try:
+            row_no, order_no, title, link = next(rows)
+        except StopIteration:
+            break
+        except ImportLimitError as e:
+            result["limit_error"] = str(e)
+            break
+        if not title and not link:
+            continue
+        if max_rows and result["rows_read"] >= max_rows:
+            result["limit_error"] = f"행 수가 제한({max_rows}행)을 넘어 {row_no}행부터는 가져오지 않았습니다."
+            break
+        result["rows_read"] += 1
+
+        error = _validate(title, link)
+        if error:
+            result["error_count"] += 1
+            if len(result["errors"]) < max_errors:
+                result["errors"].append({"row": row_no, "error": error})
+            continue
+
+        if order_no is None:
+            order_no = next_order
+            next_order += 1
+        batch.append({"plan_id": plan_id, "order_no": order_no, "title": title, "link_url": link})
+        if len(batch) >= batch_size:
+            flush()
+            yield result
+
+    if batch:
+        flush()
+    if result["limit_error"]:
+        if result["count"] == 0:
+            raise ImportLimitError(result["limit_error"])
+        result["truncated"] = True
+    result["done"] = True
+    yield result
+
+
+def import_template_rows(plan_id, rows, **options):
+    """iter_import_progress 를 끝까지 실행하고 최종 결과 반환"""
+    result = None
+    for result in iter_import_progress(plan_id, rows, **options):
+        pass
+    return result
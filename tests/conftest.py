@@ -0,0 +1,98 @@
+"""
+테스트 공용 fixture: 임시 SQLite 파일 DB 에 마이그레이션을 적용한 앱 (sql_dialect 가 T-SQL 을 변환)
+"""
+import contextlib
+import io
+import os
+
+# app 모듈이 import 될 때 만드는 기본 앱은 파일을 만들지 않도록 메모리 DB 사용
+os.environ.setdefault("DB_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import text
+
+import migrations
+from app import create_app
+from db_config import db
+from request_metrics import request_metrics
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        "SECRET_KEY": "test",
+        "TESTING": True,
+    })
+    with app.app_context():
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrations.run_migrations()
+        execute("INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) "
+                "VALUES (1, 'tester', CURRENT_TIMESTAMP)")
+        db.session.commit()
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    """user_id 1 로 로그인한 테스트 클라이언트"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return client
+
+
+def execute(sql, params=None):
+    return db.session.execute(text(sql), params or {})
+
+
+def insert_plan(plan_id, title, subject="math", user_id=1):
+    execute("INSERT INTO dbo.study_plan (plan_id, user_id, title, subject, created_at) "
+            "VALUES (:plan_id, :user_id, :title, :subject, CURRENT_TIMESTAMP)",
+            {"plan_id": plan_id, "user_id": user_id, "title": title, "subject": subject})
+
+
+def insert_task(task_id, plan_id, plan_date, title, order_no):
+    execute("INSERT INTO dbo.study_plan_task (task_id, plan_id, plan_date, task_title, order_no, created_at) "
+            "VALUES (:task_id, :plan_id, :plan_date, :title, :order_no, CURRENT_TIMESTAMP)",
+            {"task_id": task_id, "plan_id": plan_id, "plan_date": plan_date, "title": title, "order_no": order_no})
+
+
+def insert_log(task_id, status, updated_at, minutes=None, memo=None, user_id=1):
+    execute("INSERT INTO dbo.study_plan_log (task_id, user_id, status, actual_minutes, memo, updated_at) "
+            "VALUES (:task_id, :user_id, :status, :minutes, :memo, :updated_at)",
+            {"task_id": task_id, "user_id": user_id, "status": status, "minutes": minutes, "memo": memo,
+             "updated_at": updated_at})
+
+
+def logs_of(task_id):
+    """작업의 로그 [(log_id, status, actual_minutes, memo, updated_at)] (log_id 순)"""
+    return [tuple(row) for row in execute(
+        "SELECT log_id, status, actual_minutes, memo, updated_at FROM dbo.study_plan_log "
+        "WHERE task_id = :task_id ORDER BY log_id", {"task_id": task_id})]
+
+
+def query_count(endpoint):
+    """request_metrics 에 기록된 엔드포인트별 누적 쿼리 수"""
+    histogram = dict(request_metrics.query_count.items()).get(endpoint)
+    return 0 if histogram is None else histogram.sum
+
+
+def get_with_query_count(client, path, endpoint):
+    """GET 요청 하나의 (응답, 그 요청이 실행한 쿼리 수)"""
+    return open_with_query_count(client, endpoint, path)
+
+
+def open_with_query_count(client, endpoint, *args, **kwargs):
+    """client.open(*args, **kwargs) 요청 하나의 (응답, 그 요청이 실행한 쿼리 수)
+
+    지표는 응답을 닫을 때 기록되므로 WSGI 서버처럼 본문을 끝까지 읽고 닫습니다.
+    """
+    before = query_count(endpoint)
+    response = client.open(*args, **kwargs)
+    response.get_data()
+    response.close()
+    return response, query_count(endpoint) - before
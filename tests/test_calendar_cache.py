@@ -0,0 +1,68 @@
+"""
+메인 캘린더 캐시: 다른 워커 프로세스(별도 앱)의 쓰기 뒤에도 옛 화면을 보여주지 않음
+"""
+import pytest
+from flask import template_rendered
+
+from app import create_app, get_today_kst
+from conftest import insert_plan, insert_task
+from db_config import db
+
+
+@pytest.fixture
+def other_worker(app):
+    """같은 DB 를 쓰는 두 번째 앱 (캐시가 따로인 다른 워커)"""
+    worker = create_app({"SQLALCHEMY_DATABASE_URI": app.config["SQLALCHEMY_DATABASE_URI"],
+                         "SECRET_KEY": "test", "TESTING": True})
+    yield worker
+    with worker.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def login(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return client
+
+
+def index_stats(app, client):
+    recorded = []
+
+    def record(sender, template, context, **extra):
+        if template.name == "index.html":
+            recorded.append(context["stats"])
+
+    with template_rendered.connected_to(record, app):
+        assert client.get(f"/{get_today_kst().year}").status_code == 200
+    return recorded[-1]
+
+
+def test_write_on_other_worker_invalidates_cached_calendar(app, other_worker):
+    today = get_today_kst()
+    with app.app_context():
+        insert_plan(1, "수학 계획")
+        insert_task(1, 1, today, "미적분 1강", 1)
+        insert_task(2, 1, today, "미적분 2강", 2)
+        db.session.commit()
+
+    reader, writer = login(app), login(other_worker)
+    assert index_stats(app, reader)["completed"] == 0
+    assert app.extensions["calendar_cache"].stats()["size"] == 1
+
+    response = writer.post("/day/update", json={"task_id": 1, "completed": True})
+    assert response.get_json()["ok"] is True
+
+    assert index_stats(app, reader)["completed"] == 1
+
+
+def test_cached_calendar_is_reused_without_writes(app, client):
+    with app.app_context():
+        insert_plan(1, "수학 계획")
+        db.session.commit()
+
+    index_stats(app, client)
+    index_stats(app, client)
+
+    assert app.extensions["calendar_cache"].stats()["hits"] == 1
@@ -0,0 +1,37 @@
+"""
+일일 계획 페이지 조회 (GET /plan/<plan_id>/daily): 첫 페이지에 계획 전체 진행률 집계를 함께 담음
+"""
+from conftest import execute, insert_plan, insert_task
+from db_config import db
+
+
+def seed(app):
+    with app.app_context():
+        insert_plan(1, "수학 계획")
+        for i in range(5):
+            insert_task(i + 1, 1, f"2025-10-2{i}", f"작업 {i + 1}", 1)
+        execute("UPDATE dbo.study_plan_task SET status = 'done' WHERE task_id IN (1, 4)")
+        db.session.commit()
+
+
+def test_first_page_carries_whole_plan_progress(app, client):
+    seed(app)
+
+    first = client.get("/plan/1/daily?limit=2").get_json()
+    second = client.get(f"/plan/1/daily?limit=2&cursor={first['next_cursor']}").get_json()
+
+    assert [p["task_id"] for p in first["daily_plans"]] == [1, 2]
+    assert first["progress"] == {"task_count": 5, "done_count": 2}
+    assert [p["task_id"] for p in second["daily_plans"]] == [3, 4]
+    assert "progress" not in second
+
+
+def test_empty_plan_reports_zero_progress(app, client):
+    with app.app_context():
+        insert_plan(1, "빈 계획")
+        db.session.commit()
+
+    data = client.get("/plan/1/daily").get_json()
+
+    assert data["daily_plans"] == []
+    assert data["progress"] == {"task_count": 0, "done_count": 0}
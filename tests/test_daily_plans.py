@@ -0,0 +1,64 @@
+"""
+일일 계획 저장 (POST /plan/<plan_id>/daily): 새 작업은 한 문장으로 INSERT, 로그는 요청한 사용자로 기록
+"""
+from conftest import execute, insert_plan, insert_task, open_with_query_count
+from db_config import db
+
+DAY = "2025-10-20"
+
+
+def seed_user_plan(user_id=2):
+    if user_id != 1:  # user_id 1 은 app fixture 가 만듦
+        execute("INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) "
+                "VALUES (:user_id, 'owner', CURRENT_TIMESTAMP)", {"user_id": user_id})
+    insert_plan(1, "수학 계획", user_id=user_id)
+    insert_task(1, 1, DAY, "기존 작업", 1)
+    db.session.commit()
+
+
+def save(client, daily_plans, plan_id=1):
+    return open_with_query_count(client, "main.save_daily_plans", f"/plan/{plan_id}/daily", method="POST",
+                                 json={"daily_plans": daily_plans})
+
+
+def new_rows(n, status_of):
+    return [{"date": f"2025-10-{21 + i % 7}", "description": f"새 작업 {i}", "order": 2 + i,
+             "status": status_of(i)} for i in range(n)]
+
+
+def test_new_tasks_get_their_own_status_and_log(app, client):
+    with client.session_transaction() as session:
+        session["user_id"] = 2
+    with app.app_context():
+        seed_user_plan()
+    statuses = ["done", "planned", "partial", "missed", "planned", "done"]
+    rows = [{"task_id": 1, "date": DAY, "description": "기존 작업", "order": 1, "status": "done"}]
+    rows += new_rows(len(statuses), lambda i: statuses[i])
+
+    response, _ = save(client, rows)
+
+    data = response.get_json()
+    assert (data["ok"], data["inserted"], data["status_changed"]) == (True, 6, 5)
+    with app.app_context():
+        tasks = {r.task_title: (r.task_id, r.status) for r in execute(
+            "SELECT task_id, task_title, COALESCE(status, 'planned') AS status FROM dbo.study_plan_task")}
+        assert [tasks[f"새 작업 {i}"][1] for i in range(len(statuses))] == statuses
+        assert tasks["기존 작업"][1] == "done"
+        logs = execute("SELECT task_id, user_id, status FROM dbo.study_plan_log ORDER BY log_id").fetchall()
+        assert {(r.task_id, r.status) for r in logs} == {
+            (task_id, status) for task_id, status in tasks.values() if status != "planned"}
+        assert {r.user_id for r in logs} == {2}
+
+
+def test_query_count_does_not_grow_with_new_status_rows(app, client):
+    with app.app_context():
+        insert_plan(1, "수학 계획")
+        insert_plan(2, "영어 계획")
+        db.session.commit()
+
+    few_response, few = save(client, new_rows(2, lambda i: "done"), plan_id=1)
+    many_response, many = save(client, new_rows(40, lambda i: "done"), plan_id=2)
+
+    assert few_response.get_json()["status_changed"] == 2
+    assert many_response.get_json()["status_changed"] == 40
+    assert many == few
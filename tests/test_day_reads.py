@@ -0,0 +1,142 @@
+"""
+/day/<day_id>, /today 조회: 작업별 현재 상태는 최신 로그 기준, 쿼리 수는 작업 수와 무관
+"""
+import pytest
+from flask import template_rendered
+
+from app import get_today_kst
+from conftest import execute, get_with_query_count, insert_log, insert_plan, insert_task
+from db_config import db
+from task_status import refresh_task_status
+
+DAY = "2025-10-22"
+
+
+def seed_day(plan_date, extra_tasks=0):
+    """계획 2개 + 다른 사용자 계획 1개, 작업마다 로그 여러 행 (같은 시각 로그 포함)"""
+    execute("INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) "
+            "VALUES (2, 'other', CURRENT_TIMESTAMP)")
+    insert_plan(1, "수학 계획", "math")
+    insert_plan(2, "영어 계획", "english")
+    insert_plan(3, "남의 계획", "math", user_id=2)
+
+    insert_task(1, 1, plan_date, "미적분 1강", 1)
+    insert_log(1, "partial", f"{plan_date} 09:00:00", minutes=10, memo="앞부분만")
+    insert_log(1, "done", f"{plan_date} 11:00:00", minutes=30, memo="완료")
+    insert_log(1, "missed", f"{plan_date} 11:00:00", minutes=0, memo="다시")  # 같은 시각: 나중 로그가 최신
+
+    insert_task(2, 1, plan_date, "미적분 2강", 2)
+    insert_log(2, "done", f"{plan_date} 08:00:00", minutes=45)
+    insert_log(2, "partial", f"{plan_date} 20:00:00", minutes=20, memo="복습")
+
+    insert_task(3, 2, plan_date, "단어 100개", 1)  # 로그 없음 -> planned
+
+    insert_task(4, 3, plan_date, "남의 작업", 1)
+    insert_log(4, "done", f"{plan_date} 10:00:00", user_id=2)
+
+    for i in range(extra_tasks):
+        task_id = 100 + i
+        insert_task(task_id, 2, plan_date, f"추가 {i}", 10 + i)
+        insert_log(task_id, "partial", f"{plan_date} 07:00:00")
+        insert_log(task_id, "done", f"{plan_date} 07:30:00")
+
+    refresh_task_status()
+    db.session.commit()
+
+
+@pytest.fixture
+def captured_templates(app):
+    recorded = []
+
+    def record(sender, template, context, **extra):
+        recorded.append((template.name, context))
+
+    template_rendered.connect(record, app)
+    yield recorded
+    template_rendered.disconnect(record, app)
+
+
+def test_day_detail_payload(app, client):
+    with app.app_context():
+        seed_day(DAY)
+
+    response, queries = get_with_query_count(client, "/day/1022?year=2025", "main.day_detail")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "ok": True,
+        "date": DAY,
+        "tasks": [
+            {"task_id": 1, "plan_title": "수학 계획", "subject": "math", "task_title": "미적분 1강",
+             "link_url": None, "status": "missed"},
+            {"task_id": 3, "plan_title": "영어 계획", "subject": "english", "task_title": "단어 100개",
+             "link_url": None, "status": "planned"},
+            {"task_id": 2, "plan_title": "수학 계획", "subject": "math", "task_title": "미적분 2강",
+             "link_url": None, "status": "partial"},
+        ],
+    }
+    # ETag 용 사용자 버전 1 + 작업 조회 1
+    assert queries == 2
+
+
+def test_day_detail_plan_filter(app, client):
+    with app.app_context():
+        seed_day(DAY)
+
+    response = client.get("/day/1022?year=2025&plan_id=2")
+
+    assert [task["task_id"] for task in response.get_json()["tasks"]] == [3]
+
+
+def test_day_detail_query_count_independent_of_task_count(app, client):
+    with app.app_context():
+        seed_day(DAY, extra_tasks=30)
+
+    response, queries = get_with_query_count(client, "/day/1022?year=2025", "main.day_detail")
+
+    assert len(response.get_json()["tasks"]) == 33
+    assert queries == 2
+
+
+def test_today_context(app, client, captured_templates):
+    today = get_today_kst().strftime("%Y-%m-%d")
+    with app.app_context():
+        seed_day(today)
+
+    response, queries = get_with_query_count(client, "/today", "main.today_learning")
+
+    assert response.status_code == 200
+    assert queries == 1
+    name, context = captured_templates[-1]
+    assert name == "today_learning.html"
+    assert context["today_str"] == today
+    assert (context["total_tasks"], context["completed_tasks"], context["completion_rate"]) == (3, 0, 0)
+    assert [(plan["plan_id"], plan["plan_title"], plan["subject"]) for plan in context["plans"]] == [
+        (1, "수학 계획", "math"), (2, "영어 계획", "english"),
+    ]
+    tasks = {task["task_id"]: task for plan in context["plans"] for task in plan["tasks"]}
+    assert tasks[1] == {"task_id": 1, "task_title": "미적분 1강", "link_url": None, "order_no": 1,
+                        "status": "missed", "minutes": 0, "memo": "다시"}
+    assert tasks[2] == {"task_id": 2, "task_title": "미적분 2강", "link_url": None, "order_no": 2,
+                        "status": "partial", "minutes": 20, "memo": "복습"}
+    assert tasks[3] == {"task_id": 3, "task_title": "단어 100개", "link_url": None, "order_no": 1,
+                        "status": "planned", "minutes": 0, "memo": ""}
+
+
+def test_today_counts_done_tasks(app, client, captured_templates):
+    today = get_today_kst().strftime("%Y-%m-%d")
+    with app.app_context():
+        seed_day(today, extra_tasks=5)
+
+    response, queries = get_with_query_count(client, "/today", "main.today_learning")
+
+    _, context = captured_templates[-1]
+    assert (context["total_tasks"], context["completed_tasks"], context["completion_rate"]) == (8, 5, 62)
+    assert queries == 1
+
+
+def test_today_requires_login(app):
+    response = app.test_client().get("/today")
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/login")
@@ -0,0 +1,51 @@
+"""
+마이그레이션: 상태 컬럼이 없던 기존 SQLite DB 에 컬럼을 추가하면 로그 기준으로 현재 상태를 채움
+"""
+import contextlib
+import io
+
+import migrations
+from app import create_app
+from conftest import execute, insert_log, insert_plan, insert_task
+from db_config import db
+
+
+def run_migrations(steps=None, monkeypatch=None):
+    if steps is not None:
+        monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return migrations.run_migrations()
+
+
+def test_status_columns_backfilled_from_existing_logs(tmp_path, monkeypatch):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'old.db'}",
+        "SECRET_KEY": "test",
+        "TESTING": True,
+    })
+    all_steps = migrations.MIGRATIONS
+    with app.app_context():
+        # 상태 컬럼이 생기기 전의 DB (001, 002 까지 적용) 에 로그가 쌓여 있던 상태
+        assert run_migrations(all_steps[:2], monkeypatch) == [1, 2]
+        execute("INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) "
+                "VALUES (1, 'tester', CURRENT_TIMESTAMP)")
+        insert_plan(1, "수학 계획")
+        insert_task(1, 1, "2025-10-22", "미적분 1강", 1)
+        insert_task(2, 1, "2025-10-22", "미적분 2강", 2)
+        insert_task(3, 1, "2025-10-23", "미적분 3강", 3)
+        insert_log(1, "partial", "2025-10-22 09:00:00", minutes=10)
+        insert_log(1, "done", "2025-10-22 10:00:00", minutes=40, memo="완료")
+        insert_log(2, "missed", "2025-10-22 11:00:00")
+        db.session.commit()
+
+        assert run_migrations(all_steps, monkeypatch)[0] == 3
+
+        rows = execute("SELECT task_id, status, actual_minutes, memo FROM dbo.study_plan_task "
+                       "ORDER BY task_id").fetchall()
+        assert [tuple(row) for row in rows] == [
+            (1, "done", 40, "완료"),
+            (2, "missed", None, None),
+            (3, None, None, None),
+        ]
+        for engine in db.engines.values():
+            engine.dispose()
@@ -0,0 +1,130 @@
+"""
+읽기 복제본 라우팅: 읽기 화면은 복제본, 쓴 사용자는 잠시 primary
+
+복제본은 primary 파일을 복사한 SQLite 파일이며 복사 뒤에는 복제되지 않으므로,
+primary 에만 있는 작업이 보이는지로 어느 엔진에서 읽었는지 확인합니다.
+"""
+import contextlib
+import io
+import shutil
+
+import pytest
+
+import migrations
+from app import create_app
+from conftest import execute, insert_plan, insert_task
+from db_config import db
+from read_routing import PRIMARY_PENDING_KEY, PRIMARY_UNTIL_KEY
+
+DAY = "2025-10-22"
+
+
+def dispose(app):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    seed_app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}", "SECRET_KEY": "test"})
+    with seed_app.app_context():
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrations.run_migrations()
+        execute("INSERT INTO dbo.study_plan_user (user_id, user_name, created_at) "
+                "VALUES (1, 'tester', CURRENT_TIMESTAMP)")
+        insert_plan(1, "수학 계획")
+        insert_task(1, 1, DAY, "복제된 작업", 1)
+        db.session.commit()
+    dispose(seed_app)
+    shutil.copy(primary, replica)
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{primary}",
+        "DB_READ_URLS": [f"sqlite:///{replica}"],
+        "DB_READ_STICKY_SECONDS": 30,
+        "SECRET_KEY": "test",
+        "TESTING": True,
+    })
+    with app.app_context():
+        insert_task(2, 1, DAY, "primary 에만 있는 작업", 2)
+        db.session.commit()
+    yield app
+    dispose(app)
+
+
+@pytest.fixture
+def user(replica_app):
+    client = replica_app.test_client()
+    with client.session_transaction() as session:
+        session["user_id"] = 1
+    return client
+
+
+def day_task_ids(client):
+    return [task["task_id"] for task in client.get("/day/1022?year=2025").get_json()["tasks"]]
+
+
+def expire_stickiness(client):
+    with client.session_transaction() as session:
+        session[PRIMARY_UNTIL_KEY] = 0
+
+
+def test_replica_bind_is_configured(replica_app):
+    with replica_app.app_context():
+        assert set(db.engines) == {None, "replica_1"}
+    assert replica_app.extensions["read_replicas"] == ["replica_1"]
+
+
+def test_reads_go_to_replica_without_writes(user):
+    assert day_task_ids(user) == [1]
+    assert user.get("/today").status_code == 200
+
+
+def test_writes_go_to_primary_and_pin_reads(replica_app, user):
+    response = user.post("/day/update", json={"task_id": 2, "completed": True})
+
+    assert response.get_json()["ok"] is True
+    with replica_app.app_context():
+        assert execute("SELECT status FROM dbo.study_plan_task WHERE task_id = 2").scalar() == "done"
+    assert day_task_ids(user) == [1, 2]
+
+    expire_stickiness(user)
+    assert day_task_ids(user) == [1]
+
+
+def test_stickiness_is_per_user(replica_app, user):
+    user.post("/day/update", json={"task_id": 2, "completed": True})
+    other = replica_app.test_client()
+    with other.session_transaction() as session:
+        session["user_id"] = 1
+
+    assert day_task_ids(other) == [1]
+
+
+def test_streaming_import_pins_until_next_request(replica_app, user):
+    body = "title\n" + "".join(f"항목 {i}\n" for i in range(1, 4))
+    response = user.post("/plan/1/templates/upload?progress=1",
+                         data={"file": (io.BytesIO(body.encode("utf-8")), "items.csv")},
+                         content_type="multipart/form-data")
+    response.get_data()
+    with user.session_transaction() as session:
+        assert session.get(PRIMARY_PENDING_KEY) is True
+
+    # 다음 요청은 primary 에서 읽고, 그때부터 고정 시간이 시작됨
+    assert day_task_ids(user) == [1, 2]
+    with user.session_transaction() as session:
+        assert PRIMARY_PENDING_KEY not in session
+        assert session[PRIMARY_UNTIL_KEY] > 0
+    assert day_task_ids(user) == [1, 2]
+
+    expire_stickiness(user)
+    assert day_task_ids(user) == [1]
+
+
+def test_no_replica_means_no_stickiness(app, client):
+    client.post("/day/update", json={"task_id": 1, "completed": True})
+
+    with client.session_transaction() as session:
+        assert PRIMARY_UNTIL_KEY not in session
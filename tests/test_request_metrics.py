@@ -0,0 +1,76 @@
+"""
+요청별 SQL 지표: 스트리밍 응답 본문에서 실행한 쿼리도 포함
+"""
+import io
+
+from conftest import execute, insert_plan, insert_task, open_with_query_count, query_count
+from db_config import db
+from request_metrics import request_metrics
+
+
+def seed_tasks(n):
+    insert_plan(1, "수학 계획")
+    for i in range(1, n + 1):
+        insert_task(i, 1, "2025-10-22", f"작업 {i}", i)
+    db.session.commit()
+
+
+def latency_count(endpoint):
+    histogram = dict(request_metrics.request_latency.items()).get(endpoint)
+    return 0 if histogram is None else histogram.count
+
+
+def test_streamed_export_queries_are_counted(app, client):
+    with app.app_context():
+        seed_tasks(5)
+
+    response, queries = open_with_query_count(client, "main.export_data", "/export/tasks.csv")
+
+    assert response.status_code == 200
+    assert len(response.get_data(as_text=True).splitlines()) == 6
+    assert queries >= 1
+
+
+def test_streamed_import_progress_queries_are_counted(app, client):
+    app.config.update(IMPORT_BATCH_SIZE=2)
+    body = "title\n" + "".join(f"항목 {i}\n" for i in range(1, 7))
+
+    response, queries = open_with_query_count(
+        client, "main.upload_templates", "/plan/1/templates/upload?progress=1", method="POST",
+        data={"file": (io.BytesIO(body.encode("utf-8")), "items.csv")}, content_type="multipart/form-data",
+    )
+
+    assert response.get_data(as_text=True).count("\n") == 4
+    # 배치 3번의 INSERT + 커밋 시 사용자 버전 갱신
+    assert queries >= 3
+    with app.app_context():
+        assert execute("SELECT COUNT(*) FROM dbo.study_task_template").scalar() == 6
+
+
+def test_request_recorded_once_when_closed(app, client):
+    before = latency_count("main.today_learning")
+
+    response = client.get("/today")
+    assert latency_count("main.today_learning") == before
+    response.close()
+
+    assert latency_count("main.today_learning") == before + 1
+    assert query_count("main.today_learning") >= 1
+
+
+def test_metrics_endpoints_disabled_without_token(client):
+    for path in ("/metrics", "/internal/metrics"):
+        assert client.get(path).status_code == 404
+
+
+def test_metrics_endpoints_require_bearer_token(app, client):
+    app.config["METRICS_TOKEN"] = "s3cret"
+    anonymous = app.test_client()
+
+    for path in ("/metrics", "/internal/metrics"):
+        assert anonymous.get(path).status_code == 401
+        assert client.get(path).status_code == 401  # 로그인만으로는 안 됨
+        assert anonymous.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+        response = anonymous.get(path, headers={"Authorization": "Bearer s3cret"})
+        assert response.status_code == 200
+        response.close()
@@ -0,0 +1,116 @@
+"""
+상태 저장 (/day/update, /day/update_batch): 변경마다 로그 행을 추가하고 이전 로그는 그대로 둠
+"""
+from conftest import execute, insert_log, insert_plan, insert_task, logs_of
+from db_config import db
+from task_status import refresh_task_status
+
+DAY = "2025-10-22"
+
+
+def seed_task():
+    insert_plan(1, "수학 계획")
+    insert_task(1, 1, DAY, "미적분 1강", 1)
+    insert_log(1, "partial", f"{DAY} 09:00:00", minutes=10, memo="앞부분만")
+    refresh_task_status()
+    db.session.commit()
+
+
+def current_status(task_id):
+    return tuple(execute("SELECT status, actual_minutes, memo FROM dbo.study_plan_task WHERE task_id = :task_id",
+                         {"task_id": task_id}).one())
+
+
+def test_status_changes_keep_earlier_log_rows(app, client):
+    with app.app_context():
+        seed_task()
+        seeded = logs_of(1)
+
+    # 일일 계획 저장으로 상태 변경 -> 로그 1행 추가
+    response = client.post("/plan/1/daily", json={"daily_plans": [
+        {"task_id": 1, "date": DAY, "description": "미적분 1강", "order": 1, "status": "missed"},
+    ]})
+    assert response.get_json()["status_changed"] == 1
+    with app.app_context():
+        after_save = logs_of(1)
+
+    response = client.post("/day/update", json={"task_id": 1, "completed": True})
+    assert response.get_json()["ok"] is True
+
+    with app.app_context():
+        logs = logs_of(1)
+        assert len(logs) == 3
+        assert logs[:2] == after_save
+        assert after_save[0] == seeded[0]
+        assert [log[1] for log in logs] == ["partial", "missed", "done"]
+        # 실제 학습시간 / 메모는 이전 로그에서 이어받음
+        assert logs[2][2:4] == (10, "앞부분만")
+        assert current_status(1) == ("done", 10, "앞부분만")
+
+
+def test_batch_update_appends_log_per_task(app, client):
+    with app.app_context():
+        seed_task()
+        insert_task(2, 1, DAY, "미적분 2강", 2)
+        db.session.commit()
+        seeded = logs_of(1)
+
+    response = client.post("/day/update_batch", json={"updates": [
+        {"task_id": 1, "status": "done", "minutes": 40},
+        {"task_id": 2, "status": "partial", "memo": "절반"},
+        {"task_id": 999, "status": "done"},
+    ]})
+
+    assert [r["ok"] for r in response.get_json()["results"]] == [True, True, False]
+    with app.app_context():
+        logs = logs_of(1)
+        assert logs[0] == seeded[0]
+        assert [(log[1], log[2], log[3]) for log in logs[1:]] == [("done", 40, "앞부분만")]
+        assert [(log[1], log[2], log[3]) for log in logs_of(2)] == [("partial", None, "절반")]
+        assert current_status(1) == ("done", 40, "앞부분만")
+        assert current_status(2) == ("partial", None, "절반")
+
+
+def test_repeated_updates_in_same_second_use_latest(app, client):
+    with app.app_context():
+        seed_task()
+
+    for completed in (True, False, True, False):
+        client.post("/day/update", json={"task_id": 1, "completed": completed})
+
+    with app.app_context():
+        assert [log[1] for log in logs_of(1)] == ["partial", "done", "planned", "done", "planned"]
+        assert current_status(1)[0] == "planned"
+
+
+def user_version():
+    return execute("SELECT data_version FROM dbo.study_plan_user WHERE user_id = 1").scalar()
+
+
+def test_batch_update_rejects_non_object_body(app, client):
+    for body in ([1, 2], "updates", 3):
+        response = client.post("/day/update_batch", json=body)
+        assert response.status_code == 400
+        assert response.get_json()["ok"] is False
+
+
+def test_batch_update_without_valid_entries_does_not_commit(app, client):
+    with app.app_context():
+        seed_task()
+        before = user_version()
+
+    for _ in range(2):
+        response = client.post("/day/update_batch", json={"updates": [
+            {"task_id": 999, "status": "done"},
+            {"task_id": 1, "status": "finished"},
+        ]})
+        data = response.get_json()
+        assert [r["ok"] for r in data["results"]] == [False, False]
+        assert data["version"] == before
+
+    with app.app_context():
+        assert user_version() == before
+        assert [log[1] for log in logs_of(1)] == ["partial"]
+
+    response = client.post("/day/update_batch", json={"updates": [{"task_id": 1, "status": "done"}]})
+    assert response.get_json()["version"] == before + 1
@@ -0,0 +1,134 @@
+"""
+템플릿 가져오기: 제한을 넘으면 저장한 행까지만 결과로 알리고, 오류 행 번호는 입력에서의 위치
+"""
+import io
+import json
+
+import pytest
+
+from conftest import execute, insert_plan
+from db_config import db
+from template_import import ImportLimitError, import_template_rows, iter_csv_rows
+
+
+@pytest.fixture
+def plan(app):
+    with app.app_context():
+        insert_plan(1, "수학 계획")
+        db.session.commit()
+    return 1
+
+
+def saved_items(app, plan_id=1):
+    with app.app_context():
+        return [tuple(r) for r in execute(
+            "SELECT order_no, title FROM dbo.study_task_template WHERE plan_id = :plan_id ORDER BY item_id",
+            {"plan_id": plan_id})]
+
+
+def csv_upload(n):
+    body = "title,link_url\n" + "".join(f"항목 {i},https://example.com/{i}\n" for i in range(1, n + 1))
+    return {"file": (io.BytesIO(body.encode("utf-8")), "items.csv")}
+
+
+def test_rows_over_limit_are_dropped_and_saved_rows_reported(app, client, plan):
+    app.config.update(IMPORT_MAX_ROWS=5, IMPORT_BATCH_SIZE=2)
+
+    response = client.post("/plan/1/templates/upload", data=csv_upload(8), content_type="multipart/form-data")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data["ok"], data["count"], data["rows_read"], data["truncated"]) == (True, 5, 5, True)
+    assert "6행부터" in data["limit_error"]
+    assert saved_items(app) == [(i, f"항목 {i}") for i in range(1, 6)]
+
+
+def test_progress_stream_reports_truncation(app, client, plan):
+    app.config.update(IMPORT_MAX_ROWS=5, IMPORT_BATCH_SIZE=2)
+
+    response = client.post("/plan/1/templates/upload?progress=1", data=csv_upload(8),
+                           content_type="multipart/form-data")
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["count"] for line in lines] == [2, 4, 5]
+    assert lines[-1]["done"] and lines[-1]["ok"] and lines[-1]["truncated"]
+    assert len(saved_items(app)) == 5
+
+
+def test_rows_within_limit_are_not_truncated(app, client, plan):
+    app.config.update(IMPORT_MAX_ROWS=5, IMPORT_BATCH_SIZE=2)
+
+    data = client.post("/plan/1/templates/upload", data=csv_upload(5),
+                       content_type="multipart/form-data").get_json()
+
+    assert (data["count"], data["truncated"], data["limit_error"]) == (5, False, None)
+
+
+def test_request_over_byte_limit_saves_nothing(app, client, plan):
+    app.config.update(IMPORT_MAX_BYTES=64)
+
+    response = client.post("/plan/1/templates/upload", data=csv_upload(20), content_type="multipart/form-data")
+
+    assert response.status_code == 413
+    assert saved_items(app) == []
+
+
+def test_byte_limit_while_streaming_keeps_saved_batches(app, plan):
+    body = ("title\n" + "".join(f"항목 {i}\n" for i in range(1, 2001))).encode("utf-8")
+    with app.app_context():
+        result = import_template_rows(1, iter_csv_rows(io.BytesIO(body), max_bytes=len(body) // 2),
+                                      batch_size=100)
+        saved = execute("SELECT COUNT(*) FROM dbo.study_task_template").scalar()
+
+    assert result["truncated"] and "파일 크기" in result["limit_error"]
+    assert 0 < result["count"] == saved < 2000
+
+
+def test_limit_before_any_row_saved_raises(app, plan):
+    body = ("title\n" + "".join(f"항목 {i}\n" for i in range(1, 2001))).encode("utf-8")
+    with app.app_context(), pytest.raises(ImportLimitError):
+        import_template_rows(1, iter_csv_rows(io.BytesIO(body), max_bytes=16))
+
+
+def test_json_rows_report_position_not_order_no(app, client, plan):
+    data = client.post("/plan/1/templates/upload", json={"rows": [
+        {"title": "첫 항목", "order_no": 10},
+        {"title": "x" * 300, "order_no": 20},
+        {"title": "셋째 항목", "link_url": "https://example.com/" + "a" * 1000},
+        {"title": "넷째 항목"},
+    ]}).get_json()
+
+    assert [e["row"] for e in data["errors"]] == [2, 3]
+    assert saved_items(app) == [(10, "첫 항목"), (1, "넷째 항목")]
+
+
+def test_json_rows_without_order_no_continue_after_existing_items(app, client, plan):
+    client.post("/plan/1/templates/upload", json={"rows": [{"title": "기존 항목", "order_no": 4}]})
+
+    client.post("/plan/1/templates/upload", json={"rows": [
+        {"title": ""},
+        {"title": "새 항목 1"},
+        {"title": "x" * 300},
+        {"title": "새 항목 2"},
+    ]})
+
+    assert saved_items(app) == [(4, "기존 항목"), (5, "새 항목 1"), (6, "새 항목 2")]
+
+
+def test_paste_rows_report_line_numbers(app, client, plan):
+    data = client.post("/plan/1/templates/upload", json={
+        "paste_text": "첫 항목\n\n\n" + "x" * 300 + "\n둘째 항목\thttps://example.com/2\n",
+    }).get_json()
+
+    assert data["errors"] == [{"row": 4, "error": "title 은 200자 이하여야 합니다."}]
+    assert saved_items(app) == [(1, "첫 항목"), (2, "둘째 항목")]
+
+
+def test_csv_order_no_skips_blank_and_invalid_rows(app, client, plan):
+    body = "title,link_url\n첫 항목,\n,\n,https://example.com/no-title\n" + "x" * 300 + ",\n둘째 항목,\n"
+
+    data = client.post("/plan/1/templates/upload", data={"file": (io.BytesIO(body.encode("utf-8")), "items.csv")},
+                       content_type="multipart/form-data").get_json()
+
+    assert [e["row"] for e in data["errors"]] == [3, 4]
+    assert saved_items(app) == [(1, "첫 항목"), (2, "둘째 항목")]